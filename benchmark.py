@@ -0,0 +1,251 @@
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import game_output
+import rng_service
+from metrics import LatencyHistogram
+from outcome_engine import MOVES
+
+# Benchmark suite for the game hot paths: per-call latency and throughput of every game variant and agent,
+# RL training speed and startup time, all driven by scripted moves (no input())
+# Each run is appended to a JSON-lines history; with a stored baseline, any metric that got worse by more
+# than its threshold is reported as a regression and the exit status is 1
+# Run with: python benchmark.py                      (compare against benchmark_baseline.json if present)
+#           python benchmark.py --save-baseline      (store this run as the new baseline)
+#           python benchmark.py --only check_win predict_move_tree --rounds 2000
+
+HISTORY_PATH = os.environ.get("JARVIS_BENCH_HISTORY", "benchmark_history.jsonl")
+BASELINE_PATH = os.environ.get("JARVIS_BENCH_BASELINE", "benchmark_baseline.json")
+ROUNDS = 20000  # Scripted rounds per benchmark (divided by `cost` for the slow Scikit-learn paths)
+SEED = 0  # Seed for the scripted moves and every random choice, so runs are comparable
+# Allowed slowdown before a metric counts as a regression (fractions of the baseline value)
+THRESHOLDS = {"calls_per_sec": 0.25, "p50_us": 0.25, "p99_us": 0.5, "episodes_per_sec": 0.25, "startup_ms": 0.3}
+HIGHER_IS_BETTER = ("calls_per_sec", "episodes_per_sec")
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def scripted_moves(rounds, seed=SEED):
+    # A patterned player (sticky Markov chain) from opponents.py, so the predictors have something to learn
+    from opponents import MarkovOpponent
+    player = MarkovOpponent(seed=seed, block_size=max(rounds, 1))
+    return [player.move() for _ in range(rounds)]
+
+
+def time_calls(function, arguments):
+    # Call function(*args) for each args in `arguments`; returns calls/sec and latency percentiles
+    histogram = LatencyHistogram()
+    perf_counter_ns = time.perf_counter_ns
+    start = perf_counter_ns()
+    for args in arguments:
+        before = perf_counter_ns()
+        function(*args)
+        histogram.record(perf_counter_ns() - before)
+    elapsed = (perf_counter_ns() - start) / 1e9
+    return {"calls": histogram.count, "calls_per_sec": histogram.count / elapsed,
+            "mean_us": histogram.total / histogram.count / 1e3,
+            "p50_us": histogram.percentile(50) / 1e3, "p99_us": histogram.percentile(99) / 1e3}
+
+
+def bench_check_win(rounds):
+    game = importlib.import_module("rock_paper_game")
+    player, computer = game.Player("Player"), game.Player("JARVIS")
+    moves = scripted_moves(rounds)
+    replies = scripted_moves(rounds, SEED + 1)
+    return time_calls(game.check_win, [(player, computer, MOVES[a], MOVES[b]) for a, b in zip(moves, replies)])
+
+
+def _warm_up(game, model_type=None):
+    # One untimed round on a throwaway player, so lazy imports (Scikit-learn) aren't counted in the first call
+    player = game.Player("Warm-up")
+    for move in scripted_moves(game.HISTORY_WINDOW + 1, SEED + 2):
+        player.record_move(move)
+    if model_type is None:
+        game.train_ml_model(player)
+    else:
+        game.predict_move(player, model_type)
+
+
+def _train_calls(module_name, rounds):
+    # train_ml_model() on a player whose history advances one scripted move per call
+    game = importlib.import_module(module_name)
+    _warm_up(game)
+    player = game.Player("Player")
+    moves = scripted_moves(rounds + game.HISTORY_WINDOW)
+    for move in moves[:game.HISTORY_WINDOW]:
+        player.record_move(move)
+
+    def train(move):
+        player.record_move(move)
+        game.train_ml_model(player)
+    return time_calls(train, [(move,) for move in moves[game.HISTORY_WINDOW:]])
+
+
+def _predict_calls(module_name, model_type, rounds):
+    # One game round of predicting: record the scripted move, then predict_move() (refits included)
+    game = importlib.import_module(module_name)
+    _warm_up(game, model_type)
+    player = game.Player("Player")
+
+    def predict(move):
+        player.record_move(move)
+        game.predict_move(player, model_type)
+    return time_calls(predict, [(move,) for move in scripted_moves(rounds)])
+
+
+def bench_rl_choose_action(rounds):
+    game = importlib.import_module("rock_paper_game_rl")
+    agent = game.RLAgent(game.StateEncoder(), rng_service.RandomStream(SEED))
+    agent.q_table[:] = np.random.default_rng(SEED).random(agent.q_table.shape)
+    return time_calls(agent.choose_action, [(move,) for move in scripted_moves(rounds)])
+
+
+def bench_rl_update_q_table(rounds):
+    game = importlib.import_module("rock_paper_game_rl")
+    agent = game.RLAgent(game.StateEncoder(), rng_service.RandomStream(SEED))
+    moves = scripted_moves(rounds + 1)
+    actions = scripted_moves(rounds, SEED + 1)
+    return time_calls(agent.update_q_table, [(moves[i], actions[i], (i % 3) - 1, moves[i + 1]) for i in range(rounds)])
+
+
+def bench_train_and_test_rl(rounds):
+    # Episodes/sec of the standalone trainer in its default single-process mode (one episode is one round)
+    rl = importlib.import_module("rl_standalone")
+    episodes = rounds * 5
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        rl.train_and_test_rl(episodes)
+        elapsed = time.perf_counter() - start
+    return {"episodes": episodes, "episodes_per_sec": episodes / elapsed}
+
+
+def bench_startup(rounds):
+    # Import time of each entry point in a fresh interpreter (see startup_time.py)
+    from startup_time import measure_startup
+    return {f"{module}.startup_ms": seconds * 1000 for module, seconds in measure_startup(repeat=3).items()}
+
+
+# name -> (function(rounds), cost): rounds are divided by cost for slow benchmarks
+BENCHMARKS = {
+    "check_win": (bench_check_win, 1),
+    "train_ml_model_tree": (lambda rounds: _train_calls("rock_paper_game", rounds), 20),
+    "train_ml_model_forest": (lambda rounds: _train_calls("rock_paper_game_RandomForestClassifier", rounds), 200),
+    "predict_move_online": (lambda rounds: _predict_calls("rock_paper_game", "online", rounds), 1),
+    "predict_move_ensemble": (lambda rounds: _predict_calls("rock_paper_game", "ensemble", rounds), 4),
+    "predict_move_tree": (lambda rounds: _predict_calls("rock_paper_game", "tree", rounds), 20),
+    "predict_move_forest": (lambda rounds: _predict_calls("rock_paper_game_RandomForestClassifier", "forest", rounds), 100),
+    "rl_choose_action": (bench_rl_choose_action, 1),
+    "rl_update_q_table": (bench_rl_update_q_table, 1),
+    "train_and_test_rl": (bench_train_and_test_rl, 1),
+    "startup": (bench_startup, 1),
+}
+
+
+def run_benchmarks(names=None, rounds=ROUNDS):
+    # Run the named benchmarks (default: all) with JARVIS's chatter off; returns {name: {metric: value}}
+    results = {}
+    previous = game_output.set_output_mode("quiet")
+    try:
+        for name in names or BENCHMARKS:
+            function, cost = BENCHMARKS[name]
+            rng_service.seed(SEED)
+            np.random.seed(SEED)  # Scikit-learn models without a random_state draw from here
+            results[name] = function(max(1, rounds // cost))
+    finally:
+        game_output.set_output(previous)
+    return results
+
+
+def _metric_kind(metric):
+    # The THRESHOLDS key for a metric name, e.g. "rock_paper_game.startup_ms" -> "startup_ms"
+    return metric.rsplit(".", 1)[-1]
+
+
+def compare(results, baseline, thresholds=THRESHOLDS):
+    # Regressions of `results` against `baseline`: (benchmark, metric, baseline value, value, change) tuples
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            kind = _metric_kind(metric)
+            old = baseline.get(name, {}).get(metric)
+            if kind not in thresholds or not old:
+                continue
+            change = value / old - 1
+            worse = -change if kind in HIGHER_IS_BETTER else change
+            if worse > thresholds[kind]:
+                regressions.append((name, metric, old, value, change))
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def record_run(results, path=HISTORY_PATH):
+    # Append one run (with when, where and at which commit it ran) to the JSON-lines history
+    entry = {"timestamp": time.time(), "commit": _git_commit(), "python": platform.python_version(),
+             "machine": platform.machine(), "results": results}
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def print_results(results):
+    for name, metrics in results.items():
+        if "calls_per_sec" in metrics:
+            print(f"{name:<24} {metrics['calls_per_sec']:>12,.0f} calls/sec   p50 {metrics['p50_us']:9.1f} us   "
+                  f"p99 {metrics['p99_us']:9.1f} us")
+        elif "episodes_per_sec" in metrics:
+            print(f"{name:<24} {metrics['episodes_per_sec']:>12,.0f} episodes/sec")
+        else:
+            for metric, value in metrics.items():
+                print(f"{metric:<48} {value:9.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game hot paths and check for regressions.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="Scripted rounds per benchmark")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON-lines file each run is appended to")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.rounds)
+    print_results(results)
+    if args.history:
+        record_run(results, args.history)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to store one")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f))
+    if not regressions:
+        print("\nNo regressions against the baseline")
+        return 0
+    print("\nRegressions against the baseline:")
+    for name, metric, old, value, change in regressions:
+        print(f"  {name} {metric}: {old:,.2f} -> {value:,.2f} ({change:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
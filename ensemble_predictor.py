@@ -0,0 +1,225 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from outcome_engine import COUNTER_MOVE, RPS
+
+# Meta-strategy predictor in the style of Iocaine Powder: many cheap predictors run side by side and
+# JARVIS follows whichever has been scoring best lately
+# Base predictors: move frequencies, n-gram Markov counts at several orders, and history matching (what
+# followed the last time the current run of moves was seen), over the opponent's moves, over both players'
+# moves, and over JARVIS's own moves (guessing that the opponent is predicting JARVIS)
+# Each base prediction is second-guessed three ways: beat the predicted move, beat the move that beats our
+# counter, or beat the move after that, so an opponent who anticipates JARVIS is anticipated too
+# Every candidate's score is a decayed running total of the rounds it would have won, kept for several
+# decay rates at once and updated with one NumPy step per round
+# Nothing scans the history: rolling context codes, count tables and suffix dicts bound the work per move,
+# so the latency stays flat however long the session runs
+# Works for any game in outcome_engine.GAMES whose counter moves form a permutation (game=...): the tables
+# grow with the number of moves, the work per round doesn't
+
+MARKOV_ORDERS = (1, 2, 3, 4)  # Orders of the Markov predictors over the opponent's moves
+PAIR_ORDERS = (1, 2)  # Orders of the Markov predictors over (opponent, JARVIS) move pairs
+MATCH_LENGTH = 8  # Longest run of recent moves the history matchers look up
+MAX_FOLLOWERS = 1 << 16  # Runs remembered per match length; the oldest are forgotten beyond that
+FREQUENCY_DECAY = 0.9  # How fast the frequency predictors forget old moves
+SCORE_DECAYS = (0.5, 0.8, 0.95, 0.995)  # Short- to long-memory scoring of the candidates
+
+
+
+def rotations(counter_moves):
+    # ROTATIONS[r, m]: JARVIS's move for second-guessing level r when the opponent is expected to play m
+    counter_moves = np.asarray(counter_moves)
+    return np.stack([counter_moves, counter_moves[counter_moves], counter_moves[counter_moves[counter_moves]]])
+
+
+ROTATIONS = rotations(COUNTER_MOVE)
+BEATEN_MOVE = np.argsort(COUNTER_MOVE)  # BEATEN_MOVE[a]: the move that JARVIS's move `a` beats
+
+
+class ContextModel:
+    # Predicts a target move from the run of recent context symbols (a move, or a pair of moves as one symbol)
+    # Holds Markov counts for each order and, for history matching, the move that followed the last time
+    # each recent run of symbols (up to match_length long) was seen
+    def __init__(self, base, orders, match_length, num_targets=3, max_followers=MAX_FOLLOWERS):
+        # base: Number of distinct context symbols (3 for moves, 9 for move pairs)
+        # num_targets: Number of distinct target moves
+        # max_followers: Runs remembered per length (long runs of move pairs would otherwise grow without bound)
+        self.base = base
+        self.max_followers = max_followers
+        self.num_targets = num_targets
+        self.orders = orders
+        self.match_length = match_length
+        self.span = max(max(orders, default=0), match_length)
+        self.radix = [base ** length for length in range(self.span + 1)]
+        # [context * num_targets + move]
+        self.counts = {order: [0] * (self.radix[order] * num_targets) for order in orders}
+        # followers[length][run] -> next move, oldest run first: evicting pops the front in O(1), where deleting
+        # the first key of a plain dict rescans the slots of every key deleted before it
+        self.followers = [None] + [OrderedDict() for _ in range(match_length)]
+        self.context = 0  # The last `span` symbols as one base-`base` number
+        self.seen = 0
+
+    def update(self, symbol, target):
+        # Learn that `target` followed the current context, then append `symbol` to the context
+        available = min(self.seen, self.span)
+        for order in self.orders:
+            if order <= available:
+                self.counts[order][(self.context % self.radix[order]) * self.num_targets + target] += 1
+        for length in range(1, min(available, self.match_length) + 1):
+            followers = self.followers[length]
+            run = self.context % self.radix[length]
+            if run not in followers and len(followers) >= self.max_followers:
+                followers.popitem(last=False)  # Forget the run first seen longest ago
+            followers[run] = target
+        self.context = (self.context * self.base + symbol) % self.radix[self.span]
+        self.seen += 1
+
+    def break_context(self):
+        # A round this model can't see: start the context over, so no run spans the gap (counts are kept)
+        self.context = 0
+        self.seen = 0
+
+    def predict(self, predictions):
+        # Append one prediction per order, then one from history matching (None where there is no data)
+        available = min(self.seen, self.span)
+        for order in self.orders:
+            if order > available:
+                predictions.append(None)
+                continue
+            start = (self.context % self.radix[order]) * self.num_targets
+            row = self.counts[order][start:start + self.num_targets]
+            best = max(row)
+            predictions.append(row.index(best) if best else None)
+        if self.match_length:
+            match = None
+            for length in range(min(available, self.match_length), 0, -1):  # Longest matching run wins
+                match = self.followers[length].get(self.context % self.radix[length])
+                if match is not None:
+                    break
+            predictions.append(match)
+
+
+class FrequencyModel:
+    # Predicts the move seen most often, with older moves decayed away
+    def __init__(self, decay=FREQUENCY_DECAY, num_moves=3):
+        self.decay = decay
+        self.counts = [0.0] * num_moves
+
+    def update(self, move):
+        decay = self.decay
+        counts = self.counts
+        if len(counts) == 3:  # Unrolled for rock, paper, scissors
+            counts[0] *= decay
+            counts[1] *= decay
+            counts[2] *= decay
+        else:
+            counts[:] = [count * decay for count in counts]
+        counts[move] += 1.0
+
+    def predict(self, predictions):
+        counts = self.counts
+        best = max(counts)
+        predictions.append(counts.index(best) if best else None)
+
+
+class EnsemblePredictor:
+    # Same interface as TransitionPredictor: update(move) with each opponent move, predict() -> move or None
+    # predict() returns the opponent move that the best-scoring candidate's move beats, so predict_move's
+    # usual "counter the prediction" step plays that candidate's move
+    # game: outcome_engine.GameDefinition being played (default: rock, paper, scissors)
+    def __init__(self, markov_orders=MARKOV_ORDERS, pair_orders=PAIR_ORDERS, match_length=MATCH_LENGTH,
+                 frequency_decay=FREQUENCY_DECAY, score_decays=SCORE_DECAYS, game=RPS):
+        if game.beaten_moves is None:
+            raise ValueError(f"{game.name}: the ensemble needs counter moves that form a permutation")
+        self.config = {"markov_orders": markov_orders, "pair_orders": pair_orders, "match_length": match_length,
+                       "frequency_decay": frequency_decay, "score_decays": score_decays, "game": game}
+        n = self.num_moves = game.num_moves
+        self.counter = game.counter_moves.tolist()
+        self.payoff = game.payoff
+        self.rotations = ROTATIONS if game is RPS else rotations(game.counter_moves)
+        self.beaten = game.beaten_moves.tolist()
+        # Models over the opponent's moves predict the opponent directly
+        self.opponent_frequency = FrequencyModel(frequency_decay, n)
+        self.opponent_history = ContextModel(n, markov_orders, match_length, n)
+        self.pair_history = ContextModel(n * n, pair_orders, match_length, n)
+        # Models over JARVIS's own moves predict JARVIS, and assume the opponent will play to beat that
+        self.own_frequency = FrequencyModel(frequency_decay, n)
+        self.own_history = ContextModel(n, markov_orders[:2], match_length, n)
+        self.own_pair_history = ContextModel(n * n, pair_orders[:1], match_length // 2, n)
+        self.num_predictors = len(self.predictions())
+        self.num_candidates = 3 * self.num_predictors
+        self.decays = np.asarray(score_decays, dtype=np.float64)[:, None]
+        self.scores = np.zeros((len(score_decays), self.num_candidates))  # One row per decay rate
+        self.proposals = None  # Each candidate's move from the last predict(), until the next update()
+        self.valid = None  # Which candidates had a prediction to make
+        self.last_move = None  # JARVIS's move from the last predict()
+        self.best = None  # (decay row, candidate) currently followed
+
+    def predictions(self):
+        # Predicted opponent move of every base predictor (None where a predictor has nothing yet)
+        predictions = []
+        self.opponent_frequency.predict(predictions)
+        self.opponent_history.predict(predictions)
+        self.pair_history.predict(predictions)
+        own_start = len(predictions)
+        self.own_frequency.predict(predictions)
+        self.own_history.predict(predictions)
+        self.own_pair_history.predict(predictions)
+        counter = self.counter
+        for i in range(own_start, len(predictions)):
+            if predictions[i] is not None:
+                predictions[i] = counter[predictions[i]]  # The opponent beats JARVIS's predicted move
+        return predictions
+
+    def predict(self):
+        # Pick JARVIS's move from the best-scoring candidate; returns the opponent move it beats, or None
+        predictions = self.predictions()
+        valid = np.array([p is not None for p in predictions])
+        if not valid.any():
+            self.proposals = None
+            self.last_move = None
+            return None
+        expected = np.array([0 if p is None else p for p in predictions])
+        self.proposals = self.rotations[:, expected].ravel()  # Rotation-major: candidate = rotation * B + predictor
+        self.valid = np.tile(valid, 3)
+        scores = np.where(self.valid, self.scores, -np.inf)
+        row, candidate = np.unravel_index(int(scores.argmax()), scores.shape)
+        self.best = (int(row), int(candidate))
+        self.last_move = int(self.proposals[candidate])
+        return self.beaten[self.last_move]
+
+    def played(self, own_move):
+        # Tell the predictor which move JARVIS actually played, when it didn't follow predict() (e.g., a
+        # random move while predict() had nothing to offer)
+        self.last_move = own_move
+
+    def update(self, move, own_move=None):
+        # Score the candidates from the last predict() against the opponent's `move`, then learn from the round
+        # own_move: JARVIS's move this round; defaults to the move the last predict() picked (or played())
+        # When JARVIS's move is unknown (e.g., replaying the opponent's history) the models over JARVIS's
+        # moves skip the round instead of learning a made-up move
+        if own_move is None:
+            own_move = self.last_move
+        if self.proposals is not None:
+            rewards = self.payoff[self.proposals, move] * self.valid  # +1 if a candidate would have won, -1 if lost
+            self.scores *= self.decays
+            self.scores += rewards
+            self.proposals = None
+        self.opponent_frequency.update(move)
+        self.opponent_history.update(move, move)
+        if own_move is None:
+            self.pair_history.break_context()
+            self.own_history.break_context()
+            self.own_pair_history.break_context()
+        else:
+            pair = move * self.num_moves + own_move
+            self.pair_history.update(pair, move)
+            self.own_frequency.update(own_move)
+            self.own_history.update(own_move, own_move)
+            self.own_pair_history.update(pair, own_move)
+        self.last_move = None
+
+    def reset(self):
+        # Forget everything learned so far
+        self.__init__(**self.config)
@@ -0,0 +1,182 @@
+import os
+import struct
+import time
+
+import numpy as np
+
+# Append-only binary log of every round played
+# File layout: a 16-byte header (magic, version, record size) followed by fixed-width 16-byte records
+# (12 bytes in version 1 logs, which are still read and appended to, but have no session numbers)
+# Records can be streamed in chunks with read_records()/iter_rounds(), or memory-mapped all at once
+# with open_log() as a read-only NumPy structured array, without loading the file into RAM
+
+MAGIC = b"JARVISLG"
+LOG_VERSION = 2
+HEADER = struct.Struct("<8sII")  # magic, version, record size
+
+# One round; outcome is from JARVIS’s side like the RL reward: +1 JARVIS win, 0 tie, -1 JARVIS loss
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),  # Seconds since the epoch
+    ("player_move", "u1"),  # 0=rock, 1=paper, 2=scissors
+    ("jarvis_move", "u1"),
+    ("outcome", "i1"),
+    ("predictor", "u1"),  # Index into PREDICTORS
+    ("session", "<u4"),  # Counts up each time a writer opens the log, so sessions can be told apart
+])
+# Version 1 records: the same fields without the session number
+RECORD_DTYPES = {1: np.dtype(RECORD_DTYPE.descr[:5]), LOG_VERSION: RECORD_DTYPE}
+
+# Predictor names stored as one byte; names not listed here are stored as UNKNOWN_PREDICTOR
+# Only append to this list: the codes of existing names are stored in existing logs
+PREDICTORS = ["random", "online", "tree", "forest", "compiled", "rl", "ensemble", "pretrained"]
+PREDICTOR_CODES = {name: code for code, name in enumerate(PREDICTORS)}
+UNKNOWN_PREDICTOR = 255
+
+
+def _check_header(data, path):
+    # Return the record dtype of a log from its header
+    magic, version, record_size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a JARVIS game log")
+    dtype = RECORD_DTYPES.get(version)
+    if dtype is None or record_size != dtype.itemsize:
+        raise ValueError(f"Unsupported game log version {version} (record size {record_size})")
+    return dtype
+
+
+class GameLogWriter:
+    # Buffers rounds in a preallocated structured array and appends them to the log in one write
+    def __init__(self, path, buffer_rounds=4096):
+        self.path = path
+        self.count = 0  # Rounds waiting in the buffer
+        self.file = open(path, "ab")
+        self.rounds = 0  # Rounds in the log, including buffered ones (set below for an existing log)
+        self.session = 0  # Session number stored with every round written by this writer
+        self.dtype = RECORD_DTYPE
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, LOG_VERSION, RECORD_DTYPE.itemsize))
+        else:
+            with open(path, "rb") as f:
+                self.dtype = _check_header(f.read(HEADER.size), path)  # Keep appending in the log's own format
+                # Drop a partially written last record so new records stay aligned
+                end = self.file.tell()
+                torn = (end - HEADER.size) % self.dtype.itemsize
+                if torn:
+                    self.file.truncate(end - torn)
+                self.rounds = (end - torn - HEADER.size) // self.dtype.itemsize
+                if self.rounds and "session" in self.dtype.names:
+                    f.seek(HEADER.size + (self.rounds - 1) * self.dtype.itemsize)
+                    self.session = int(np.frombuffer(f.read(self.dtype.itemsize), dtype=self.dtype)["session"][0]) + 1
+        self.buffer = np.zeros(buffer_rounds, dtype=self.dtype)
+
+    def log_round(self, player_move, jarvis_move, outcome, predictor, timestamp=None):
+        # Add one round; outcome is from JARVIS’s side (+1 win, 0 tie, -1 loss)
+        record = self.buffer[self.count:self.count + 1]
+        record["timestamp"] = time.time() if timestamp is None else timestamp
+        record["player_move"] = player_move
+        record["jarvis_move"] = jarvis_move
+        record["outcome"] = outcome
+        record["predictor"] = PREDICTOR_CODES.get(predictor, UNKNOWN_PREDICTOR)
+        if "session" in self.dtype.names:
+            record["session"] = self.session
+        self.count += 1
+        self.rounds += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def log_rounds(self, player_moves, jarvis_moves, outcomes, predictor, timestamps=None):
+        # Add a whole batch of rounds (e.g., from a vectorized simulation) with one write
+        self.flush()
+        records = np.zeros(len(player_moves), dtype=self.dtype)
+        records["timestamp"] = time.time() if timestamps is None else timestamps
+        records["player_move"] = player_moves
+        records["jarvis_move"] = jarvis_moves
+        records["outcome"] = outcomes
+        records["predictor"] = PREDICTOR_CODES.get(predictor, UNKNOWN_PREDICTOR)
+        if "session" in self.dtype.names:
+            records["session"] = self.session
+        self.file.write(records.tobytes())
+        self.rounds += len(records)
+
+    def flush(self):
+        if self.count:
+            self.file.write(self.buffer[:self.count].tobytes())
+            self.count = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NullGameLog:
+    # Stand-in used when logging is turned off
+    rounds = 0
+
+    def log_round(self, *args, **kwargs):
+        pass
+
+    def log_rounds(self, *args, **kwargs):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def open_game_log(path, buffer_rounds=4096):
+    # Return a GameLogWriter for `path`, or a NullGameLog if path is empty/None
+    return GameLogWriter(path, buffer_rounds) if path else NullGameLog()
+
+
+def open_log(path):
+    # Memory-map a whole log as a read-only structured array (zero-copy; pages load on access)
+    # A partially written last record (e.g., after a crash) is ignored
+    # Version 1 logs have no "session" field
+    with open(path, "rb") as f:
+        dtype = _check_header(f.read(HEADER.size), path)
+    count = (os.path.getsize(path) - HEADER.size) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,))
+
+
+def read_records(path, chunk_rounds=65536):
+    # Stream a log as structured-array chunks of up to chunk_rounds records each
+    # Version 1 logs have no "session" field
+    with open(path, "rb") as f:
+        dtype = _check_header(f.read(HEADER.size), path)
+        chunk_bytes = chunk_rounds * dtype.itemsize
+        while True:
+            data = f.read(chunk_bytes)
+            usable = len(data) - len(data) % dtype.itemsize
+            if usable == 0:
+                break
+            yield np.frombuffer(data[:usable], dtype=dtype)
+            if usable < len(data):
+                break  # Ignore a partially written last record
+
+
+def iter_rounds(path, chunk_rounds=65536):
+    # Stream a log one round at a time as (timestamp, player_move, jarvis_move, outcome, predictor_name)
+    for chunk in read_records(path, chunk_rounds):
+        for timestamp, player_move, jarvis_move, outcome, predictor in zip(
+                chunk["timestamp"].tolist(), chunk["player_move"].tolist(), chunk["jarvis_move"].tolist(),
+                chunk["outcome"].tolist(), chunk["predictor"].tolist()):
+            name = PREDICTORS[predictor] if predictor < len(PREDICTORS) else "unknown"
+            yield timestamp, player_move, jarvis_move, outcome, name
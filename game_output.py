@@ -0,0 +1,189 @@
+import contextlib
+import json
+import sys
+import time
+
+from colorama import Fore, Style
+
+from outcome_engine import MOVE_INDEX, ROUND_MESSAGES
+
+# Pluggable output layer for the games: every line of JARVIS’s chatter goes through `output`
+# Each kind of message is its own method, so nothing is formatted unless the active mode needs it
+#   GameOutput        - quiet: every method does nothing (for bots, tournaments and servers)
+#   InteractiveOutput - the original colored terminal look
+#   JsonLinesOutput   - buffered structured events, one JSON object per line
+# Select a mode with set_output_mode("interactive" | "quiet" | "json") or set_output(obj)
+
+# Round messages by outcome for the player (+1 win), for move pairs without one in ROUND_MESSAGES
+RESULT_MESSAGES = {
+    1: "You’ve outsmarted me, sir—well done!",
+    0: "It’s a tie! We’re evenly matched, sir!",
+    -1: "I claim this victory, sir!",
+}
+
+
+class GameOutput:
+    # Quiet mode and the base class for the other modes
+    def move_recorded(self, name, move, history):
+        pass
+
+    def invalid_choice(self, move_names=("rock", "paper", "scissors")):
+        pass
+
+    def random_guess(self):
+        pass
+
+    def prediction(self, predicted_move):
+        pass
+
+    def rl_state(self, state):
+        pass
+
+    def round_result(self, player_name, player_choice, computer_name, computer_choice, result):
+        pass
+
+    def score(self, player_name, player_score, computer_name, computer_score):
+        pass
+
+    def history(self, name, history):
+        pass
+
+    def greeting(self, title="Rock, Paper, Scissors"):
+        pass
+
+    def farewell(self, player_name, player_score, computer_name, computer_score):
+        pass
+
+    def flush(self):
+        pass
+
+
+class InteractiveOutput(GameOutput):
+    # The original look: colored, conversational messages printed to the terminal
+    def move_recorded(self, name, move, history):
+        print(f"{Fore.YELLOW}{name}’s move added to history: {move} (History: {history}){Style.RESET_ALL}")  # Debug: Show history for verification
+
+    def invalid_choice(self, move_names=("rock", "paper", "scissors")):
+        choices = ", ".join(move_names[:-1]) + ", or " + move_names[-1]
+        print(f"{Fore.BLUE}Invalid choice, sir! Please enter {choices}.{Style.RESET_ALL}")
+
+    def random_guess(self):
+        print(f"{Fore.BLUE}JARVIS: Not enough data, sir—I’ll guess randomly.{Style.RESET_ALL}")
+
+    def prediction(self, predicted_move):
+        print(f"{Fore.BLUE}JARVIS: Based on your past moves, I predict you’ll pick {predicted_move}, sir!{Style.RESET_ALL}")  # Conversational output, like JARVIS chatting with Tony
+
+    def rl_state(self, state):
+        print(f"{Fore.YELLOW}Getting your current move: {state}{Style.RESET_ALL}")
+
+    def round_result(self, player_name, player_choice, computer_name, computer_choice, result):
+        print(f"{Fore.BLUE}\n{player_name} Chose {player_choice},\n {computer_name} Chose {computer_choice}{Style.RESET_ALL}")
+        # Larger games (outcome_engine.GAMES) have moves without a hand-written message
+        message = ROUND_MESSAGES.get((MOVE_INDEX.get(player_choice), MOVE_INDEX.get(computer_choice)),
+                                     RESULT_MESSAGES[result])
+        print(f"{Fore.BLUE}{message}{Style.RESET_ALL}")
+
+    def score(self, player_name, player_score, computer_name, computer_score):
+        print(f"{Fore.BLUE}\nScoreboard, sir: {player_name} - {player_score}, {computer_name} - {computer_score}{Style.RESET_ALL}")
+
+    def history(self, name, history):
+        print(f"{Fore.YELLOW}\n{name}’s move history: {history}{Style.RESET_ALL}")
+
+    def greeting(self, title="Rock, Paper, Scissors"):
+        print(f"{Fore.BLUE}Greetings, sir! I’m JARVIS, ready for a thrilling game of {title}. Shall we begin?{Style.RESET_ALL}")
+
+    def farewell(self, player_name, player_score, computer_name, computer_score):
+        print(f"{Fore.BLUE}\nFarewell, sir! Final score: {player_name} - {player_score}, {computer_name} - {computer_score}{Style.RESET_ALL}")
+
+
+class JsonLinesOutput(GameOutput):
+    # Structured events, buffered in memory and written as JSON lines every `buffer_size` events
+    # Only machine-relevant events are recorded (moves, predictions, results, scores), not chatter
+    def __init__(self, stream=None, buffer_size=1000):
+        # stream: File-like object to write to (defaults to sys.stdout)
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def emit(self, event, **fields):
+        fields["event"] = event
+        fields["ts"] = time.time()
+        self.buffer.append(fields)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def move_recorded(self, name, move, history):
+        self.emit("move", player=name, move=move)
+
+    def random_guess(self):
+        self.emit("random_guess")
+
+    def prediction(self, predicted_move):
+        self.emit("prediction", predicted=predicted_move)
+
+    def round_result(self, player_name, player_choice, computer_name, computer_choice, result):
+        self.emit("round", player=player_name, player_move=player_choice,
+                  computer=computer_name, computer_move=computer_choice, result=result)
+
+    def score(self, player_name, player_score, computer_name, computer_score):
+        self.emit("score", scores={player_name: player_score, computer_name: computer_score})
+
+    def farewell(self, player_name, player_score, computer_name, computer_score):
+        self.emit("game_over", scores={player_name: player_score, computer_name: computer_score})
+        self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write("".join(json.dumps(event) + "\n" for event in self.buffer))
+            self.stream.flush()
+            self.buffer.clear()
+
+
+class DeferredOutput:
+    # Holds messages for another output until replay(), e.g. JARVIS’s chatter about the move he picked,
+    # which is only shown once the player has moved
+    def __init__(self, target):
+        self.target = target
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.target, name)
+        return lambda *args, **kwargs: self.calls.append((method, args, kwargs))
+
+    def replay(self):
+        for method, args, kwargs in self.calls:
+            method(*args, **kwargs)
+        self.calls.clear()
+
+
+OUTPUT_MODES = {"interactive": InteractiveOutput, "quiet": GameOutput, "json": JsonLinesOutput}
+
+output = InteractiveOutput()  # Active output; the game scripts look this up on every message
+
+
+def set_output(new_output):
+    # Install an output object and return the previous one (flushed)
+    global output
+    previous = output
+    previous.flush()
+    output = new_output
+    return previous
+
+
+def set_output_mode(mode, **kwargs):
+    # Install a fresh output of the named mode ("interactive", "quiet" or "json")
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output mode: {mode}")
+    return set_output(OUTPUT_MODES[mode](**kwargs))
+
+
+@contextlib.contextmanager
+def deferred():
+    # Hold back every message sent inside the block; call replay() on the yielded DeferredOutput to show them
+    global output
+    target = output
+    output = held = DeferredOutput(target)
+    try:
+        yield held
+    finally:
+        output = target
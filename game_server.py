@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import contextlib
+import importlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import game_output
+import rng_service
+
+# Asyncio game server: many concurrent Rock, Paper, Scissors sessions over a simple line protocol
+# Run with: python game_server.py --port 8765   (or --unix /tmp/jarvis.sock)
+# Sessions play the game the game scripts are set to (JARVIS_GAME=rpsls, rps7 or rps15 for a larger one)
+#
+# Protocol (one command per line, UTF-8):
+#   server -> client on connect:  HELLO <predictor>
+#   client: MODE <predictor>      server: OK <predictor>      (switch predictor, resets the session)
+#   client: rock|paper|scissors   server: MOVE <jarvis_move> <win|tie|loss> <your_score> <jarvis_score>
+#           (or any other move name of the game)
+#   client: SCORE                 server: SCORE <your_score> <jarvis_score> <rounds>
+#   client: QUIT                  server: BYE <your_score> <jarvis_score>
+#   anything else                 server: ERR <reason>
+
+PREDICTORS = ("online", "ensemble", "tree", "forest", "rl")  # What a session can use to pick JARVIS’s move
+SLOW_PREDICTORS = ("tree", "forest")  # Scikit-learn models may refit; run them off the event loop
+RESULT_NAMES = {1: "win", 0: "tie", -1: "loss"}
+
+logger = logging.getLogger("game_server")
+
+
+class GameSession:
+    # One connected player: owns its Player objects and an isolated predictor or RLAgent
+    def __init__(self, predictor="online"):
+        if predictor not in PREDICTORS:
+            raise ValueError(f"Unknown predictor: {predictor}")
+        self.predictor = predictor
+        if predictor == "rl":
+            self.game = importlib.import_module("rock_paper_game_rl")
+            # Private agent: sessions never share a Q-table, and each explores with its own random stream
+            self.agent = self.game.RLAgent(rng=rng_service.session_stream())
+        elif predictor == "forest":
+            self.game = importlib.import_module("rock_paper_game_RandomForestClassifier")
+        else:
+            self.game = importlib.import_module("rock_paper_game")
+        self.player = self.game.Player("Player")
+        self.computer = self.game.Player("JARVIS")
+        self.rounds = 0
+
+    def jarvis_move(self):
+        # Pick JARVIS’s move from the player’s history, before seeing the player’s current move
+        if self.predictor == "rl":
+            return int(self.agent.choose_action(self.player.rl_state))
+        return self.game.GAME.move_index[self.game.predict_move(self.player, self.predictor)]
+
+    def play(self, player_move, jarvis_move):
+        # Score a round, update both players and let the RL agent learn; returns the player’s outcome
+        result = self.game.GAME.outcome(player_move, jarvis_move)
+        if result == 1:
+            self.player.update_score(1)
+        elif result == -1:
+            self.computer.update_score(1)
+        if self.predictor == "rl":
+            state = self.player.rl_state
+            self.player.rl_state = self.agent.encoder.next_state(state, player_move, jarvis_move, -result)
+            self.agent.update_q_table(state, jarvis_move, -result, self.player.rl_state)
+        self.player.record_move(player_move)
+        self.computer.record_move(jarvis_move)
+        self.rounds += 1
+        return result
+
+
+class GameServer:
+    def __init__(self, default_predictor="online", workers=None):
+        # workers: Threads for predictors that may block (Scikit-learn refits)
+        self.default_predictor = default_predictor
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predictor")
+        self.active_sessions = 0
+
+    async def handle(self, reader, writer):
+        # Serve one client connection until it quits or disconnects
+        loop = asyncio.get_running_loop()
+        session = GameSession(self.default_predictor)
+        self.active_sessions += 1
+
+        def send(text):
+            writer.write(text.encode() + b"\n")
+
+        try:
+            send(f"HELLO {session.predictor}")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break  # Client disconnected
+                command = line.decode(errors="replace").strip()
+                word = command.lower()
+                game = session.game.GAME
+                if word in game.move_index:
+                    if session.predictor in SLOW_PREDICTORS:
+                        # A slow fit only delays this session; every other session keeps playing
+                        jarvis_move = await loop.run_in_executor(self.executor, session.jarvis_move)
+                    else:
+                        jarvis_move = session.jarvis_move()
+                    result = session.play(game.move_index[word], jarvis_move)
+                    send(f"MOVE {game.moves[jarvis_move]} {RESULT_NAMES[result]} "
+                         f"{session.player.get_score()} {session.computer.get_score()}")
+                elif word.startswith("mode "):
+                    predictor = word.split(None, 1)[1]
+                    if predictor in PREDICTORS:
+                        session = GameSession(predictor)
+                        send(f"OK {predictor}")
+                    else:
+                        send(f"ERR unknown predictor {predictor}")
+                elif word == "score":
+                    send(f"SCORE {session.player.get_score()} {session.computer.get_score()} {session.rounds}")
+                elif word == "quit":
+                    send(f"BYE {session.player.get_score()} {session.computer.get_score()}")
+                    break
+                else:
+                    send(f"ERR expected {', '.join(game.moves)}, MODE, SCORE or QUIT")
+                await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass  # Client went away mid-write
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        # Listen on TCP (host, port) or on a Unix socket if unix_path is given, until cancelled
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            logger.info("Listening on unix:%s", unix_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+            logger.info("Listening on %s:%d", host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many concurrent JARVIS game sessions over a line protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--predictor", choices=PREDICTORS, default="online", help="Default predictor for new sessions")
+    parser.add_argument("--workers", type=int, default=None, help="Threads for Scikit-learn predictors")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    server = GameServer(args.predictor, args.workers)
+    # The game modules report JARVIS’s chatter on every move; a server has no terminal to show it on
+    game_output.set_output_mode("quiet")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+
+
+if __name__ == "__main__":
+    main()
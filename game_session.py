@@ -0,0 +1,111 @@
+import argparse
+
+import colorama  # Import colorama for colored terminal output
+from colorama import Fore, Style  # Import Fore for colors, Style for reset
+
+import game_output  # Interactive, quiet or JSON-lines output for JARVIS’s chatter
+import metrics  # Optional latency timers and counters (off unless enabled)
+from game_log import open_game_log  # Append-only binary log of every round
+from move_sources import TerminalSource, make_move_source  # Where the player's moves come from
+from scoreboard import open_scoreboard, player_name  # SQLite scores and player profiles
+
+# The session loop and command line shared by the game scripts (rock_paper_game.py,
+# rock_paper_game_RandomForestClassifier.py and rock_paper_game_rl.py)
+# A script passes its own module in as `game`, which provides:
+#   GAME, MOVE_NAMES, MODEL_TYPE, GAME_LOG_PATH, SCOREBOARD_PATH: what is played and where it is recorded
+#   Player, predict_move(player), check_win(player, computer, player_choice, computer_choice), show_score()
+# and optionally the hooks:
+#   start_session(): before the first round (e.g., start the RL checkpoint autosaver)
+#   end_session(): in the cleanup, also after Ctrl-C (e.g., save the final Q-table)
+#   plot_move_history(player, computer, log_path, first_round): the end-of-game report
+# Every script plays a round the same way: JARVIS picks his move before the player's move is known,
+# and his chatter about it is shown once the player has moved
+
+
+def warm_start(player, profile):
+    # Continue from the player's stored profile, so JARVIS predicts from the first round of a new session:
+    # refill the move history with their last moves and add their past transitions to the online predictor
+    # (players without one, like the RL game's, carry their Q-table over through the checkpoint instead)
+    if profile is None:
+        return
+    for move in profile["recent_moves"].tolist()[-player.move_history.window:]:
+        player.move_history.append(move)
+    predictor = getattr(player, "predictor", None)
+    if predictor is not None:
+        predictor.warm_start(profile["transitions"], profile["recent_moves"])
+
+
+def play_game(game, rounds=None, source=None, name=None):
+    # Main game loop: initializes players, handles rounds, and ends when the player stops
+    # game: The game script's module (see above)
+    # rounds: Play this many rounds without asking to continue (stops early if the moves run out)
+    # source: MoveSource for the player's moves (default: the terminal); any other source runs unattended
+    # name: The player's name (default: JARVIS_PLAYER, or asked for at the terminal)
+    source = source or TerminalSource(game.MOVE_NAMES)
+    unattended = rounds is not None or not source.interactive
+    colorama.init()  # Initialize colorama for cross-platform support
+    start_session = getattr(game, "start_session", None)
+    if start_session is not None:
+        start_session()
+    game_output.output.greeting(game.GAME.title)
+    player = game.Player(name or player_name(ask=not unattended), source=source)  # Create human player
+    computer = game.Player("JARVIS")  # Create AI player (JARVIS)
+    scoreboard = open_scoreboard(game.SCOREBOARD_PATH)
+    warm_start(player, scoreboard.load_profile(player.name))  # Pick up where the player's last session ended
+    score_session = scoreboard.start_session(player.name, game.MODEL_TYPE)
+
+    game_log = open_game_log(game.GAME_LOG_PATH)
+    first_round = game_log.rounds  # Where this session starts in the log
+    try:
+        played = 0
+        while rounds is None or played < rounds:
+            # Run one round of the game
+            with game_output.deferred() as chatter:
+                computer_choice = game.predict_move(player)  # JARVIS commits to his move first
+            player_choice = player.choose()  # Get player’s move
+            if player_choice is None:
+                break  # The move source has run out
+            chatter.replay()
+            result = game.check_win(player, computer, player_choice, computer_choice)  # Determine winner and update scores
+            player_move, computer_move = game.GAME.move_index[player_choice], game.GAME.move_index[computer_choice]
+            computer.record_move(computer_move)  # Keep JARVIS’s moves too, for the report
+            # Log the round from JARVIS’s side (+1 JARVIS win), like the RL reward
+            game_log.log_round(player_move, computer_move, -result, game.MODEL_TYPE)
+            score_session.record_round(player_move, computer_move, result)
+            game.show_score(player, computer)  # Show current scores
+            game_output.output.history(player.name, player.move_history)
+            played += 1
+            if unattended:
+                continue
+            play_again = input(f"{Fore.BLUE}\nWould you like another round, sir? (yes/no): {Style.RESET_ALL}").lower()  # Ask to continue
+            if play_again != "yes":
+                break  # End the game if the player says no
+        game_output.output.farewell(player.name, player.get_score(), computer.name, computer.get_score())
+    finally:
+        end_session = getattr(game, "end_session", None)
+        if end_session is not None:
+            end_session()
+        game_log.close()  # Write any buffered rounds
+        source.close()
+        score_session.close()  # Write the last rounds and close the session
+        scoreboard.close()
+    plot_move_history = getattr(game, "plot_move_history", None)
+    if plot_move_history is not None:
+        plot_move_history(player, computer, game.GAME_LOG_PATH, first_round)  # Report once the log is complete
+
+
+def main(game, argv=None):
+    # Command line of every game script: parse the options and play one session
+    parser = argparse.ArgumentParser(description="Play Rock, Paper, Scissors against JARVIS "
+                                                 "(set JARVIS_GAME=rpsls, rps7 or rps15 for a larger game).")
+    parser.add_argument("--moves", default="terminal",
+                        help='Where your moves come from: "terminal", "-" (stdin), a text file, a .rpslog game log or tcp:HOST:PORT')
+    parser.add_argument("--rounds", type=int, default=None, help="Play this many rounds without asking to continue")
+    parser.add_argument("--player", default=None, help="Your name (default: JARVIS_PLAYER, or asked for)")
+    parser.add_argument("--output", choices=sorted(game_output.OUTPUT_MODES), default=None,
+                        help="How JARVIS talks (default: interactive)")
+    args = parser.parse_args(argv)
+    if args.output:
+        game_output.set_output_mode(args.output)
+    with metrics.session_from_env():  # JARVIS_METRICS=1 / JARVIS_PROFILE=<prefix>
+        play_game(game, args.rounds, make_move_source(args.moves, game.MOVE_NAMES), args.player)
@@ -27,7 +27,8 @@ def check_win(player, computer):
       print("Scissors cut the paper! You lose.")
   
   
-chose = get_choice()
-result = check_win(chose["player"], chose["computer"])
+if __name__ == "__main__":
+  chose = get_choice()
+  result = check_win(chose["player"], chose["computer"])
 
-print(result)
\ No newline at end of file
+  print(result)
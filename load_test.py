@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+# Load-test client for game_server.py: many concurrent sessions, each playing a number of rounds
+# Run with: python load_test.py --sessions 1000 --rounds 100 [--port 8765 | --unix /tmp/jarvis.sock]
+
+MOVES = ("rock", "paper", "scissors")
+
+
+async def run_session(args, latencies, index):
+    # Play args.rounds moves on one connection and store each move’s round-trip time in `latencies`
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        await reader.readline()  # HELLO
+        if args.predictor:
+            writer.write(f"MODE {args.predictor}\n".encode())
+            await writer.drain()
+            reply = await reader.readline()
+            if not reply.startswith(b"OK"):
+                raise RuntimeError(f"Server refused predictor: {reply.decode().strip()}")
+        rng = random.Random(index)
+        clock = time.perf_counter
+        offset = index * args.rounds
+        for i in range(args.rounds):
+            start = clock()
+            writer.write(rng.choice(MOVES).encode() + b"\n")
+            await writer.drain()
+            reply = await reader.readline()
+            latencies[offset + i] = clock() - start
+            if not reply.startswith(b"MOVE"):
+                raise RuntimeError(f"Unexpected reply: {reply.decode().strip()}")
+        writer.write(b"QUIT\n")
+        await writer.drain()
+        await reader.readline()  # BYE
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load_test(args):
+    # Start all sessions at once and return (latencies in seconds, wall-clock seconds)
+    latencies = np.empty(args.sessions * args.rounds)
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(args, latencies, i) for i in range(args.sessions)))
+    return latencies, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure move latency of game_server.py under concurrency.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Connect to this Unix socket instead of TCP")
+    parser.add_argument("--sessions", type=int, default=100, help="Concurrent sessions")
+    parser.add_argument("--rounds", type=int, default=100, help="Moves per session")
+    parser.add_argument("--predictor", default=None, help="Ask the server for this predictor (MODE command)")
+    args = parser.parse_args(argv)
+
+    latencies, elapsed = asyncio.run(run_load_test(args))
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{args.sessions} sessions x {args.rounds} moves in {elapsed:.2f}s "
+          f"({latencies.size / elapsed:.0f} moves/sec)")
+    print(f"move latency: p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {latencies.max() * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import contextlib
+import functools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Hot-path latency instrumentation for the game loop and the agents
+# Turned off by default, and then free: nothing is wrapped and count() returns after one check
+# enable() wraps the functions listed in STAGES with timers that feed HDR-style latency histograms,
+# and optionally starts a background thread exporting to a JSON file and a Prometheus text file
+# From the games: JARVIS_METRICS=1 python rock_paper_game.py   (files: jarvis_metrics.json / .prom)
+#                 JARVIS_PROFILE=session python rock_paper_game.py   (cProfile + tracemalloc for one session)
+
+# Functions timed by enable(), per module; "Class.method" entries wrap the method on the class
+STAGES = {
+    "rock_paper_game": ["Player.choose", "train_ml_model", "compile_classifier", "predict_history",
+                        "predict_move", "check_win", "show_score"],
+    "rock_paper_game_RandomForestClassifier": ["Player.choose", "train_ml_model", "compile_classifier",
+                                               "predict_history", "load_pretrained_policy", "predict_move",
+                                               "check_win", "show_score", "plot_move_history"],
+    "rock_paper_game_rl": ["Player.choose", "RLAgent.choose_action", "RLAgent.update_q_table", "RLAgent.replay",
+                           "predict_move", "check_win", "show_score", "plot_move_history"],
+    "rl_standalone": ["RLAgent.choose_action", "RLAgent.update_q_table", "RLAgent.update_q_table_batch",
+                      "run_episodes", "run_batched_episodes"],
+    "ensemble_predictor": ["EnsemblePredictor.predict", "EnsemblePredictor.update"],
+    "game_output": ["InteractiveOutput.round_result", "InteractiveOutput.score", "InteractiveOutput.history",
+                    "JsonLinesOutput.emit"],
+}
+
+# Bucket bounds (seconds) used when exporting histograms to Prometheus
+PROMETHEUS_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+registry = None  # The active Metrics while enabled, else None
+_wrapped = []  # (owner, name, original) for every function enable() replaced
+_exporter = None
+
+
+class LatencyHistogram:
+    # HDR-style histogram of durations in nanoseconds: 16 linear sub-buckets per power of two,
+    # so every recorded value is kept to within ~6% using a fixed array, whatever the count
+    SUB_BUCKETS = 16
+    MAX_EXPONENT = 40  # Durations up to 2**44 ns (~5 hours); longer ones land in the last bucket
+
+    def __init__(self):
+        self.counts = [0] * (self.SUB_BUCKETS * (self.MAX_EXPONENT + 2))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, nanoseconds):
+        if nanoseconds < self.SUB_BUCKETS:
+            index = nanoseconds
+        else:
+            exponent = nanoseconds.bit_length() - 5  # Keeps the top 5 bits: 16..31 after the shift
+            index = min(self.SUB_BUCKETS * (exponent + 1) + (nanoseconds >> exponent) - self.SUB_BUCKETS,
+                        len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += nanoseconds
+        if self.min is None or nanoseconds < self.min:
+            self.min = nanoseconds
+        if nanoseconds > self.max:
+            self.max = nanoseconds
+
+    def bucket_upper(self, index):
+        # Largest duration (ns) that falls in bucket `index`
+        if index < self.SUB_BUCKETS:
+            return index
+        exponent, sub = divmod(index - self.SUB_BUCKETS, self.SUB_BUCKETS)
+        return ((sub + self.SUB_BUCKETS + 1) << exponent) - 1
+
+    def percentile(self, p):
+        # Duration (ns) at or below which p percent of recorded values fall
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * p / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bucket_upper(index), self.max)
+        return self.max
+
+    def cumulative(self, bounds_ns):
+        # Number of values at or below each bound (for Prometheus `le` buckets)
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds_ns:
+            while index < len(self.counts) and self.bucket_upper(index) <= bound:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def summary(self):
+        # Count, total and common percentiles in seconds
+        return {
+            "count": self.count,
+            "total_seconds": self.total / 1e9,
+            "mean_seconds": self.total / self.count / 1e9 if self.count else 0.0,
+            "min_seconds": (self.min or 0) / 1e9,
+            "max_seconds": self.max / 1e9,
+            "p50_seconds": self.percentile(50) / 1e9,
+            "p90_seconds": self.percentile(90) / 1e9,
+            "p99_seconds": self.percentile(99) / 1e9,
+            "p999_seconds": self.percentile(99.9) / 1e9,
+        }
+
+
+class Metrics:
+    # Latency histograms per stage plus named counters
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.started = time.time()
+
+    def observe(self, stage, nanoseconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+        histogram.record(nanoseconds)
+
+    @contextlib.contextmanager
+    def time(self, stage):
+        # Time an arbitrary block: with registry.time("render"): ...
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter_ns() - start)
+
+    def increment(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        return {
+            "timestamp": time.time(),
+            "uptime_seconds": time.time() - self.started,
+            "stages": {stage: h.summary() for stage, h in sorted(self.histograms.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def prometheus_text(self):
+        # Prometheus text exposition format (version 0.0.4)
+        bounds_ns = [round(bound * 1e9) for bound in PROMETHEUS_BUCKETS]
+        lines = ["# HELP jarvis_stage_seconds Time spent per call in each instrumented stage",
+                 "# TYPE jarvis_stage_seconds histogram"]
+        for stage, histogram in sorted(self.histograms.items()):
+            for bound, n in zip(PROMETHEUS_BUCKETS, histogram.cumulative(bounds_ns)):
+                lines.append(f'jarvis_stage_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {n}')
+            lines.append(f'jarvis_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'jarvis_stage_seconds_sum{{stage="{stage}"}} {histogram.total / 1e9:.9f}')
+            lines.append(f'jarvis_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE jarvis_{name}_total counter")
+            lines.append(f"jarvis_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+
+def count(name, n=1):
+    # Bump a counter (e.g., "model_refits", "exploration_moves"); does nothing while metrics are off
+    if registry is not None:
+        registry.increment(name, n)
+
+
+def _timed(stage, function):
+    observe = registry.observe
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            observe(stage, perf_counter_ns() - start)
+    return wrapper
+
+
+def _find_module(module_name):
+    # The imported module, or __main__ when that script is the one being run
+    module = sys.modules.get(module_name)
+    main = sys.modules.get("__main__")
+    if module is None and main is not None:
+        if os.path.splitext(os.path.basename(getattr(main, "__file__", "") or ""))[0] == module_name:
+            module = main
+    return module
+
+
+def instrument(module_name, targets):
+    # Wrap `targets` ("function" or "Class.method") of an imported module with timers
+    module = _find_module(module_name)
+    if module is None:
+        return
+    for target in targets:
+        owner = module
+        *classes, name = target.split(".")
+        for class_name in classes:
+            owner = getattr(owner, class_name, None)
+        original = owner.__dict__.get(name) if owner is not None else None
+        if original is None:
+            continue  # Not defined in this version of the module
+        setattr(owner, name, _timed(f"{module_name}.{target}", original))
+        _wrapped.append((owner, name, original))
+
+
+def _atomic_write_text(path, text):
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def export(json_path=None, prometheus_path=None):
+    # Write the current metrics to a JSON file and/or a Prometheus text file
+    if registry is None:
+        return
+    if json_path:
+        _atomic_write_text(json_path, json.dumps(registry.snapshot(), indent=2))
+    if prometheus_path:
+        _atomic_write_text(prometheus_path, registry.prometheus_text())
+
+
+class MetricsExporter:
+    # Exports every `interval` seconds from a background thread, so the game loop never waits on disk
+    def __init__(self, json_path, prometheus_path, interval=10.0):
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-export", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        # Stop the thread and write one final export
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        export(self.json_path, self.prometheus_path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            export(self.json_path, self.prometheus_path)
+
+
+def enable(json_path=None, prometheus_path=None, interval=10.0):
+    # Start collecting: wrap every STAGES function of the modules imported so far and, if paths are
+    # given, export them periodically; returns the Metrics registry
+    global registry, _exporter
+    if registry is not None:
+        return registry
+    registry = Metrics()
+    for module_name, targets in STAGES.items():
+        instrument(module_name, targets)
+    if json_path or prometheus_path:
+        _exporter = MetricsExporter(json_path, prometheus_path, interval).start()
+    return registry
+
+
+def disable():
+    # Write a final export, restore the original functions and stop collecting
+    global registry, _exporter
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
+    for owner, name, original in reversed(_wrapped):
+        setattr(owner, name, original)
+    _wrapped.clear()
+    registry = None
+
+
+@contextlib.contextmanager
+def profile_session(prefix):
+    # Capture one session with cProfile and tracemalloc; writes <prefix>.prof (open with pstats or
+    # snakeviz) and <prefix>.alloc.txt (top allocation sites by size)
+    import cProfile
+    import tracemalloc
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        profiler.dump_stats(f"{prefix}.prof")
+        with open(f"{prefix}.alloc.txt", "w") as f:
+            for stat in snapshot.statistics("lineno")[:50]:
+                f.write(f"{stat}\n")
+
+
+@contextlib.contextmanager
+def session_from_env():
+    # What the games wrap play_game() in: JARVIS_METRICS=1 turns on timers and periodic export,
+    # JARVIS_PROFILE=<prefix> profiles the session; with neither set this does nothing
+    profile_prefix = os.environ.get("JARVIS_PROFILE")
+    metrics_on = os.environ.get("JARVIS_METRICS", "") not in ("", "0")
+    with contextlib.ExitStack() as stack:
+        if metrics_on:
+            enable(os.environ.get("JARVIS_METRICS_JSON", "jarvis_metrics.json"),
+                   os.environ.get("JARVIS_METRICS_PROM", "jarvis_metrics.prom"),
+                   float(os.environ.get("JARVIS_METRICS_INTERVAL", "10")))
+            stack.callback(disable)
+        if profile_prefix:
+            stack.enter_context(profile_session(profile_prefix))
+        yield
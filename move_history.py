@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class MoveHistory:
+    # Fixed-size history of the most recent moves (0=rock, 1=paper, 2=scissors), stored as uint8
+    # Every move is written twice, at pos and pos + window, so the last k moves are always one
+    # contiguous slice of the buffer: last(k) returns a NumPy view without copying or O(n) pops
+    # It still behaves like the old list for len(), indexing, slicing, iteration and printing
+    __slots__ = ("window", "_buffer", "_pos", "_total")
+
+    def __init__(self, window=5):
+        # window: How many recent moves to keep (5 matches the original list-based history)
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self._buffer = np.zeros(2 * window, dtype=np.uint8)
+        self._pos = 0  # Where the next move is written, in [0, window)
+        self._total = 0  # Moves appended so far, including ones that fell out of the window
+
+    def append(self, move):
+        # Add a move in O(1); once the window is full the oldest move is overwritten
+        pos = self._pos
+        self._buffer[pos] = move
+        self._buffer[pos + self.window] = move
+        self._pos = pos + 1 if pos + 1 < self.window else 0
+        self._total += 1
+
+    def last(self, k=None):
+        # Zero-copy view of the last k moves, oldest first (all stored moves if k is None)
+        # The view changes as moves are appended; copy it if you need to keep it
+        size = len(self)
+        k = size if k is None else min(k, size)
+        end = self._pos + self.window
+        return self._buffer[end - k:end]
+
+    @property
+    def total(self):
+        # Number of moves ever appended
+        return self._total
+
+    def clear(self):
+        self._pos = 0
+        self._total = 0
+
+    def tolist(self):
+        return self.last().tolist()
+
+    def __len__(self):
+        return self._total if self._total < self.window else self.window
+
+    def __getitem__(self, index):
+        # history[-1] gives an int, history[-2:] gives a view, like list indexing on the stored moves
+        if isinstance(index, slice):
+            return self.last()[index]
+        return int(self.last()[index])
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __repr__(self):
+        # Print like a list; long histories only show their most recent moves
+        if len(self) <= 20:
+            return repr(self.tolist())
+        return "[..., " + repr(self.last(20).tolist())[1:]
@@ -0,0 +1,178 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from outcome_engine import RPS, get_game
+
+# Off-screen end-of-game report: renders a session's move history to PNG/SVG files without a display
+# Short sessions are drawn move by move like the original plot; long ones are aggregated with NumPy first
+# (move-frequency heatmap, rolling win rate, transition matrices), so the number of drawn points and the
+# render time stay bounded even for a million-round session
+# The games call render_in_background(), which hands the work to a detached process and returns at once
+# Run with: python move_report.py jarvis_games.rpslog --output jarvis_report --format png svg
+# (add --game rpsls, rps7 or rps15 for a log of one of the larger games)
+
+MAX_POINTS = 2000  # Most points drawn per line; longer series are downsampled
+RAW_ROUNDS = 200  # Sessions up to this long are also drawn move by move
+
+
+def rolling_mean(values, window):
+    # Mean of each `window` consecutive values via one cumulative sum (O(n), no Python loop)
+    cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def downsample(values, max_points=MAX_POINTS):
+    # (x, y) with at most max_points evenly spaced samples of `values`
+    x = np.linspace(0, len(values) - 1, min(len(values), max_points)).astype(np.int64)
+    return x, values[x]
+
+
+def move_frequencies(moves, bins, num_moves=3):
+    # Share of each move in `bins` consecutive chunks of the session, shape (num_moves, bins)
+    bin_of_round = np.arange(len(moves)) * bins // max(len(moves), 1)
+    counts = np.bincount(bin_of_round * num_moves + moves, minlength=bins * num_moves).reshape(bins, num_moves).T
+    return counts / np.maximum(counts.sum(axis=0), 1)
+
+
+def transition_matrix(previous, following, num_moves=3):
+    # Row-normalized num_moves x num_moves matrix: how often each `previous` move is followed by each `following` move
+    counts = np.bincount(previous.astype(np.int64) * num_moves + following,
+                         minlength=num_moves * num_moves).reshape(num_moves, num_moves)
+    return counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+
+
+def _draw_matrix(ax, matrix, title, row_label, column_label, move_names):
+    ax.imshow(matrix, vmin=0, vmax=1, cmap="Blues")
+    if len(matrix) <= 7:  # Larger matrices have no room for the numbers
+        for (row, column), value in np.ndenumerate(matrix):
+            ax.text(column, row, f"{value:.2f}", ha="center", va="center", color="black" if value < 0.6 else "white")
+    ax.set_xticks(range(len(move_names)), move_names, rotation=90 if len(move_names) > 7 else 0)
+    ax.set_yticks(range(len(move_names)), move_names)
+    ax.set_xlabel(column_label)
+    ax.set_ylabel(row_label)
+    ax.set_title(title)
+
+
+def render(player_moves, jarvis_moves, jarvis_outcomes, output_prefix, formats=("png",),
+           names=("Player", "JARVIS"), max_points=MAX_POINTS, game=RPS):
+    # Render one report figure and save it as output_prefix.<format> for each format; returns the paths
+    # player_moves, jarvis_moves: Move arrays (0=rock, 1=paper, 2=scissors); jarvis_outcomes: +1/0/-1 from JARVIS’s side
+    # game: GameDefinition the moves belong to (default: rock, paper, scissors)
+    # Uses Matplotlib’s Agg canvas directly (no pyplot, no window), so it runs headless and in any thread
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # Imported lazily: Matplotlib is slow to load
+    from matplotlib.figure import Figure
+    player_moves = np.asarray(player_moves, dtype=np.int64)
+    jarvis_moves = np.asarray(jarvis_moves, dtype=np.int64)
+    jarvis_outcomes = np.asarray(jarvis_outcomes, dtype=np.int64)
+    rounds = len(player_moves)
+    player_name, jarvis_name = names
+    move_names = [move.capitalize() for move in game.moves]
+    num_moves = game.num_moves
+
+    fig = Figure(figsize=(12, 8), layout="constrained")
+    FigureCanvasAgg(fig)
+    (moves_ax, rate_ax), (player_ax, reply_ax) = fig.subplots(2, 2)
+    fig.suptitle(f"{game.title}: {rounds} rounds")
+
+    if rounds <= RAW_ROUNDS:
+        # Few enough rounds to show every move, like the original plot
+        moves_ax.plot(player_moves, label=f"{player_name}’s Moves", color="blue", marker="o")
+        moves_ax.plot(jarvis_moves, label=f"{jarvis_name}’s Moves", color="red", marker="x")
+        moves_ax.set_yticks(range(num_moves), move_names)
+        moves_ax.set_xlabel("Move Number")
+        moves_ax.legend()
+        moves_ax.grid(True)
+        moves_ax.set_title("Move History")
+    else:
+        bins = min(rounds, max_points // 10)
+        moves_ax.imshow(move_frequencies(player_moves, bins, num_moves), aspect="auto", vmin=0, vmax=1,
+                        cmap="viridis", extent=(0, rounds, num_moves - 0.5, -0.5), interpolation="nearest")
+        moves_ax.set_yticks(range(num_moves), move_names)
+        moves_ax.set_xlabel("Round")
+        moves_ax.set_title(f"{player_name}’s move frequencies over time")
+
+    if rounds:
+        window = max(1, min(rounds, max(10, rounds // 50)))
+        for value, label, color in ((1, f"{jarvis_name} wins", "red"), (0, "Ties", "gray"), (-1, f"{player_name} wins", "blue")):
+            x, y = downsample(rolling_mean(jarvis_outcomes == value, window), max_points)
+            rate_ax.plot(x + window, y, label=label, color=color)
+        rate_ax.axhline((num_moves - 1) / 2 / num_moves, color="black", linestyle=":", linewidth=1)  # Chance win rate
+        rate_ax.set_ylim(0, 1)
+        rate_ax.legend()
+        rate_ax.set_title(f"Rolling rates ({window}-round window)")
+    rate_ax.set_xlabel("Round")
+
+    _draw_matrix(player_ax, transition_matrix(player_moves[:-1], player_moves[1:], num_moves),
+                 f"{player_name}’s move transitions", "Previous move", "Next move", move_names)
+    _draw_matrix(reply_ax, transition_matrix(jarvis_moves[:-1], player_moves[1:], num_moves),
+                 f"{player_name}’s reply to {jarvis_name}’s last move", f"{jarvis_name}’s move", f"{player_name}’s next move",
+                 move_names)
+
+    paths = []
+    for fmt in formats:
+        path = f"{output_prefix}.{fmt}"
+        fig.savefig(path, format=fmt)
+        paths.append(path)
+    return paths
+
+
+def render_log(log_path, output_prefix, start=0, stop=None, **kwargs):
+    # Render rounds [start:stop] of a binary game log (memory-mapped, so only those pages are read)
+    from game_log import open_log
+    records = open_log(log_path)[start:stop]
+    return render(records["player_move"], records["jarvis_move"], records["outcome"], output_prefix, **kwargs)
+
+
+def render_in_background(output_prefix, log_path=None, start=0, player_moves=(), jarvis_moves=(),
+                         formats=("png",), names=("Player", "JARVIS"), game=RPS):
+    # Render in a detached process so the game can exit straight away; returns the subprocess.Popen
+    # Reads rounds start.. of log_path if given, else the player_moves/jarvis_moves passed in
+    command = [sys.executable, os.path.abspath(__file__), "--output", output_prefix,
+               "--format", *formats, "--names", *names, "--game", game.name]
+    if log_path:
+        command += [log_path, "--start", str(start)]
+    else:
+        fd, moves_path = tempfile.mkstemp(suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, player_moves=np.asarray(player_moves, dtype=np.uint8),
+                     jarvis_moves=np.asarray(jarvis_moves, dtype=np.uint8))
+        command += ["--moves", moves_path]
+    return subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a game session report to image files.")
+    parser.add_argument("log", nargs="?", help="Binary game log (see game_log.py)")
+    parser.add_argument("--start", type=int, default=0, help="First round of the log to include")
+    parser.add_argument("--stop", type=int, default=None, help="Round of the log to stop before")
+    parser.add_argument("--moves", help="Read moves from this .npz instead (deleted afterwards)")
+    parser.add_argument("--output", default="jarvis_report", help="Output path without extension")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg", "pdf"])
+    parser.add_argument("--names", nargs=2, default=["Player", "JARVIS"], metavar=("PLAYER", "JARVIS"))
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS)
+    parser.add_argument("--game", default="rps", help="Game the moves are from (rps, rpsls, rps7 or rps15)")
+    args = parser.parse_args(argv)
+    game = get_game(args.game)
+    options = {"formats": args.format, "names": tuple(args.names), "max_points": args.max_points, "game": game}
+    if args.moves:
+        with np.load(args.moves) as data:
+            player_moves, jarvis_moves = data["player_moves"], data["jarvis_moves"]
+        os.unlink(args.moves)
+        rounds = min(len(player_moves), len(jarvis_moves))
+        player_moves, jarvis_moves = player_moves[len(player_moves) - rounds:], jarvis_moves[len(jarvis_moves) - rounds:]
+        paths = render(player_moves, jarvis_moves, game.outcomes(jarvis_moves, player_moves), args.output, **options)
+    elif args.log:
+        paths = render_log(args.log, args.output, args.start, args.stop, **options)
+    else:
+        parser.error("give a game log or --moves")
+    print("\n".join(paths))
+
+
+if __name__ == "__main__":
+    main()
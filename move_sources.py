@@ -0,0 +1,192 @@
+import codecs
+import io
+import os
+import socket
+import stat
+import sys
+
+import game_output
+from outcome_engine import MOVES
+
+# Where a Player's moves come from: the terminal (the original input() prompt), a scripted iterable, a text
+# file or stdin read in bulk, a recorded game log, or a socket
+# next_move() returns the next move as a number (0=rock, 1=paper, 2=scissors), or None once the source
+# is exhausted; only TerminalSource is interactive, so the games can run every other source unattended
+# Text sources accept rock/paper/scissors, r/p/s or 0/1/2, separated by whitespace or commas
+# Files are read a chunk at a time; pipes, terminals and sockets hand over whatever has arrived, so a bot can
+# send one move (followed by a separator, e.g. a newline) and wait for JARVIS's reply
+# make_move_source("-"), make_move_source("moves.txt"), make_move_source("jarvis_games.rpslog"),
+# make_move_source("tcp:127.0.0.1:5000") build one from a command-line argument
+# For the larger games in outcome_engine.GAMES pass move_names=game.moves; first letters are only accepted
+# where they are unambiguous (not for scissors/spock/sponge/snake)
+
+CHUNK_BYTES = 1 << 20  # How much a stream source reads at a time
+
+
+def move_tokens(move_names):
+    # Every spelling a text source accepts for a game's moves (name, unique first letter, number) -> move
+    initials = [name[0] for name in move_names]
+    return {**{name: index for index, name in enumerate(move_names)},
+            **{initial: index for index, initial in enumerate(initials) if initials.count(initial) == 1},
+            **{str(index): index for index in range(len(move_names))}}
+
+
+MOVE_TOKENS = move_tokens(MOVES)  # Rock, paper, scissors
+
+
+def parse_moves(text, tokens=MOVE_TOKENS):
+    # Move numbers for every token in `text`; raises ValueError on anything that isn't a move
+    words = text.replace(",", " ").lower().split()
+    try:
+        return [tokens[word] for word in words]
+    except KeyError as error:
+        raise ValueError(f"Not a move: {error.args[0]!r}") from None
+
+
+class MoveSource:
+    interactive = False  # True if next_move() waits for a person
+
+    def next_move(self, name):
+        # The next move of player `name`, or None when there are no more
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class TerminalSource(MoveSource):
+    # The original prompt: ask until a valid move is typed
+    interactive = True
+
+    def __init__(self, move_names=MOVES):
+        self.move_names = list(move_names)
+        self.prompt = ", ".join(self.move_names)
+
+    def next_move(self, name):
+        while True:
+            choice = input(f"{name}, enter your choice ({self.prompt}): ").lower()
+            if choice in self.move_names:
+                return self.move_names.index(choice)
+            game_output.output.invalid_choice(self.move_names)
+
+
+class IterableSource(MoveSource):
+    # Moves from any iterable of move numbers or names, e.g. a list, a generator or a NumPy array
+    def __init__(self, moves, move_names=MOVES):
+        self.moves = iter(moves)
+        self.tokens = move_tokens(move_names)
+        self.num_moves = len(move_names)
+
+    def next_move(self, name):
+        move = next(self.moves, None)
+        if move is None:
+            return None
+        if isinstance(move, str):
+            if move.lower() not in self.tokens:
+                raise ValueError(f"Not a move: {move!r}")
+            return self.tokens[move.lower()]
+        move = int(move)  # NumPy integers too
+        if not 0 <= move < self.num_moves:
+            raise ValueError(f"Not a move: {move!r}")
+        return move
+
+
+class StreamSource(MoveSource):
+    # Moves from a text stream (a file or stdin), read and parsed a chunk at a time rather than line by line
+    def __init__(self, stream, close_stream=False, move_names=MOVES):
+        self.stream = stream
+        self.close_stream = close_stream
+        self.tokens = move_tokens(move_names)
+        self.buffer = []
+        self.position = 0
+        self.partial = ""  # A token cut off at the end of the last chunk
+        self.descriptor = None if _is_regular_file(stream) else stream.fileno()
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def _read(self):
+        # The next chunk of text, "" at the end; for a file up to CHUNK_BYTES, otherwise what has arrived
+        if self.descriptor is None:
+            return self.stream.read(CHUNK_BYTES)
+        data = os.read(self.descriptor, CHUNK_BYTES)  # Returns as soon as anything is available
+        return self.decoder.decode(data, final=not data) or ("" if not data else self._read())
+
+    def _fill(self):
+        while self.position == len(self.buffer):
+            data = self._read()
+            if not data:
+                text, self.partial = self.partial, ""
+                self.buffer, self.position = parse_moves(text, self.tokens), 0
+                return
+            text = self.partial + data
+            cut = max(text.rfind(" "), text.rfind("\n"), text.rfind(","), text.rfind("\t"))
+            text, self.partial = text[:cut + 1], text[cut + 1:]
+            self.buffer, self.position = parse_moves(text, self.tokens), 0
+
+    def next_move(self, name):
+        if self.position == len(self.buffer):
+            self._fill()
+            if not self.buffer:
+                return None
+        move = self.buffer[self.position]
+        self.position += 1
+        return move
+
+    def close(self):
+        if self.close_stream:
+            self.stream.close()
+
+
+class FileSource(StreamSource):
+    # Moves from a text file
+    def __init__(self, path, move_names=MOVES):
+        super().__init__(open(path), close_stream=True, move_names=move_names)
+
+
+class GameLogSource(IterableSource):
+    # The player's moves from a recorded binary game log (see game_log.py), e.g. to replay a human session
+    # start, stop: Which rounds of the log to replay
+    def __init__(self, path, start=0, stop=None, move_names=MOVES):
+        from game_log import open_log
+        moves = open_log(path)["player_move"][start:stop]
+        if len(moves) and int(moves.max()) >= len(move_names):
+            raise ValueError(f"{path} has moves up to {int(moves.max())}, this game only has {len(move_names)} moves")
+        super().__init__(moves.tolist(), move_names)  # One bulk read of the memory map
+
+
+class SocketSource(StreamSource):
+    # Moves sent as text over a TCP connection (e.g., by a bot or a replay tool)
+    def __init__(self, host, port, move_names=MOVES):
+        self.socket = socket.create_connection((host, port))
+        super().__init__(io.StringIO(), move_names=move_names)
+
+    def _read(self):
+        # Whatever has arrived (recv returns as soon as any bytes do), "" once the peer closes
+        data = self.socket.recv(CHUNK_BYTES)
+        return self.decoder.decode(data, final=not data) or ("" if not data else self._read())
+
+    def close(self):
+        self.socket.close()
+
+
+def _is_regular_file(stream):
+    # True for files on disk and in-memory streams, which can be read in full chunks without waiting on a peer
+    try:
+        return stat.S_ISREG(os.fstat(stream.fileno()).st_mode)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return True
+
+
+def make_move_source(spec, move_names=MOVES):
+    # A MoveSource from a command-line style spec:
+    # "terminal", "-" (stdin), "tcp:HOST:PORT", a .rpslog game log, or a text file of moves
+    # move_names: The game's moves (default: rock, paper, scissors)
+    if not spec or spec == "terminal":
+        return TerminalSource(move_names)
+    if spec == "-":
+        return StreamSource(sys.stdin, move_names=move_names)
+    if spec.startswith("tcp:"):
+        host, _, port = spec[4:].rpartition(":")
+        return SocketSource(host, int(port), move_names)
+    if spec.endswith(".rpslog"):
+        return GameLogSource(spec, move_names=move_names)
+    return FileSource(spec, move_names)
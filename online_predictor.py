@@ -0,0 +1,48 @@
+import numpy as np
+
+
+class TransitionPredictor:
+    # Online move predictor: counts which move follows each window of the last `order` moves
+    # Every update and prediction is O(1), so nothing is retrained from scratch between rounds
+    def __init__(self, order=2, num_moves=3):
+        # order: How many past moves form the context (2 matches the features used by train_ml_model)
+        # num_moves: Size of the move set (3 for rock, paper, scissors)
+        self.order = order
+        self.num_moves = num_moves
+        self.num_contexts = num_moves ** order  # Number of distinct windows of `order` moves
+        # counts[context, move]: How often `move` followed the window encoded as `context`
+        self.counts = np.zeros((self.num_contexts, num_moves), dtype=np.int64)
+        self.context = 0  # Last `order` moves encoded as one base-`num_moves` number
+        self.seen = 0  # Total moves observed so far
+
+    def update(self, move):
+        # Record one new move (0=rock, 1=paper, 2=scissors)
+        if self.seen >= self.order:
+            # The window before this move is complete, so count the transition
+            self.counts[self.context, move] += 1
+        # Slide the window: drop the oldest move and append the new one
+        self.context = (self.context * self.num_moves + move) % self.num_contexts
+        self.seen += 1
+
+    def predict(self):
+        # Return the most frequent move after the current window, or None if it was never seen
+        if self.seen < self.order:
+            return None
+        row = self.counts[self.context]
+        if not row.any():
+            return None
+        return int(row.argmax())
+
+    def warm_start(self, counts, recent_moves=()):
+        # Continue from a stored profile: add its transition counts (shape (num_contexts, num_moves))
+        # and take the window from its last moves, so predictions are available from the first round
+        self.counts += np.asarray(counts, dtype=np.int64)
+        for move in list(recent_moves)[-self.order:]:
+            self.context = (self.context * self.num_moves + int(move)) % self.num_contexts
+        self.seen = max(self.seen, min(len(recent_moves), self.order))
+
+    def reset(self):
+        # Forget everything learned so far
+        self.counts[:] = 0
+        self.context = 0
+        self.seen = 0
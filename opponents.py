@@ -0,0 +1,279 @@
+import bisect
+
+import numpy as np
+
+import rng_service
+from outcome_engine import RPS
+
+# Scripted opponents for training and benchmarking JARVIS (stand-ins for the human player)
+# Every opponent draws from its own seeded NumPy Generator and can play many games side by side:
+# reset(num_envs) sets how many, moves(last_jarvis_moves) returns one move per game as an array,
+# and move(last_jarvis_move) is the scalar path for a single game
+# Opponents that don't react to JARVIS pre-generate moves in blocks, so a scalar move is one list index
+# A block holds at most BLOCK_ELEMENTS moves across all games, so with very many games each refill covers
+# fewer rounds (down to one round per refill) and memory stays O(num_envs)
+# Rock, paper, scissors by default; make_opponent(..., game=GAMES["rpsls"]) plays a larger game's moves
+
+BLOCK_ELEMENTS = 1 << 20  # Most moves pre-generated at once (8 MB of int64), whatever num_envs is
+DEFAULT_BIAS = (0.5, 0.3, 0.2)  # Rock-heavy player
+# Sticky player: usually repeats the last move, otherwise moves on to the next one
+DEFAULT_TRANSITIONS = ((0.6, 0.3, 0.1), (0.1, 0.6, 0.3), (0.3, 0.1, 0.6))
+
+
+def default_bias(num_moves):
+    # DEFAULT_BIAS for rock, paper, scissors; for larger games rock half the time, the rest evenly
+    if num_moves == 3:
+        return DEFAULT_BIAS
+    return (0.5,) + (0.5 / (num_moves - 1),) * (num_moves - 1)
+
+
+def default_transitions(num_moves):
+    # The sticky player for any game: 0.6 repeat, 0.3 the next move, 0.1 spread over the rest
+    # (DEFAULT_TRANSITIONS for rock, paper, scissors)
+    transitions = np.full((num_moves, num_moves), 0.1 / (num_moves - 2))
+    np.fill_diagonal(transitions, 0.6)
+    transitions[np.arange(num_moves), (np.arange(num_moves) + 1) % num_moves] = 0.3
+    return transitions
+
+
+class Opponent:
+    # Base class for opponents whose moves don't depend on JARVIS: subclasses implement _generate()
+    name = "opponent"
+
+    def __init__(self, seed=None, block_size=4096, num_moves=3):
+        # seed: int, SeedSequence or Generator (default: spawned from rng_service)
+        # block_size: Rounds per refill (fewer when num_envs * block_size would exceed BLOCK_ELEMENTS)
+        # num_moves: Size of the game's move set
+        self.rng = rng_service.generator(seed)
+        self.block_size = block_size
+        self.num_moves = num_moves
+        self.reset()
+
+    def reset(self, num_envs=1):
+        # Start new games: `num_envs` independent opponents, each from its first move
+        self.num_envs = num_envs
+        self._start(num_envs)
+        self._block = np.zeros((0, num_envs), dtype=np.int64)
+        self._scalars = []
+        self._position = 0
+
+    def _start(self, num_envs):
+        # Set up per-game state (e.g., where each game is in a cycle)
+        pass
+
+    def _generate(self, rounds):
+        # Return the next `rounds` moves of every game, shape (rounds, num_envs)
+        raise NotImplementedError
+
+    def _refill(self):
+        self._block = self._generate(max(1, min(self.block_size, BLOCK_ELEMENTS // self.num_envs)))
+        self._scalars = self._block[:, 0].tolist()  # Python ints for the scalar path
+        self._position = 0
+
+    def moves(self, last_jarvis_moves=None):
+        # This round's move for every game, shape (num_envs,)
+        if self._position == len(self._block):
+            self._refill()
+        row = self._block[self._position]
+        self._position += 1
+        return row
+
+    def move(self, last_jarvis_move=None):
+        # This round's move for a single game (num_envs == 1)
+        if self._position == len(self._scalars):
+            self._refill()
+        value = self._scalars[self._position]
+        self._position += 1
+        return value
+
+
+class RandomOpponent(Opponent):
+    # Uniformly random moves (what RockPaperScissorsEnv always used to play)
+    name = "random"
+
+    def _generate(self, rounds):
+        return self.rng.integers(0, self.num_moves, size=(rounds, self.num_envs))
+
+
+class BiasedOpponent(Opponent):
+    # Random moves with fixed, unequal frequencies
+    name = "biased"
+
+    def __init__(self, probabilities=None, seed=None, block_size=4096, num_moves=3):
+        if probabilities is None:
+            probabilities = default_bias(num_moves)
+        self.probabilities = np.asarray(probabilities, dtype=np.float64) / np.sum(probabilities)
+        super().__init__(seed, block_size, len(self.probabilities))
+
+    def _generate(self, rounds):
+        return self.rng.choice(self.num_moves, size=(rounds, self.num_envs), p=self.probabilities)
+
+
+class CyclicOpponent(Opponent):
+    # Plays a fixed sequence over and over (every move in order by default: rock, paper, scissors)
+    # noise: Chance of a random move instead; each game starts at a random point in the cycle
+    name = "cyclic"
+
+    def __init__(self, sequence=None, noise=0.0, seed=None, block_size=4096, num_moves=3):
+        self.sequence = np.arange(num_moves) if sequence is None else np.asarray(sequence, dtype=np.int64)
+        self.noise = noise
+        super().__init__(seed, block_size, num_moves)
+
+    def _start(self, num_envs):
+        self.offsets = self.rng.integers(0, len(self.sequence), size=num_envs)
+
+    def _generate(self, rounds):
+        steps = self.offsets + np.arange(rounds)[:, None]
+        block = self.sequence[steps % len(self.sequence)]
+        self.offsets = (self.offsets + rounds) % len(self.sequence)
+        return _add_noise(self.rng, block, self.noise, self.num_moves)
+
+
+class MarkovOpponent(Opponent):
+    # Picks each move from a transition matrix: transitions[previous][next] is P(next | previous)
+    name = "markov"
+
+    def __init__(self, transitions=None, seed=None, block_size=4096, num_moves=3):
+        if transitions is None:
+            transitions = DEFAULT_TRANSITIONS if num_moves == 3 else default_transitions(num_moves)
+        transitions = np.asarray(transitions, dtype=np.float64)
+        self.cumulative = np.cumsum(transitions / transitions.sum(axis=1, keepdims=True), axis=1)
+        self.cumulative[:, -1] = 1.0  # Guard against rounding leaving a gap below 1
+        super().__init__(seed, block_size, len(transitions))
+
+    def _start(self, num_envs):
+        self.previous = self.rng.integers(0, self.num_moves, size=num_envs)
+
+    def _generate(self, rounds):
+        # All random numbers come from one call; the chain itself is one small vectorized step per round
+        uniforms = self.rng.random((rounds, self.num_envs))
+        if self.num_envs == 1:  # One game: walking the chain with Python scalars is faster than tiny arrays
+            previous = int(self.previous[0])
+            cumulative = self.cumulative.tolist()
+            search = bisect.bisect_right  # First move whose cumulative probability exceeds u
+            moves = []
+            for u in uniforms[:, 0].tolist():
+                previous = search(cumulative[previous], u)
+                moves.append(previous)
+            self.previous = np.array([previous])
+            return np.array(moves, dtype=np.int64)[:, None]
+        block = np.empty((rounds, self.num_envs), dtype=np.int64)
+        previous = self.previous
+        cumulative = self.cumulative
+        for t in range(rounds):
+            previous = (uniforms[t][:, None] >= cumulative[previous]).sum(axis=1)
+            block[t] = previous
+        self.previous = previous
+        return block
+
+
+class ReplayOpponent(Opponent):
+    # Replays the player's moves from a recorded game log (see game_log.py), looping at the end
+    # Each game starts at a random point of the recording unless start is given
+    name = "replay"
+
+    def __init__(self, log_path=None, moves=None, start=None, seed=None, block_size=4096, num_moves=3):
+        if moves is None:
+            from game_log import open_log
+            moves = open_log(log_path)["player_move"]  # Memory-mapped: the log isn't loaded up front
+        if len(moves) == 0:
+            raise ValueError("No recorded moves to replay")
+        if int(moves.max()) >= num_moves:  # e.g., an rpsls log replayed into rock, paper, scissors
+            source = log_path or "The recorded moves"
+            raise ValueError(f"{source} has moves up to {int(moves.max())}, this game only has {num_moves} moves")
+        self.recorded = moves
+        self.start = start
+        super().__init__(seed, block_size, num_moves)
+
+    def _start(self, num_envs):
+        if self.start is None:
+            self.positions = self.rng.integers(0, len(self.recorded), size=num_envs)
+        else:
+            self.positions = np.full(num_envs, self.start % len(self.recorded))
+
+    def _generate(self, rounds):
+        steps = (self.positions + np.arange(rounds)[:, None]) % len(self.recorded)
+        self.positions = (self.positions + rounds) % len(self.recorded)
+        return np.asarray(self.recorded[steps], dtype=np.int64)
+
+
+class ReactiveOpponent(Opponent):
+    # Base class for opponents that answer JARVIS's last move: subclasses implement _respond()
+    # noise: Chance of a random move instead (drawn in blocks like the other opponents)
+    def __init__(self, noise=0.0, seed=None, block_size=4096, num_moves=3):
+        self.noise = noise
+        super().__init__(seed, block_size, num_moves)
+
+    def _respond(self, last_jarvis_moves):
+        raise NotImplementedError
+
+    def _generate(self, rounds):
+        # Pre-drawn noise: -1 means "answer JARVIS", anything else is the random move to play instead
+        block = np.full((rounds, self.num_envs), -1, dtype=np.int64)
+        return _add_noise(self.rng, block, self.noise, self.num_moves)
+
+    def moves(self, last_jarvis_moves=None):
+        noise = super().moves()
+        if last_jarvis_moves is None:  # First round: nothing to react to yet
+            return np.where(noise >= 0, noise, self.rng.integers(0, self.num_moves, size=self.num_envs))
+        return np.where(noise >= 0, noise, self._respond(np.asarray(last_jarvis_moves)))
+
+    def move(self, last_jarvis_move=None):
+        noise = super().move()
+        if noise >= 0:
+            return noise
+        if last_jarvis_move is None:
+            return int(self.rng.integers(0, self.num_moves))
+        return int(self._respond(last_jarvis_move))
+
+
+class CopycatOpponent(ReactiveOpponent):
+    # Plays whatever JARVIS played last round
+    name = "copycat"
+
+    def _respond(self, last_jarvis_moves):
+        return last_jarvis_moves
+
+
+class BeatLastOpponent(ReactiveOpponent):
+    # Plays the move that would have beaten JARVIS's last move
+    # counter_moves: The game's counter-move table (outcome_engine.GameDefinition.counter_moves)
+    name = "beat_last"
+
+    def __init__(self, noise=0.0, seed=None, block_size=4096, counter_moves=RPS.counter_moves):
+        self.counter_moves = counter_moves
+        super().__init__(noise, seed, block_size, len(counter_moves))
+
+    def _respond(self, last_jarvis_moves):
+        return self.counter_moves[last_jarvis_moves]
+
+
+def _add_noise(rng, block, noise, num_moves=3):
+    # Replace each entry of `block` with a random move with probability `noise`
+    if noise <= 0:
+        return block
+    mask = rng.random(block.shape) < noise
+    block[mask] = rng.integers(0, num_moves, size=int(mask.sum()))
+    return block
+
+
+# Factories by name, for command-line flags; "replay" needs a log path
+OPPONENTS = {
+    "random": lambda seed, log_path, game: RandomOpponent(seed=seed, num_moves=game.num_moves),
+    "biased": lambda seed, log_path, game: BiasedOpponent(seed=seed, num_moves=game.num_moves),
+    "cyclic": lambda seed, log_path, game: CyclicOpponent(seed=seed, num_moves=game.num_moves),
+    "markov": lambda seed, log_path, game: MarkovOpponent(seed=seed, num_moves=game.num_moves),
+    "copycat": lambda seed, log_path, game: CopycatOpponent(noise=0.1, seed=seed, num_moves=game.num_moves),
+    "beat_last": lambda seed, log_path, game: BeatLastOpponent(noise=0.1, seed=seed, counter_moves=game.counter_moves),
+    "replay": lambda seed, log_path, game: ReplayOpponent(log_path, seed=seed, num_moves=game.num_moves),
+}
+
+
+def make_opponent(name, seed=None, log_path=None, game=None):
+    # Build one of the OPPONENTS by name
+    # game: outcome_engine.GameDefinition whose moves the opponent plays (default: rock, paper, scissors)
+    if name not in OPPONENTS:
+        raise ValueError(f"Unknown opponent: {name}")
+    if name == "replay" and not log_path:
+        raise ValueError("The replay opponent needs a game log path")
+    return OPPONENTS[name](seed=seed, log_path=log_path, game=game or RPS)
@@ -0,0 +1,131 @@
+import numpy as np
+
+# Shared, side-effect-free outcome engine for Rock, Paper, Scissors
+# Moves are numbers everywhere: 0=rock, 1=paper, 2=scissors
+# GameDefinition generalizes the same tables to any symmetric game given by an N x N payoff matrix
+# (Rock-Paper-Scissors-Spock-Lizard, 7- and 15-move variants in GAMES); scoring and counter moves stay
+# single table lookups, so a round costs the same whatever the number of moves
+
+MOVES = ["rock", "paper", "scissors"]  # Text move for each number
+MOVE_INDEX = {"rock": 0, "paper": 1, "scissors": 2}  # Number for each text move
+
+# PAYOFF[a, b]: Outcome for the player who chose `a` against a player who chose `b`
+# +1 win, 0 tie, -1 loss (so JARVIS's reward is PAYOFF[jarvis_move, player_move])
+PAYOFF = np.array([
+    [0, -1, 1],   # rock: ties rock, loses to paper, beats scissors
+    [1, 0, -1],   # paper: beats rock, ties paper, loses to scissors
+    [-1, 1, 0],   # scissors: loses to rock, beats paper, ties scissors
+], dtype=np.int8)
+PAYOFF.setflags(write=False)  # Shared table, never modified at runtime
+# Plain nested lists for the scalar path: indexing a list is much cheaper than indexing a NumPy array
+_PAYOFF_ROWS = PAYOFF.tolist()
+# COUNTER_MOVE[m]: The move that beats `m` (paper for rock, and so on)
+COUNTER_MOVE = PAYOFF.argmax(axis=0)
+COUNTER_MOVE.setflags(write=False)
+
+# What JARVIS says after each (player move, JARVIS move) pair in the interactive games
+ROUND_MESSAGES = {
+    (0, 0): "It’s a tie! We’re evenly matched, sir!",
+    (1, 1): "It’s a tie! We’re evenly matched, sir!",
+    (2, 2): "It’s a tie! We’re evenly matched, sir!",
+    (0, 2): "Rock smashes scissors! You’ve outsmarted me, sir—well done!",
+    (0, 1): "Paper covers the rock! I win this round, sir—impressive strategy!",
+    (1, 0): "Paper covers the rock! Victory is yours, sir!",
+    (1, 2): "Scissors cut the paper! I’ve bested you this time, sir!",
+    (2, 1): "Scissors cut the paper! You’ve triumphed, sir!",
+    (2, 0): "Rock smashes scissors! I claim this victory, sir!",
+}
+
+
+def outcome(move, other_move):
+    # Scalar fast path: +1 if `move` beats `other_move`, 0 for a tie, -1 if it loses
+    return _PAYOFF_ROWS[move][other_move]
+
+
+def outcome_text(choice, other_choice):
+    # Same as outcome(), for text moves ("rock", "paper", "scissors")
+    return _PAYOFF_ROWS[MOVE_INDEX[choice]][MOVE_INDEX[other_choice]]
+
+
+def outcomes(moves, other_moves):
+    # Batched path: score whole arrays of move pairs in one call
+    # moves, other_moves: Integer arrays of the same shape; returns an int8 array of +1/0/-1
+    return PAYOFF[np.asarray(moves), np.asarray(other_moves)]
+
+
+def score_games(moves, other_moves):
+    # Count wins, ties and losses for `moves` over a batch of rounds (e.g., a recorded game)
+    counts = np.bincount(outcomes(moves, other_moves).ravel() + 1, minlength=3)
+    return {"wins": int(counts[2]), "ties": int(counts[1]), "losses": int(counts[0])}
+
+
+class GameDefinition:
+    # A symmetric zero-sum game: move names plus an antisymmetric payoff matrix (+1 win, 0 tie, -1 loss)
+    # counter_moves: Optional reply to each move (default: the first move that beats it); when the replies
+    #                form a permutation, beaten_moves is its inverse, else None
+    # title: How the game is called in JARVIS's chatter and reports (default: the move names, e.g. "Rock, Paper, Scissors")
+    def __init__(self, name, moves, payoff, counter_moves=None, title=None):
+        payoff = np.array(payoff, dtype=np.int8)
+        if payoff.shape != (len(moves), len(moves)) or (payoff != -payoff.T).any():
+            raise ValueError(f"{name}: the payoff matrix must be {len(moves)}x{len(moves)} and antisymmetric")
+        self.name = name
+        self.title = title or ", ".join(move.capitalize() for move in moves)
+        self.moves = list(moves)
+        self.num_moves = len(self.moves)
+        self.move_index = {move: index for index, move in enumerate(self.moves)}
+        self.payoff = payoff
+        self.payoff.setflags(write=False)
+        self._rows = payoff.tolist()
+        counter = payoff.argmax(axis=0) if counter_moves is None else np.array(counter_moves, dtype=np.int64)
+        if (payoff[counter, np.arange(self.num_moves)] != 1).any():
+            raise ValueError(f"{name}: every counter move must beat the move it answers")
+        self.counter_moves = counter  # counter_moves[m]: JARVIS's reply when it expects `m`
+        self.counter_moves.setflags(write=False)
+        is_permutation = len(set(counter.tolist())) == self.num_moves
+        self.beaten_moves = np.argsort(counter) if is_permutation else None  # beaten_moves[counter_moves[m]] == m
+
+    def outcome(self, move, other_move):
+        # Scalar fast path: +1 if `move` beats `other_move`, 0 for a tie, -1 if it loses
+        return self._rows[move][other_move]
+
+    def outcomes(self, moves, other_moves):
+        # Batched path: score whole arrays of move pairs in one call
+        return self.payoff[np.asarray(moves), np.asarray(other_moves)]
+
+    def score_games(self, moves, other_moves):
+        counts = np.bincount(self.outcomes(moves, other_moves).ravel() + 1, minlength=3)
+        return {"wins": int(counts[2]), "ties": int(counts[1]), "losses": int(counts[0])}
+
+
+def cyclic_game(name, moves, offsets, title=None):
+    # A balanced cyclic game: move i beats move (i - k) mod N for each k in offsets (and loses to the rest)
+    # JARVIS's counter to move m is m + offsets[0], so the counters form a permutation
+    n = len(moves)
+    payoff = np.zeros((n, n), dtype=np.int8)
+    for k in offsets:
+        beaten = (np.arange(n) - k) % n
+        payoff[np.arange(n), beaten] = 1
+        payoff[beaten, np.arange(n)] = -1
+    return GameDefinition(name, moves, payoff, (np.arange(n) + offsets[0]) % n, title)
+
+
+RPS = GameDefinition("rps", MOVES, PAYOFF)
+GAMES = {
+    "rps": RPS,
+    # Each move beats two others: scissors cut paper and decapitate lizard, Spock smashes scissors, ...
+    "rpsls": cyclic_game("rpsls", ["rock", "paper", "scissors", "spock", "lizard"], (1, 3)),
+    # Each move beats the three that follow it in this order
+    "rps7": cyclic_game("rps7", ["rock", "fire", "scissors", "sponge", "paper", "air", "water"], (-1, -2, -3),
+                        "Rock, Paper, Scissors 7"),
+    # Each move beats the seven that follow it in this order
+    "rps15": cyclic_game("rps15", ["rock", "fire", "scissors", "snake", "human", "tree", "wolf", "sponge", "paper",
+                                   "air", "water", "dragon", "devil", "lightning", "gun"], tuple(range(-1, -8, -1)),
+                         "Rock, Paper, Scissors 15"),
+}
+
+
+def get_game(name):
+    # One of the GAMES by name
+    if name not in GAMES:
+        raise ValueError(f"Unknown game: {name} (choose from {', '.join(GAMES)})")
+    return GAMES[name]
@@ -0,0 +1,61 @@
+import argparse
+import contextlib
+import os
+import time
+
+import game_output
+import rng_service
+import rock_paper_game as game
+
+# Per-round cost of the game loop in each output mode (interactive, quiet, json)
+# Rounds are driven by scripted moves instead of input(); interactive and JSON output go to os.devnull,
+# so the numbers show formatting and write cost without a terminal redrawing
+# Run with: python output_benchmark.py --rounds 20000   (add --seed N to repeat the same moves)
+
+
+def play_rounds(rounds, rng=None):
+    # Run the same steps as one play_game() round, minus the input() prompts
+    # rng: RandomStream for the player's moves (default: a new session stream from rng_service)
+    rng = rng or rng_service.session_stream()
+    player = game.Player("Parth")
+    computer = game.Player("JARVIS")
+    for _ in range(rounds):
+        numeric_move = rng.action(game.GAME.num_moves)
+        player_choice = game.MOVE_NAMES[numeric_move]
+        player.record_move(numeric_move)
+        game_output.output.move_recorded(player.name, numeric_move, player.move_history)
+        computer_choice = game.predict_move(player, "online")
+        game.check_win(player, computer, player_choice, computer_choice)
+        game.show_score(player, computer)
+        game_output.output.history(player.name, player.move_history)
+
+
+def benchmark_mode(mode, rounds):
+    # Return the mean cost of one round in microseconds for an output mode
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        kwargs = {"stream": devnull} if mode == "json" else {}
+        previous = game_output.set_output_mode(mode, **kwargs)
+        try:
+            start = time.perf_counter()
+            play_rounds(rounds)
+            game_output.output.flush()
+            elapsed = time.perf_counter() - start
+        finally:
+            game_output.set_output(previous)
+    return elapsed / rounds * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-round cost of each output mode.")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for the player's moves and JARVIS's random guesses (default: JARVIS_SEED)")
+    args = parser.parse_args(argv)
+    if args.seed is not None:
+        rng_service.seed(args.seed)
+    for mode in game_output.OUTPUT_MODES:
+        print(f"{mode:<12} {benchmark_mode(mode, args.rounds):8.2f} us/round")
+
+
+if __name__ == "__main__":
+    main()
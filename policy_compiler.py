@@ -0,0 +1,163 @@
+import functools
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Policy compiler: turns JARVIS's predictors into flat lookup arrays indexed by an encoded move window
+# A window of moves (0=rock, 1=paper, 2=scissors), oldest first, is encoded as one base-3 number
+# (base num_moves for the larger games in outcome_engine.GAMES)
+# Lookup entries hold the predicted move, NO_PREDICTION (-1) or, for lazily built tables, UNCOMPUTED (-2)
+# A HistoryPolicy table can be compiled in one pass (compile_all) and saved, so later sessions only look up
+
+NO_PREDICTION = -1  # The predictor had not enough data (JARVIS guesses randomly)
+UNCOMPUTED = -2  # Table entry not filled in yet
+
+
+def encode_window(moves, num_moves=3):
+    # Encode a sequence of moves as a base-num_moves number, oldest move most significant
+    code = 0
+    for move in moves:
+        code = code * num_moves + int(move)
+    return code
+
+
+def all_windows(length, num_moves=3):
+    # Every possible window of `length` moves, as an array of shape (num_moves**length, length)
+    # Row i decodes to the window whose encode_window() is i
+    if length == 0:
+        return np.zeros((1, 0), dtype=np.uint8)
+    codes = np.arange(num_moves ** length)
+    powers = num_moves ** np.arange(length - 1, -1, -1)
+    return ((codes[:, None] // powers) % num_moves).astype(np.uint8)
+
+
+def compile_classifier(clf, n_features=2, num_moves=3):
+    # Compile a fitted classifier that predicts the next move from the last `n_features` moves
+    # Returns an int8 array where table[encode_window(last_moves, num_moves)] == clf.predict([last_moves])[0]
+    # One batched predict() over all num_moves**n_features inputs replaces one predict() per round
+    return clf.predict(all_windows(n_features, num_moves)).astype(np.int8)
+
+
+def sklearn_key(*parts):
+    # A HistoryPolicy save key for predictions from Scikit-learn models: `parts` plus the library version
+    # (read from the package metadata, so Scikit-learn itself isn't imported)
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        sklearn_version = version("scikit-learn")
+    except PackageNotFoundError:
+        sklearn_version = None
+    return " ".join(str(part) for part in parts + (f"sklearn={sklearn_version}",))
+
+
+def _compute(predict_fn, history):
+    prediction = predict_fn(history)
+    return NO_PREDICTION if prediction is None else int(prediction)
+
+
+class LRUPolicyCache:
+    # Bounded cache of window -> prediction for windows too long to enumerate; evicts least recently used
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        # Return the cached value for `key`, calling compute() and caching the result on a miss
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self.entries[key] = value
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)  # Evict the least recently used window
+            return value
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class HistoryPolicy:
+    # Compiled version of a whole "history window -> predicted move" mapping
+    # predict_fn(history) takes a uint8 array of up to `window` moves and returns a move or None
+    # Histories of every length 0..window share one flat table: index = offset[len] + encode_window(history)
+    # If that table would exceed max_table_size entries, an LRUPolicyCache keyed by the raw bytes is used
+    def __init__(self, predict_fn, window=5, max_table_size=3 ** 12, cache_size=100000, num_moves=3):
+        self.predict_fn = predict_fn
+        self.window = window
+        self.num_moves = num_moves
+        # offsets[n]: Where histories of length n start in the flat table
+        self.offsets = np.concatenate(([0], np.cumsum(num_moves ** np.arange(window + 1, dtype=np.int64)))).tolist()
+        table_size = self.offsets[-1]
+        if table_size <= max_table_size:
+            self.table = np.full(table_size, UNCOMPUTED, dtype=np.int8)
+            self.cache = None
+        else:
+            self.table = None
+            self.cache = LRUPolicyCache(cache_size)
+
+    def _compute(self, history):
+        return _compute(self.predict_fn, history)
+
+    def predict(self, history):
+        # Return the predicted move for a history (oldest first), or None if the predictor had no answer
+        history = history[-self.window:]
+        if self.table is not None:
+            index = self.offsets[len(history)] + encode_window(history, self.num_moves)
+            value = self.table[index]
+            if value == UNCOMPUTED:
+                value = self.table[index] = self._compute(np.asarray(history, dtype=np.uint8))
+        else:
+            history = np.asarray(history, dtype=np.uint8)
+            value = self.cache.get(history.tobytes(), lambda: self._compute(history))
+        return None if value == NO_PREDICTION else int(value)
+
+    def compile_all(self, workers=1):
+        # Eagerly fill the whole table (only possible when it fits in max_table_size)
+        # Every missing window is computed in one pass, spread over `workers` processes if more than 1
+        if self.table is None:
+            raise ValueError("Window too large to enumerate; predictions are cached lazily instead")
+        windows = [all_windows(length, self.num_moves) for length in range(self.window + 1)]
+        index = np.concatenate([self.offsets[length] + np.arange(len(rows)) for length, rows in enumerate(windows)])
+        missing = self.table[index] == UNCOMPUTED
+        histories = [history for rows in windows for history in rows]
+        histories = [history for history, needed in zip(histories, missing.tolist()) if needed]
+        compute = functools.partial(_compute, self.predict_fn)
+        if workers > 1 and len(histories) > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                values = list(pool.map(compute, histories, chunksize=max(1, len(histories) // (4 * workers))))
+        else:
+            values = [compute(history) for history in histories]
+        self.table[index[missing]] = values
+        return self.table
+
+    def save(self, path, key=""):
+        # Store the table (atomically) for load(); key: What the predictions depend on (model, seed, versions)
+        directory = os.path.dirname(path) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, table=self.table, window=self.window, num_moves=self.num_moves, key=key)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, path, key=""):
+        # Fill the table from save(); returns False, leaving the table as it was, if there is no such file or
+        # it was saved for another window, move set or key
+        if self.table is None or not os.path.exists(path):
+            return False
+        with np.load(path) as saved:
+            if (int(saved["window"]) != self.window or int(saved["num_moves"]) != self.num_moves
+                    or str(saved["key"]) != key or saved["table"].shape != self.table.shape):
+                return False
+            self.table[:] = saved["table"]
+        return True
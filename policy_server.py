@@ -0,0 +1,307 @@
+import argparse
+import logging
+import os
+import queue
+import secrets
+import signal
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError, Process, resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener, answer_challenge, deliver_challenge
+
+import numpy as np
+
+# Local policy server: one live RL Q-table shared by every game process on the machine
+# The learner process keeps the Q-table in multiprocessing.shared_memory; game processes map the same
+# memory and read it in place (no copies of the table, no round trip to the server), while the rounds they
+# play are sent to the learner, which applies them in order, so every game learns from every other game
+# Writes are guarded by a seqlock: the learner bumps a sequence number to odd before writing and back to even
+# after; a reader retries if it saw an odd number or the number changed under it, so readers never block
+# Messages are pickles, so only clients holding the server's key may connect: the server generates a random
+# key at start-up (unless JARVIS_POLICY_KEY is set) and hands it to the processes it starts through that variable
+# Run the learner with: python policy_server.py --checkpoint jarvis_rl_checkpoint
+# then start games with: JARVIS_POLICY_SERVER=127.0.0.1:47800 JARVIS_POLICY_KEY=<printed key> python rock_paper_game_rl.py
+
+ADDRESS_ENV = "JARVIS_POLICY_SERVER"  # host:port, or a Unix socket path
+AUTHKEY_ENV = "JARVIS_POLICY_KEY"
+DEFAULT_ADDRESS = "127.0.0.1:47800"
+SEND_EVERY = 1  # Rounds a client collects before sending them (raise it for bots playing flat out)
+SAVE_INTERVAL = 30.0  # Seconds between learner checkpoints
+HEADER_BYTES = 64  # Sequence number, padded to its own cache line
+
+logger = logging.getLogger("policy_server")
+_tracker_lock = threading.Lock()  # Held while attach_shared_memory() holds back tracker registrations
+
+
+def parse_address(address):
+    # "host:port" -> (host, port); anything else is a Unix socket path
+    host, _, port = address.rpartition(":")
+    return (host, int(port)) if host and port.isdigit() else address
+
+
+def _authkey(authkey):
+    # The shared key as bytes: `authkey` if given, else JARVIS_POLICY_KEY; there is no default key
+    key = authkey or os.environ.get(AUTHKEY_ENV)
+    if not key:
+        raise ValueError(f"No policy server key: set {AUTHKEY_ENV} to the key the server printed")
+    return key.encode() if isinstance(key, str) else key
+
+
+def attach_shared_memory(name):
+    # Map shared memory created by another process, without handing it to this process's resource tracker
+    # (the tracker unlinks what it holds when the process exits, but the creator owns this memory)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions always register attached memory; skip that registration rather than undo it afterwards,
+    # since a forked child shares its parent's tracker and unregistering would drop the creator's entry too
+    with _tracker_lock:
+        register = resource_tracker.register
+
+        def register_others(name, rtype):
+            if rtype != "shared_memory":
+                register(name, rtype)
+
+        resource_tracker.register = register_others
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def new_authkey():
+    # A random key for this server, also put in JARVIS_POLICY_KEY so child processes inherit it
+    key = secrets.token_bytes(32).hex()
+    os.environ[AUTHKEY_ENV] = key
+    return key
+
+
+class SharedQTable:
+    # A dense Q-table in shared memory: a sequence number followed by the float64 values
+    def __init__(self, memory, shape, owner):
+        self.memory = memory
+        self.shape = tuple(shape)
+        self.owner = owner  # Only the creating process unlinks the memory
+        self.sequence = np.ndarray((1,), dtype=np.int64, buffer=memory.buf)
+        self.values = np.ndarray(self.shape, dtype=np.float64, buffer=memory.buf, offset=HEADER_BYTES)
+
+    @classmethod
+    def create(cls, q_table):
+        # New shared table holding a copy of `q_table`
+        q_table = np.asarray(q_table, dtype=np.float64)
+        with _tracker_lock:  # Registered with the resource tracker, so it is unlinked even if this process dies
+            memory = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + q_table.nbytes)
+        table = cls(memory, q_table.shape, owner=True)
+        table.sequence[0] = 0
+        table.values[:] = q_table
+        return table
+
+    @classmethod
+    def attach(cls, name, shape):
+        # Map a table created by another process; the view is read-only on this side
+        table = cls(attach_shared_memory(name), shape, owner=False)
+        table.values.flags.writeable = False
+        return table
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def read_row(self, state):
+        # A consistent copy of one state's Q-values (a few bytes), retrying while the learner is writing
+        sequence = self.sequence
+        values = self.values
+        while True:
+            before = int(sequence[0])
+            if before & 1:
+                continue  # Write in progress
+            row = values[state].copy()
+            if int(sequence[0]) == before:
+                return row
+
+    def snapshot(self):
+        # A consistent copy of the whole table (e.g., for a checkpoint)
+        while True:
+            before = int(self.sequence[0])
+            if before & 1:
+                continue
+            copy = self.values.copy()
+            if int(self.sequence[0]) == before:
+                return copy
+
+    def begin_write(self):
+        self.sequence[0] += 1  # Odd: readers retry
+
+    def end_write(self):
+        self.sequence[0] += 1  # Even again: the table is consistent
+
+    def close(self):
+        del self.sequence, self.values  # Views must go before the mapping can close
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+class PolicyClient:
+    # A game process's connection to the policy server: the shared table plus a channel for its rounds
+    def __init__(self, address=None, authkey=None, send_every=SEND_EVERY):
+        address = parse_address(address or os.environ.get(ADDRESS_ENV) or DEFAULT_ADDRESS)
+        self.connection = Client(address, authkey=_authkey(authkey))
+        info = self.connection.recv()  # Handshake: where the table is and how it was trained
+        self.table = SharedQTable.attach(info["name"], info["shape"])
+        self.encoding = info["state_encoding"]
+        self.hyperparameters = info["hyperparameters"]
+        self.send_every = send_every
+        self.pending = []
+
+    def send(self, state, action, reward, next_state):
+        # Queue one transition for the learner
+        self.pending.append((state, action, reward, next_state))
+        if len(self.pending) >= self.send_every:
+            self.flush()
+
+    def send_batch(self, states, actions, rewards, next_states):
+        # Send whole arrays of transitions at once
+        self.flush()
+        self.connection.send((np.asarray(states, dtype=np.int64), np.asarray(actions, dtype=np.int64),
+                              np.asarray(rewards, dtype=np.float64), np.asarray(next_states, dtype=np.int64)))
+
+    def flush(self):
+        if self.pending:
+            states, actions, rewards, next_states = zip(*self.pending)
+            self.pending = []
+            self.send_batch(states, actions, rewards, next_states)
+
+    def close(self):
+        if not self.connection.closed:
+            self.flush()
+            self.connection.close()
+            self.table.close()
+
+
+def _receive(connection, authkey, handshake, updates):
+    # One thread per client: authenticate it, then forward its batches to the learner's queue until it
+    # disconnects; authentication runs here rather than in the accept loop, so a client that fails it or
+    # never answers only ends its own thread
+    try:
+        deliver_challenge(connection, authkey)
+        answer_challenge(connection, authkey)
+        connection.send(handshake)
+        while True:
+            updates.put(connection.recv())
+    except AuthenticationError as error:
+        logger.warning("Rejected a client: %s", error)
+    except (EOFError, OSError):
+        pass
+    finally:
+        connection.close()
+
+
+def _accept(listener, authkey, handshake, updates):
+    while True:
+        try:
+            connection = listener.accept()
+        except OSError:
+            return  # Listener closed
+        threading.Thread(target=_receive, args=(connection, authkey, handshake, updates), daemon=True).start()
+
+
+def serve(address=None, checkpoint_path=None, authkey=None, save_interval=SAVE_INTERVAL, ready=None):
+    # Run the learner until interrupted: share the RL agent's Q-table and apply the rounds clients send
+    # checkpoint_path: Start from this checkpoint if it exists, and save to it every save_interval seconds
+    # ready: Optional multiprocessing.Event set once clients can connect
+    # authkey: Key clients must prove they hold (default: JARVIS_POLICY_KEY)
+    import rock_paper_game_rl as game  # Imported here: the game imports this module for its clients
+    from rl_checkpoint import load_checkpoint, save_checkpoint
+    if checkpoint_path and os.path.exists(os.path.join(checkpoint_path, "meta.json")):
+        agent = load_checkpoint(checkpoint_path, game.RLAgent)
+    else:
+        agent = game.RLAgent(game.StateEncoder(game.STATE_OPPONENT_MOVES, game.STATE_OWN_MOVES, game.STATE_OUTCOMES,
+                                               game.GAME.num_moves))
+    if not isinstance(agent.q_table, np.ndarray):
+        raise TypeError("Only dense Q-tables can be shared; use a smaller state encoding")
+    table = SharedQTable.create(agent.q_table)
+    agent.q_table = table.values  # The learner updates the shared table in place
+    replay = game.ReplayBuffer(game.REPLAY_CAPACITY)
+    handshake = {"name": table.name, "shape": table.shape, "state_encoding": agent.encoder.config(),
+                 "hyperparameters": {name: getattr(agent, name) for name in ("learning_rate", "discount_factor", "epsilon")}}
+    updates = queue.Queue()
+    # No authkey here: each client is authenticated in its own thread (see _receive)
+    listener = Listener(parse_address(address or os.environ.get(ADDRESS_ENV) or DEFAULT_ADDRESS))
+    threading.Thread(target=_accept, args=(listener, _authkey(authkey), handshake, updates), daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))  # Clean up (unlink, save) on terminate()
+    if ready is not None:
+        ready.set()
+    dirty = False
+    last_save = time.monotonic()
+    try:
+        while True:
+            try:
+                batch = updates.get(timeout=0.5)
+            except queue.Empty:
+                batch = None
+            if batch is not None:
+                states, actions, rewards, next_states = batch
+                table.begin_write()
+                try:
+                    if len(states) == 1:  # A single round: exactly the in-process update
+                        agent.update_q_table(int(states[0]), int(actions[0]), float(rewards[0]), int(next_states[0]))
+                    else:
+                        agent.update_q_table_batch(states, actions, rewards, next_states)
+                    before = replay.total
+                    replay.add_batch(states, actions, rewards, next_states)
+                    if replay.total // game.REPLAY_EVERY > before // game.REPLAY_EVERY:
+                        agent.replay(replay, game.REPLAY_BATCH)  # The learner replays for everyone
+                finally:
+                    table.end_write()
+                dirty = True
+            if checkpoint_path and dirty and time.monotonic() - last_save >= save_interval:
+                save_checkpoint(agent, checkpoint_path, table.snapshot())
+                dirty = False
+                last_save = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        if checkpoint_path and dirty:
+            save_checkpoint(agent, checkpoint_path, table.snapshot())
+        agent.q_table = None
+        table.close()
+
+
+def start_server(address=None, checkpoint_path=None, authkey=None, save_interval=SAVE_INTERVAL):
+    # Run serve() in a child process; returns the Process once it accepts clients (stop it with terminate())
+    # Without an authkey or JARVIS_POLICY_KEY a random key is generated and exported to JARVIS_POLICY_KEY,
+    # so PolicyClients in this process and in the processes it starts afterwards can connect
+    import multiprocessing
+    authkey = authkey or os.environ.get(AUTHKEY_ENV) or new_authkey()
+    ready = multiprocessing.Event()
+    process = Process(target=serve, args=(address, checkpoint_path, authkey, save_interval, ready), daemon=True)
+    process.start()
+    while not ready.wait(0.1):
+        if not process.is_alive():
+            raise RuntimeError("Policy server failed to start")
+    return process
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Share one learning RL policy between game processes.")
+    parser.add_argument("--address", default=os.environ.get(ADDRESS_ENV, DEFAULT_ADDRESS),
+                        help="host:port or Unix socket path to listen on")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint to start from and save to (\"\" for neither; default: the game's, "
+                             "see rock_paper_game_rl.CHECKPOINT_PATH)")
+    parser.add_argument("--save-interval", type=float, default=SAVE_INTERVAL)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    print(f"Policy server listening on {args.address}")
+    if not os.environ.get(AUTHKEY_ENV):
+        print(f"Start games with {AUTHKEY_ENV}={new_authkey()}")
+    if args.checkpoint is None:
+        import rock_paper_game_rl as game  # JARVIS_RL_CHECKPOINT, or one checkpoint per JARVIS_GAME
+        args.checkpoint = game.CHECKPOINT_PATH
+    serve(args.address, args.checkpoint or None, save_interval=args.save_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import numpy as np
+
+import rng_service
+
+# Experience replay for JARVIS's Q-learning agents
+# ReplayBuffer keeps the last `capacity` (state, action, reward, next_state) transitions in preallocated
+# NumPy arrays; batch_q_update() applies a whole sampled batch to a Q-table with vectorized operations
+# instead of one scalar update (and several NumPy scalar indexing calls) per transition
+
+SAMPLING_STRATEGIES = ("uniform", "recent", "prioritized")
+PRIORITY_EPSILON = 1e-3  # Keeps transitions with zero TD error sampleable
+
+
+class ReplayBuffer:
+    # Fixed-capacity circular buffer of transitions; the oldest transition is overwritten when full
+    def __init__(self, capacity=10000, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.priorities = np.zeros(capacity, dtype=np.float64)  # Only used by "prioritized" sampling
+        self.max_priority = 1.0  # Given to new transitions, so each is replayed at least once early on
+        self.position = 0  # Where the next transition is written
+        self.size = 0
+        self.total = 0  # Transitions ever added, including overwritten ones
+        self.rng = rng_service.generator(seed)  # For sampling; spawned from the shared stream unless seeded
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state):
+        # Store one transition (e.g., one round of a live game)
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.priorities[i] = self.max_priority
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.total += 1
+
+    def add_batch(self, states, actions, rewards, next_states):
+        # Store a batch of transitions (e.g., one step of BatchRockPaperScissorsEnv) with array slicing
+        count = len(states)
+        self.total += count
+        if count > self.capacity:  # Only the newest `capacity` transitions would survive anyway
+            states, actions, rewards, next_states = (np.asarray(a)[-self.capacity:]
+                                                     for a in (states, actions, rewards, next_states))
+            count = self.capacity
+        index = (self.position + np.arange(count)) % self.capacity
+        self.states[index] = states
+        self.actions[index] = actions
+        self.rewards[index] = rewards
+        self.next_states[index] = next_states
+        self.priorities[index] = self.max_priority
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size, strategy="uniform"):
+        # Return the indices of `batch_size` stored transitions
+        # strategy: "uniform" (random, with replacement), "recent" (the newest batch_size transitions)
+        #           or "prioritized" (random, weighted by the last TD error of each transition)
+        if self.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        if strategy == "uniform":
+            return self.rng.integers(0, self.size, size=batch_size)
+        if strategy == "recent":
+            count = min(batch_size, self.size)
+            return (self.position - 1 - np.arange(count)) % self.capacity
+        if strategy == "prioritized":
+            weights = self.priorities[:self.size]
+            return self.rng.choice(self.size, size=batch_size, p=weights / weights.sum())
+        raise ValueError(f"Unknown sampling strategy: {strategy}")
+
+    def batch(self, index):
+        # The transitions at `index` as (states, actions, rewards, next_states) arrays
+        return self.states[index], self.actions[index], self.rewards[index], self.next_states[index]
+
+    def update_priorities(self, index, td_errors):
+        # Record how surprising each replayed transition was, for "prioritized" sampling
+        priorities = np.abs(td_errors) + PRIORITY_EPSILON
+        self.priorities[index] = priorities
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+
+def batch_q_update(q_table, states, actions, rewards, next_states, learning_rate, discount_factor):
+    # Apply a batch of Q-learning updates in place and return the TD error of each transition
+    # Every TD error is computed against the same Q-table snapshot (vectorized max over next states);
+    # transitions that hit the same (state, action) cell are averaged, then scatter-added in one step,
+    # so a batch of thousands moves each cell at most one learning-rate step
+    if not isinstance(q_table, np.ndarray):  # rl_state.SparseQTable
+        return q_table.batch_update(states, actions, rewards, next_states, learning_rate, discount_factor)
+    targets = rewards + discount_factor * q_table[next_states].max(axis=1)
+    td_errors = targets - q_table[states, actions]
+    cells = states * q_table.shape[1] + actions  # Flat index of each (state, action) pair
+    td_sums = np.bincount(cells, weights=td_errors, minlength=q_table.size)
+    counts = np.bincount(cells, minlength=q_table.size)
+    q_table += (learning_rate * td_sums / np.maximum(counts, 1)).reshape(q_table.shape)
+    return td_errors
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from rl_state import SparseQTable, StateEncoder
+
+# Versioned on-disk checkpoints for RLAgent
+# A checkpoint is a directory holding:
+#   meta.json   - format name, version, hyperparameters, state encoding and Q-table shape/dtype/storage
+#   q_table.npy - a dense Q-table as a plain .npy file, so it can be memory-mapped read-only
+#   q_states.npy, q_rows.npy - a sparse Q-table (see rl_state.SparseQTable): its stored states and their rows
+# Version 2 added sparse storage; version 1 checkpoints (always dense) still load
+
+CHECKPOINT_FORMAT = "jarvis-rl-checkpoint"
+CHECKPOINT_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+HYPERPARAMETERS = ("learning_rate", "discount_factor", "epsilon")  # RLAgent attributes saved with the table
+
+
+def _atomic_write(path, write):
+    # Write a file via a temporary file in the same directory, then rename it into place
+    # Readers therefore see either the old file or the new one, never a half-written file
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_checkpoint(agent, path, q_table=None):
+    # Save an agent's Q-table and hyperparameters to the checkpoint directory `path`
+    # q_table: Optional snapshot to save instead of agent.q_table (used by the autosaver)
+    q_table = agent.q_table if q_table is None else q_table
+    sparse = isinstance(q_table, SparseQTable)
+    if not sparse:
+        q_table = np.ascontiguousarray(q_table)
+    os.makedirs(path, exist_ok=True)
+    meta = {
+        "format": CHECKPOINT_FORMAT,
+        "version": CHECKPOINT_VERSION,
+        "hyperparameters": {name: getattr(agent, name) for name in HYPERPARAMETERS},
+        "state_encoding": agent.encoder.config() if hasattr(agent, "encoder") else None,
+        "shape": list(q_table.shape),
+        "dtype": q_table.values.dtype.str if sparse else q_table.dtype.str,
+        "storage": "sparse" if sparse else "dense",
+    }
+    if sparse:
+        states, rows = q_table.arrays()
+        _atomic_write(os.path.join(path, "q_states.npy"), lambda f: np.save(f, states))
+        _atomic_write(os.path.join(path, "q_rows.npy"), lambda f: np.save(f, rows))
+    else:
+        _atomic_write(os.path.join(path, "q_table.npy"), lambda f: np.save(f, q_table))
+    _atomic_write(os.path.join(path, "meta.json"), lambda f: f.write(json.dumps(meta, indent=2).encode()))
+
+
+def read_meta(path):
+    # Read and validate a checkpoint's metadata
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"{path} is not a JARVIS RL checkpoint")
+    if meta.get("version") not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported checkpoint version {meta.get('version')} (expected {CHECKPOINT_VERSION})")
+    return meta
+
+
+def load_checkpoint(path, agent_class, mmap=False):
+    # Create an agent of `agent_class` from a checkpoint
+    # mmap: Open the Q-table as a read-only memory-mapped array, so many processes share one copy
+    #       (such an agent can choose actions but update_q_table() will fail on it); ignored for sparse tables
+    meta = read_meta(path)
+    if meta.get("state_encoding"):
+        agent = agent_class(StateEncoder(**meta["state_encoding"]))  # The encoding the table was trained with
+    else:
+        agent = agent_class()
+    for name, value in meta["hyperparameters"].items():
+        setattr(agent, name, value)
+    if meta.get("storage") == "sparse":
+        agent.q_table = SparseQTable.from_arrays(meta["shape"][0], np.load(os.path.join(path, "q_states.npy")),
+                                                 np.load(os.path.join(path, "q_rows.npy")))
+        return agent
+    q_table = np.load(os.path.join(path, "q_table.npy"), mmap_mode="r" if mmap else None)
+    if list(q_table.shape) != meta["shape"]:
+        raise ValueError(f"Q-table shape {q_table.shape} does not match metadata {meta['shape']}")
+    agent.q_table = q_table
+    return agent
+
+
+class CheckpointAutosaver:
+    # Saves an agent in a background thread every `interval` seconds, but only when it has changed
+    # The game loop only calls mark_dirty(), so a round never waits on disk I/O
+    def __init__(self, agent, path, interval=30.0):
+        self.agent = agent
+        self.path = path
+        self.interval = interval
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rl-autosave", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def mark_dirty(self):
+        # Call after the Q-table changes
+        self._dirty.set()
+
+    def save_now(self):
+        # Save immediately if there are unsaved changes
+        if self._dirty.is_set():
+            self._dirty.clear()
+            snapshot = self.agent.q_table.copy()  # Consistent copy; the game may keep updating
+            save_checkpoint(self.agent, self.path, snapshot)
+
+    def stop(self):
+        # Stop the background thread and flush any unsaved changes
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.save_now()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.save_now()
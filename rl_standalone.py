@@ -1,68 +1,128 @@
-import random
+import argparse
+import multiprocessing as mp
+import rng_service  # Seeded, block-buffered randomness
 import numpy as np
-from gymnasium.spaces import Discrete
 import colorama  # Import colorama for colored terminal output
 from colorama import Fore, Style  # Import Fore for colors, Style for reset
+from outcome_engine import GAMES, RPS, get_game  # Table-driven round scoring, for any game in GAMES
+from replay_buffer import ReplayBuffer, SAMPLING_STRATEGIES, batch_q_update  # Experience replay
+from rl_state import StateEncoder, make_q_table, memory_report  # State encodings and Q-table storage
+from opponents import OPPONENTS, RandomOpponent, make_opponent  # Scripted stand-ins for you
+import metrics  # Optional latency timers and counters (off unless enabled)
 
 
-# Initialize colorama for cross-platform support
-colorama.init()
-
 # Define the Rock, Paper, Scissors environment (simplified, no Gymnasium dependency needed for now)
+# Every environment and agent here takes a `game` from outcome_engine.GAMES (default: rock, paper, scissors),
+# so the same code trains JARVIS on Rock-Paper-Scissors-Spock-Lizard or the 7- and 15-move variants
 
 class RockPaperScissorsEnv:
-  def __init__(self):
-    # Define action space: 0=rock, 1=paper, 2=scissors
-    self.action_space = Discrete(3) # JARVIS’s possible moves
-    self.observation_space = Discrete(3) # Your possible moves (states)
-    self.player_move = None # Store your move (random for now)
+  def __init__(self, opponent=None, game=None):
+    # opponent: Scripted player from opponents.py simulating you (default: uniformly random moves)
+    # game: GameDefinition with the moves and payoff matrix (default: rock, paper, scissors)
+    from gymnasium.spaces import Discrete  # Imported lazily: Gymnasium is slow to load
+    self.game = game or RPS
+    self.outcome = self.game.outcome  # Payoff table lookup for one round
+    # Define action space: 0=rock, 1=paper, 2=scissors (one action per move of the game)
+    self.action_space = Discrete(self.game.num_moves) # JARVIS’s possible moves
+    self.observation_space = Discrete(self.game.num_moves) # Your possible moves (states)
+    self.opponent = opponent or RandomOpponent(num_moves=self.game.num_moves)
+    self.opponent.reset(1)
+    self.player_move = None # Store your move (played by the opponent)
     self.jarvis_move = None # Store JARVIS’s move
+    self.last_jarvis_move = None # JARVIS’s move in the previous game, for opponents that react to it
     
   def reset(self):
     # Reset the environment for a new game
     self.player_move = None
     self.jarvis_move = None 
-    return random.choice([0,1,2]) # Return a random initial state (your move)
+    return int(self.opponent.rng.integers(0, self.game.num_moves)) # Return a random initial state (your move)
   
   def step(self, action):
     # Action is JARVIS’s move (0=rock, 1=paper, 2=scissors)
-    # Simulate your move (random, as you’ll play randomly)
-    self.player_move = random.choice([0,1,2])# Your random move
+    # Simulate your move with the scripted opponent (pre-generated in blocks, so this is a list lookup)
+    self.player_move = self.opponent.move(self.last_jarvis_move)
     self.jarvis_move = action # JARVIS’s move
+    self.last_jarvis_move = int(action)
     # Calculate reward based on Rock, Paper, Scissors rules
     # +1 for JARVIS win, 0 for tie, -1 for JARVIS loss
-    if self.player_move == self.jarvis_move:
-      reward = 0 #tie
-    elif (self.player_move == 0 and self.jarvis_move == 2) or\
-         (self.player_move == 1 and self.jarvis_move == 0) or\
-         (self.player_move == 2 and self.jarvis_move == 1):
-      reward = -1 # You win, JARVIS loses
-    else:
-      reward = 1 # JARVIS wins
+    reward = self.outcome(self.jarvis_move, self.player_move)
       
     # Next state is your current move (for simplicity, we use your move as the state)
     next_state = self.player_move 
     done = True # Each game is one round (simplified for now)
     info = {"player_move": self.player_move, "jarvis_move": self.jarvis_move}
     return next_state, reward, done, info
-      
+
+
+# Batched Rock, Paper, Scissors environment: N independent games held in NumPy arrays
+class BatchRockPaperScissorsEnv:
+  def __init__(self, num_envs, seed=None, opponent=None, game=None):
+    # num_envs: How many independent games to play per step() call
+    # seed: Optional seed so batched runs can be reproduced
+    # opponent: Scripted player from opponents.py, playing all num_envs games (default: random moves)
+    # game: GameDefinition with the moves and payoff matrix (default: rock, paper, scissors)
+    from gymnasium.spaces import Discrete  # Imported lazily: Gymnasium is slow to load
+    self.num_envs = num_envs
+    self.game = game or RPS
+    self.action_space = Discrete(self.game.num_moves) # JARVIS’s possible moves (per environment)
+    self.observation_space = Discrete(self.game.num_moves) # Your possible moves (per environment)
+    self.rng = rng_service.generator(seed)  # Spawned from the shared stream unless a seed is given
+    self.opponent = opponent or RandomOpponent(self.rng, num_moves=self.game.num_moves)
+    self.opponent.reset(num_envs)
+    self.last_jarvis_moves = None # JARVIS’s previous moves, for opponents that react to them
+    self.player_moves = np.zeros(num_envs, dtype=np.int64) # Your moves, one per environment
+    self.jarvis_moves = np.zeros(num_envs, dtype=np.int64) # JARVIS’s moves, one per environment
+
+  def reset(self):
+    # Reset all environments and return an array of random initial states with shape (N,)
+    self.player_moves[:] = 0
+    self.jarvis_moves[:] = 0
+    return self.rng.integers(0, self.game.num_moves, size=self.num_envs)
+
+  def step(self, actions):
+    # actions: Array of JARVIS’s moves with shape (N,)
+    # Returns next_states, rewards, dones and info, each holding one entry per environment
+    actions = np.asarray(actions)
+    if actions.shape != (self.num_envs,):
+      raise ValueError(f"Expected actions with shape ({self.num_envs},), got {actions.shape}")
+    self.player_moves = self.opponent.moves(self.last_jarvis_moves) # Your moves, one block row per step
+    self.jarvis_moves = actions
+    self.last_jarvis_moves = actions
+    # Same reward convention as RockPaperScissorsEnv: +1 JARVIS win, 0 tie, -1 JARVIS loss
+    rewards = self.game.outcomes(self.jarvis_moves, self.player_moves)
+    next_states = self.player_moves # Your current moves become the next states
+    dones = np.ones(self.num_envs, dtype=bool) # Each game is still one round
+    info = {"player_moves": self.player_moves, "jarvis_moves": self.jarvis_moves}
+    return next_states, rewards, dones, info
+
 # Q-learning Agent for JARVIS
 class RLAgent:
-  def __init__(self):
-      # Initialize Q-table for Q-learning (3 states: your moves, 3 actions: JARVIS’s moves)
-      # 3x3 table (0=rock, 1=paper, 2=scissors for states and actions), starting with zeros
-      self.q_table = np.zeros((3, 3))
+  def __init__(self, encoder=None, rng=None, game=None):
+      # encoder: StateEncoder deciding what a state remembers; the default is your last move only
+      # rng: RandomStream for exploration (default: the shared rng_service.stream)
+      # game: GameDefinition being played (default: rock, paper, scissors); sets the number of actions
+      # Initialize Q-table for Q-learning (one row per state, one action per move: JARVIS’s moves)
+      # With the default encoder this is the 3x3 table (0=rock, 1=paper, 2=scissors), starting with zeros
+      # Large state spaces get a sparse table that only stores states actually seen (see rl_state.py)
+      self.game = game or RPS
+      self.num_actions = self.game.num_moves
+      self.encoder = encoder or StateEncoder(num_moves=self.num_actions)
+      if self.encoder.num_moves != self.num_actions:
+          raise ValueError(f"The state encoder is for {self.encoder.num_moves} moves, {self.game.name} has {self.num_actions}")
+      self.q_table = make_q_table(self.encoder.num_states, self.num_actions)
       self.learning_rate = 0.1  # How much new info affects Q-values (low for gradual learning)
       self.discount_factor = 0.9  # How much future rewards matter (high for long-term focus)
       self.epsilon = 0.1  # Chance of exploring (random move) vs. exploiting (best move)
+      self.rng = rng or rng_service.stream
 
 
   def choose_action(self, state):
     # Choose an action using epsilon-greedy policy
     # state: Your last move (0=rock, 1=paper, 2=scissors)
-    # random.uniform(0, 1) generate a random float between 0 and 1 and if it is less than epsilon(0.1), then it will explore (10% chance to be true)
-    if random.uniform(0, 1) < self.epsilon:
-        return random.choice([0, 1, 2])  # Explore: pick a random move (10% chance)
+    # rng.uniform() is a pre-generated random float between 0 and 1; if it is less than epsilon(0.1), then it will explore (10% chance to be true)
+    if self.rng.uniform() < self.epsilon:
+        metrics.count("exploration_moves")
+        return self.rng.action(self.num_actions)  # Explore: pick a random move (10% chance)
     # We first get the state row from the Q-table and then we get the index of the maximum value in that row  
     return np.argmax(self.q_table[state])  # Exploit: pick the move with highest Q-value (90% chance)
   
@@ -77,6 +137,30 @@ class RLAgent:
     new_q = current_q + self.learning_rate * (reward + self.discount_factor * next_max_q - current_q)
     # Update Q-table: Add learning_rate times the difference between current Q and new expected value
     self.q_table[state, action] = new_q
+
+  def update_q_table_batch(self, states, actions, rewards, next_states):
+    # Same Q-learning formula as update_q_table, applied to whole arrays of transitions at once
+    # Returns the TD error of each transition (used for prioritized replay)
+    return batch_q_update(self.q_table, states, actions, rewards, next_states,
+                          self.learning_rate, self.discount_factor)
+
+  def replay(self, buffer, batch_size=256, strategy="uniform"):
+    # Learn again from past transitions: sample a batch from a ReplayBuffer and apply it in one update
+    index = buffer.sample(batch_size, strategy)
+    if len(index):
+        buffer.update_priorities(index, self.update_q_table_batch(*buffer.batch(index)))
+
+  def choose_actions(self, states, rng):
+    # Vectorized epsilon-greedy choose_action for a batch of states (one per environment)
+    # rng: NumPy Generator used for the exploration coins and random moves
+    actions = self.q_table[states].argmax(axis=1)
+    explore = rng.random(len(states)) < self.epsilon
+    actions[explore] = rng.integers(0, self.num_actions, size=int(explore.sum()))
+    return actions
+
+  def memory_report(self):
+    # How the Q-table is stored (dense or sparse) and how many bytes it uses
+    return memory_report(self.q_table)
     
 
 
@@ -84,45 +168,199 @@ class RLAgent:
   #what is np.argmax()?, What is the np.max()?
   
   
-  # Train and test the RL agent
-def train_and_test_rl():
-    # Create environment and agent
-    env = RockPaperScissorsEnv()
-    agent = RLAgent()
-    
-    # Train for 100 episodes (automated, not manual play)
-    episodes = 100
+def run_episodes(env, agent, episodes, visits=None):
+    # Train `agent` on `env` for a number of episodes (automated, not manual play)
+    # visits: Optional array shaped like the Q-table counting how often each (state, action) pair was updated
+    # The state carries over between one-round episodes, so encodings that remember several rounds still work
+    encoder = agent.encoder
+    state = 0
     for episode in range(episodes):
-        state = env.reset()  # Start a new game with a random state (your move)
+        env.reset()  # Start a new game
         done = False
         while not done:
             # JARVIS assume your move first base on that he chooses his move
             action = agent.choose_action(state)  # JARVIS chooses a move (explore/exploit)
-            next_state, reward, done, info = env.step(action)  # Play the game, get reward
+            player_move, reward, done, info = env.step(action)  # Play the game, get reward
+            next_state = encoder.next_state(state, player_move, action, reward)
             agent.update_q_table(state, action, reward, next_state)  # Learn from the outcome
+            if visits is not None:
+                visits[state, action] += 1
             state = next_state  # Update state for the next move
+
+
+def run_batched_episodes(env, agent, episodes, replay=None, replay_batch=256, strategy="uniform"):
+    # Train `agent` on a BatchRockPaperScissorsEnv: each step plays env.num_envs one-round episodes at once
+    # and applies all their transitions with one vectorized update instead of one scalar update each
+    # replay: Optional ReplayBuffer; after every step a batch of past transitions is replayed as well
+    env.reset()
+    states = np.zeros(env.num_envs, dtype=np.int64)  # Encoded state of each environment
+    remaining = episodes
+    while remaining > 0:
+        actions = agent.choose_actions(states, env.rng)
+        player_moves, rewards, dones, info = env.step(actions)
+        next_states = agent.encoder.next_state(states, player_moves, actions, rewards)
+        count = min(remaining, env.num_envs)  # The last step may only need some of the environments
+        agent.update_q_table_batch(states[:count], actions[:count], rewards[:count], next_states[:count])
+        if replay is not None:
+            replay.add_batch(states[:count], actions[:count], rewards[:count], next_states[:count])
+            agent.replay(replay, replay_batch, strategy)
+        states = next_states
+        remaining -= count
+
+
+def merge_q_tables(q_tables, visits, previous, method="average"):
+    # Combine the workers' Q-tables into one table
+    # q_tables, visits: Arrays of shape (workers, states, actions); previous: The last merged table
+    # method: "average" for a plain mean, "visits" to weight each cell by how often each worker updated it
+    if method == "average":
+        return q_tables.mean(axis=0)
+    if method == "visits":
+        total = visits.sum(axis=0)
+        weighted = (q_tables * visits).sum(axis=0)
+        # Cells no worker touched this round keep their previous value
+        return np.where(total > 0, weighted / np.maximum(total, 1), previous)
+    raise ValueError(f"Unknown merge method: {method}")
+
+
+def _parallel_worker(conn, seed, encoder_config, opponent, opponent_log, game_name="rps"):
+    # Worker process: owns its environment, RLAgent and random seed for the whole run
+    # Receives (q_table, episodes) from the parent, trains, and sends back (q_table, visits)
+    # seed: This worker's SeedSequence; the agent and the opponent each get an independent child stream
+    agent_seed, opponent_seed = seed.spawn(2)
+    game = get_game(game_name)
+    env = RockPaperScissorsEnv(make_opponent(opponent, opponent_seed, opponent_log, game), game)
+    agent = RLAgent(StateEncoder(**encoder_config), rng_service.RandomStream(agent_seed), game)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break  # Parent is done with us
+        q_table, episodes = message
+        agent.q_table[:] = q_table  # Start from the merged table broadcast by the parent
+        visits = np.zeros_like(agent.q_table, dtype=np.int64)
+        run_episodes(env, agent, episodes, visits)
+        conn.send((agent.q_table, visits))
+    conn.close()
+
+
+def train_rl_parallel(total_episodes, workers, sync_every=1000, merge="average", seed=None, encoder=None,
+                      opponent="random", opponent_log=None, game=None):
+    # Train one RLAgent with several worker processes and return it
+    # Each worker runs sync_every episodes, then the parent merges all Q-tables and broadcasts the result
+    # total_episodes: Episodes across all workers; workers: Number of processes
+    # opponent, opponent_log: Name of the scripted opponent each worker trains against (see opponents.py)
+    # game: GameDefinition to train on (default: rock, paper, scissors)
+    agent = RLAgent(encoder, game=game)
+    if not isinstance(agent.q_table, np.ndarray):
+        raise ValueError("Parallel training merges dense Q-tables; use a smaller state encoding")
+    # Distinct, reproducible seed per worker, spawned from `seed` (or from the shared stream’s seed)
+    root = np.random.SeedSequence(seed) if seed is not None else rng_service.stream.seed_sequence
+    seeds = root.spawn(workers)
+    pipes = []
+    processes = []
+    for worker_seed in seeds:
+        parent_conn, child_conn = mp.Pipe()
+        process = mp.Process(target=_parallel_worker, args=(child_conn, worker_seed, agent.encoder.config(),
+                                                                        opponent, opponent_log, agent.game.name), daemon=True)
+        process.start()
+        child_conn.close()
+        pipes.append(parent_conn)
+        processes.append(process)
+    try:
+        remaining = total_episodes
+        while remaining > 0:
+            # Split this sync round's episodes across workers as evenly as possible
+            batch = min(remaining, sync_every * workers)
+            shares = [batch // workers + (1 if i < batch % workers else 0) for i in range(workers)]
+            for conn, share in zip(pipes, shares):
+                conn.send((agent.q_table, share))
+            results = [conn.recv() for conn in pipes]
+            q_tables = np.stack([q for q, _ in results])
+            visits = np.stack([v for _, v in results])
+            agent.q_table = merge_q_tables(q_tables, visits, agent.q_table, merge)
+            remaining -= batch
+    finally:
+        for conn in pipes:
+            conn.send(None)
+            conn.close()
+        for process in processes:
+            process.join()
+    return agent
+
+
+  # Train and test the RL agent
+def train_and_test_rl(episodes=100, workers=1, sync_every=1000, merge="average",
+                      num_envs=1, replay_capacity=0, replay_batch=256, replay_strategy="uniform", encoder=None,
+                      opponent="random", opponent_log=None, game=None):
+    # episodes: Total training episodes; workers > 1 trains in parallel processes (see train_rl_parallel)
+    # num_envs > 1 trains on a BatchRockPaperScissorsEnv with batched Q-updates (see run_batched_episodes)
+    # replay_capacity > 0 adds an experience replay buffer of that size to batched training
+    # encoder: StateEncoder for the agent's state (default: your last move)
+    # opponent: Which scripted opponent simulates you (see opponents.OPPONENTS); opponent_log for "replay"
+    # game: GameDefinition to train and test on (default: rock, paper, scissors)
+    # Create environment and agent
+    game = game or RPS
+    env = RockPaperScissorsEnv(make_opponent(opponent, log_path=opponent_log, game=game), game)
+    if workers > 1:
+        agent = train_rl_parallel(episodes, workers, sync_every, merge, encoder=encoder,
+                                  opponent=opponent, opponent_log=opponent_log, game=game)
+    elif num_envs > 1:
+        agent = RLAgent(encoder, game=game)
+        replay = ReplayBuffer(replay_capacity) if replay_capacity > 0 else None
+        batch_env = BatchRockPaperScissorsEnv(num_envs, opponent=make_opponent(opponent, log_path=opponent_log, game=game),
+                                              game=game)
+        run_batched_episodes(batch_env, agent, episodes, replay, replay_batch, replay_strategy)
+    else:
+        agent = RLAgent(encoder, game=game)
+        run_episodes(env, agent, episodes)
+    report = agent.memory_report()
+    print(f"Q-table: {report['storage']}, {report['stored_states']} of {report['states']} states stored, "
+          f"{report['bytes'] / 1024:.1f} KiB")
     
     # Test against one random move from you
     print("\nTraining complete! Testing JARVIS against one random move...")
     state = env.reset()  # Reset for test
-    your_move = random.choice([0, 1, 2])  # Your random move (simulating your play)
-    jarvis_move = agent.choose_action(your_move)  # JARVIS’s learned move (no updates during test)
-    move_map = {0: "rock", 1: "paper", 2: "scissors"}
+    your_move = rng_service.stream.action(game.num_moves)  # Your random move (simulating your play)
+    jarvis_move = agent.choose_action(agent.encoder.next_state(0, your_move, 0, 0))  # JARVIS’s learned move (no updates during test)
+    move_map = dict(enumerate(game.moves))  # {0: "rock", 1: "paper", 2: "scissors"} for the default game
     print(f"You (randomly) picked: {move_map[your_move]}")
     print(f"JARVIS (RL) picked: {move_map[jarvis_move]}")
 
     # Calculate and print the outcome
-    if your_move == jarvis_move:
+    result = game.outcome(jarvis_move, your_move)
+    if result == 0:
         print(f"{Fore.BLUE}It’s a tie! We’re evenly matched, sir!{Style.RESET_ALL}")
-    elif (your_move == 0 and jarvis_move == 2) or \
-         (your_move == 1 and jarvis_move == 0) or \
-         (your_move == 2 and jarvis_move == 1):
+    elif result == -1:
         print(f"{Fore.BLUE}You’ve outsmarted me, sir—well done!{Style.RESET_ALL}")
     else:
         print(f"{Fore.BLUE}I claim this victory, sir!{Style.RESET_ALL}")
 
 
 if __name__ == "__main__":
-    train_and_test_rl()
+    parser = argparse.ArgumentParser(description="Train JARVIS with Q-learning and test it against one random move.")
+    parser.add_argument("--episodes", type=int, default=100, help="Total training episodes")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for parallel training")
+    parser.add_argument("--sync-every", type=int, default=1000, help="Episodes per worker between Q-table merges")
+    parser.add_argument("--merge", choices=["average", "visits"], default="average", help="How worker Q-tables are merged")
+    parser.add_argument("--num-envs", type=int, default=1, help="Games per batched step (> 1 uses batched Q-updates)")
+    parser.add_argument("--replay-capacity", type=int, default=0, help="Experience replay buffer size (0 = no replay)")
+    parser.add_argument("--replay-batch", type=int, default=256, help="Transitions replayed after each batched step")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible run (default: JARVIS_SEED or random)")
+    parser.add_argument("--opponent", choices=sorted(OPPONENTS), default="random", help="Scripted opponent to train against")
+    parser.add_argument("--opponent-log", default=None, help="Game log replayed by --opponent replay")
+    parser.add_argument("--opponent-moves", type=int, default=1, help="Your last moves in JARVIS’s state")
+    parser.add_argument("--own-moves", type=int, default=0, help="JARVIS’s own last moves in the state")
+    parser.add_argument("--outcomes", type=int, default=0, help="Last round outcomes in the state")
+    parser.add_argument("--replay-strategy", choices=SAMPLING_STRATEGIES, default="uniform", help="How replayed transitions are sampled")
+    parser.add_argument("--game", choices=sorted(GAMES), default="rps", help="Game to play (rps, rpsls, rps7, rps15)")
+    args = parser.parse_args()
+    game = get_game(args.game)
+    colorama.init()  # Initialize colorama for cross-platform support
+    if args.seed is not None:
+        rng_service.seed(args.seed)
+    with metrics.session_from_env():  # JARVIS_METRICS=1 / JARVIS_PROFILE=<prefix>
+        train_and_test_rl(args.episodes, args.workers, args.sync_every, args.merge,
+                          args.num_envs, args.replay_capacity, args.replay_batch, args.replay_strategy,
+                          StateEncoder(args.opponent_moves, args.own_moves, args.outcomes, game.num_moves),
+                          args.opponent, args.opponent_log, game)
         
         
\ No newline at end of file
@@ -0,0 +1,142 @@
+import sys
+
+import numpy as np
+
+# State encodings and Q-table storage for JARVIS's Q-learning agents
+# A state is built from the last few moves of the opponent, JARVIS's own last moves and the last outcomes,
+# all mixed-radix encoded into one integer: [opponent moves | own moves | outcomes]; moves are base num_moves
+# (3 for rock, paper, scissors, more for the larger games in outcome_engine.GAMES) and outcomes base 3
+# StateEncoder() with the defaults is the original state (the opponent's last move, 3 states)
+# make_q_table() returns a dense NumPy array for small state spaces and a SparseQTable above DENSE_STATE_LIMIT
+
+NUM_ACTIONS = 3  # Moves of rock, paper, scissors: the default only; agents pass their game's num_moves
+DENSE_STATE_LIMIT = 3 ** 10  # Largest state space stored as a dense array (59049 states, ~1.4 MB)
+
+
+class StateEncoder:
+    # opponent_moves, own_moves, outcomes: How many of the most recent of each the state remembers
+    # num_moves: Size of the game's move set
+    def __init__(self, opponent_moves=1, own_moves=0, outcomes=0, num_moves=NUM_ACTIONS):
+        self.opponent_moves = opponent_moves
+        self.own_moves = own_moves
+        self.outcomes = outcomes
+        self.num_moves = num_moves
+        self.opponent_radix = num_moves ** opponent_moves  # Distinct values of each part of the state
+        self.own_radix = num_moves ** own_moves
+        self.outcome_radix = 3 ** outcomes
+        self.num_states = self.opponent_radix * self.own_radix * self.outcome_radix
+
+    def config(self):
+        # Keyword arguments that recreate this encoder (stored in checkpoints)
+        return {"opponent_moves": self.opponent_moves, "own_moves": self.own_moves, "outcomes": self.outcomes,
+                "num_moves": self.num_moves}
+
+    def next_state(self, state, opponent_move, own_move, outcome):
+        # The state after one more round, from the previous state alone (O(1), no history needed)
+        # outcome is from the agent's side (+1 win, 0 tie, -1 loss); works on ints or NumPy arrays of states
+        rest = self.own_radix * self.outcome_radix
+        opponent, rest_code = state // rest, state % rest
+        own, result = rest_code // self.outcome_radix, rest_code % self.outcome_radix
+        # Shift each part left by one digit, drop the oldest digit and append the newest
+        opponent = (opponent * self.num_moves + opponent_move) % self.opponent_radix
+        own = (own * self.num_moves + own_move) % self.own_radix
+        result = (result * 3 + outcome + 1) % self.outcome_radix
+        return (opponent * self.own_radix + own) * self.outcome_radix + result
+
+
+class SparseQTable:
+    # Hash-backed Q-table: only states that have been updated take memory; unseen states read as zeros
+    # Stored rows live in one growable 2-D array; a dict maps each state to its row (row 0 stays all zeros)
+    # Supports the same indexing the agents use on a dense table: q[state], q[state, action], q[states]
+    def __init__(self, num_states, num_actions=NUM_ACTIONS, capacity=1024):
+        self.shape = (num_states, num_actions)
+        self.size = num_states * num_actions
+        self.index = {}  # state -> row in self.values
+        self.values = np.zeros((capacity, num_actions))
+
+    def _row_index(self, state):
+        # Row of `state`, adding a zero row the first time the state is written
+        row = self.index.get(state)
+        if row is None:
+            row = len(self.index) + 1
+            if row == len(self.values):  # Full: double the storage (amortized O(1) per new state)
+                self.values = np.concatenate((self.values, np.zeros_like(self.values)))
+            self.index[state] = row
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            state, action = key
+            return self.values[self.index.get(int(state), 0), action]
+        if isinstance(key, np.ndarray):
+            return self.gather(key)
+        return self.values[self.index.get(int(key), 0)]
+
+    def __setitem__(self, key, value):
+        state, action = key
+        row = self._row_index(int(state))  # May grow (replace) self.values, so look it up first
+        self.values[row, action] = value
+
+    def gather(self, states):
+        # Rows for an array of states, as a (len(states), num_actions) array
+        index = self.index
+        return self.values[[index.get(state, 0) for state in states.tolist()]]
+
+    def batch_update(self, states, actions, rewards, next_states, learning_rate, discount_factor):
+        # Sparse counterpart of replay_buffer.batch_q_update: same snapshot TD errors, averaged per cell
+        targets = rewards + discount_factor * self.gather(next_states).max(axis=1)
+        td_errors = targets - self.gather(states)[np.arange(len(states)), actions]
+        cells, inverse, counts = np.unique(states * self.shape[1] + actions, return_inverse=True, return_counts=True)
+        steps = learning_rate * np.bincount(inverse, weights=td_errors) / counts
+        cell_states, cell_actions = np.divmod(cells, self.shape[1])
+        rows = [self._row_index(state) for state in cell_states.tolist()]
+        self.values[rows, cell_actions] += steps  # Cells are unique, so a plain fancy-index add is safe
+        return td_errors
+
+    def copy(self):
+        # An independent copy (e.g., a snapshot for a checkpoint); the index is copied before the rows, so
+        # every row it refers to exists even if another thread adds states in between
+        table = SparseQTable.__new__(SparseQTable)
+        table.shape = self.shape
+        table.size = self.size
+        table.index = dict(self.index)
+        table.values = self.values.copy()
+        return table
+
+    def arrays(self):
+        # The stored states and their Q-value rows, as (states, rows) arrays
+        states = np.fromiter(self.index.keys(), dtype=np.int64, count=len(self.index))
+        rows = np.fromiter(self.index.values(), dtype=np.int64, count=len(self.index))
+        return states, self.values[rows]
+
+    @classmethod
+    def from_arrays(cls, num_states, states, rows):
+        # Inverse of arrays(): a table holding `rows` for `states`
+        table = cls(num_states, rows.shape[1], capacity=len(states) + 1)
+        table.values[1:len(states) + 1] = rows
+        table.index = dict(zip(states.tolist(), range(1, len(states) + 1)))
+        return table
+
+    @property
+    def nbytes(self):
+        # Approximate memory held by the row storage, the dict and its integer keys
+        return self.values.nbytes + sys.getsizeof(self.index) + 32 * len(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+
+def make_q_table(num_states, num_actions=NUM_ACTIONS, dense_limit=DENSE_STATE_LIMIT):
+    # A zero-filled Q-table: a dense array for up to dense_limit states, a SparseQTable above that
+    if num_states <= dense_limit:
+        return np.zeros((num_states, num_actions))
+    return SparseQTable(num_states, num_actions)
+
+
+def memory_report(q_table):
+    # How a Q-table is stored and how much memory it uses
+    if isinstance(q_table, SparseQTable):
+        return {"storage": "sparse", "states": q_table.shape[0], "stored_states": len(q_table),
+                "bytes": q_table.nbytes}
+    return {"storage": "dense", "states": q_table.shape[0], "stored_states": q_table.shape[0],
+            "bytes": q_table.nbytes}
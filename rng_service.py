@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+# One seeded source of randomness for every move JARVIS (or a simulated player) picks at random
+# RandomStream pre-generates blocks of moves and uniform numbers from a NumPy Generator, so each draw
+# is a list index instead of a random-module call. Streams for sessions, workers and opponents are
+# spawned from one SeedSequence, so a whole run, parallel or not, is reproducible from a single seed
+# Set JARVIS_SEED to make the games reproducible; without it the seed comes from OS entropy
+
+SEED_ENV = "JARVIS_SEED"
+
+
+class RandomStream:
+    def __init__(self, seed=None, block_size=4096):
+        # seed: int, SeedSequence or None (fresh entropy); block_size: Draws generated per refill
+        self.block_size = block_size
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        # Start over from `seed`, in place (objects holding this stream see the new sequence)
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.generator = np.random.default_rng(self.seed_sequence)
+        self._moves = []
+        self._move_position = 0
+        self._uniforms = []
+        self._uniform_position = 0
+
+    def move(self):
+        # A uniformly random move: 0=rock, 1=paper, 2=scissors
+        if self._move_position == len(self._moves):
+            self._moves = self.generator.integers(0, 3, size=self.block_size).tolist()
+            self._move_position = 0
+        value = self._moves[self._move_position]
+        self._move_position += 1
+        return value
+
+    def uniform(self):
+        # A uniformly random float in [0, 1), e.g., for an exploration coin: uniform() < epsilon
+        if self._uniform_position == len(self._uniforms):
+            self._uniforms = self.generator.random(self.block_size).tolist()
+            self._uniform_position = 0
+        value = self._uniforms[self._uniform_position]
+        self._uniform_position += 1
+        return value
+
+    def action(self, num_moves):
+        # A uniformly random move of a game with `num_moves` moves (the pre-generated block for 3)
+        return self.move() if num_moves == 3 else self.index(num_moves)
+
+    def index(self, n):
+        # A uniformly random index in range(n)
+        return int(self.uniform() * n)
+
+    def choice(self, options):
+        # A uniformly random element of a sequence
+        return options[self.index(len(options))]
+
+    def spawn(self, n):
+        # n independent child streams (e.g., one per session or worker process)
+        return [RandomStream(child, self.block_size) for child in self.seed_sequence.spawn(n)]
+
+    def spawn_generator(self):
+        # An independent NumPy Generator for code that draws its own vectorized blocks
+        return np.random.default_rng(self.seed_sequence.spawn(1)[0])
+
+
+def _seed_from_env():
+    value = os.environ.get(SEED_ENV, "")
+    return int(value) if value else None
+
+
+stream = RandomStream(_seed_from_env())  # Shared stream for the game scripts
+
+
+def seed(value):
+    # Reseed the shared stream (and so everything spawned from it afterwards)
+    stream.reseed(value)
+
+
+def session_stream():
+    # A new independent stream for one session or worker, derived from the shared seed
+    return stream.spawn(1)[0]
+
+
+def generator(seed=None):
+    # A NumPy Generator from `seed` if given, else spawned from the shared stream
+    return np.random.default_rng(seed) if seed is not None else stream.spawn_generator()
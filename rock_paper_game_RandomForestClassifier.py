@@ -1,21 +1,75 @@
-import random  # Import random module for JARVIS's random move selection
-from sklearn.ensemble import RandomForestClassifier  # Import RandomForestClassifier for more complex ML models
-import colorama  # Import colorama for colored terminal output
-from colorama import Fore, Style  # Import Fore for colors, Style for reset
-import matplotlib.pyplot as plt  # Import matplotlib for visualization
+import os
+import sys
+import rng_service  # Seeded, block-buffered randomness for JARVIS's random moves
+import numpy as np
+import game_output  # Interactive, quiet or JSON-lines output for JARVIS’s chatter
+import metrics  # Optional latency timers and counters (off unless enabled)
+from outcome_engine import get_game  # Table-driven round scoring
+from online_predictor import TransitionPredictor  # O(1) online move predictor
+from ensemble_predictor import EnsemblePredictor  # Iocaine-style meta-strategy over many predictors
+from move_history import MoveHistory  # Ring buffer of recent moves
+from move_sources import TerminalSource  # Where the player's moves come from
+import game_session  # The session loop and command line shared by the game scripts
+from move_report import render_in_background  # Off-screen end-of-game report
+from policy_compiler import HistoryPolicy, compile_classifier, encode_window, sklearn_key  # Lookup-table inference
 
-# Initialize colorama for cross-platform support
-colorama.init()
+# Which game is played: "rps" (Rock, Paper, Scissors) or a larger one from outcome_engine.GAMES ("rpsls",
+# "rps7", "rps15"); moves, scoring, counter moves and every predictor are generated from its payoff matrix
+GAME = get_game(os.environ.get("JARVIS_GAME", "rps"))
+MOVE_NAMES = GAME.moves  # Move names by number (0=rock, 1=paper, 2=scissors)
+COUNTER_MOVES = GAME.counter_moves.tolist()  # COUNTER_MOVES[m]: the move that beats move m
+# Which predictor JARVIS uses: "online" (transition counts, O(1) per move), "forest" (Scikit-learn model)
+# or "compiled" (the per-round forest retraining, precompiled into a lookup table over history windows)
+# or "pretrained" (a forest trained offline on logged games by train_forest.py)
+# or "ensemble" (many cheap predictors scored every round, following the best; see ensemble_predictor.py)
+MODEL_TYPE = "online"
+# How many recent moves each Player keeps (can be raised to millions for long-running bot sessions)
+HISTORY_WINDOW = 5
+# Model exported by train_forest.py, used when MODEL_TYPE is "pretrained" (trained on logs of the same game)
+PRETRAINED_MODEL_PATH = os.environ.get("JARVIS_FOREST_MODEL", "jarvis_forest.joblib" if GAME.name == "rps"
+                                       else f"jarvis_forest_{GAME.name}.joblib")
+pretrained_policy = None  # (lookup table, lags) built by load_pretrained_policy()
+# Seed for every Scikit-learn model, so the live model and the "compiled" policy give the same answers
+MODEL_RANDOM_STATE = 0
+compiled_policy = None  # HistoryPolicy built on first use by get_compiled_policy()
+# Where the compiled policy is kept between sessions; set JARVIS_COMPILED_POLICY="" to compile it every session
+COMPILED_POLICY_PATH = os.environ.get("JARVIS_COMPILED_POLICY", "jarvis_compiled_forest.npz" if GAME.name == "rps"
+                                      else f"jarvis_compiled_forest_{GAME.name}.npz")
+# Largest compiled table filled in one pass up front; one forest is fitted per window, so the bigger tables
+# of the larger games are filled in on first use instead (and not saved)
+EAGER_COMPILE_LIMIT = 1000
+# How many new moves to wait before refitting the Scikit-learn model (instead of refitting every round)
+RETRAIN_EVERY = 5
+# Where every round is logged (see game_log.py); set JARVIS_GAME_LOG="" to turn logging off
+# Larger games log to their own file, so their move numbers never mix with rock, paper, scissors rounds
+GAME_LOG_PATH = os.environ.get("JARVIS_GAME_LOG",
+                               "jarvis_games.rpslog" if GAME.name == "rps" else f"jarvis_games_{GAME.name}.rpslog")
+# SQLite scoreboard and player profiles (see scoreboard.py); set JARVIS_SCOREBOARD="" to turn it off
+# Profiles count rock, paper and scissors, so the scoreboard is only kept for that game
+SCOREBOARD_PATH = os.environ.get("JARVIS_SCOREBOARD", "jarvis_scoreboard.db") if GAME.name == "rps" else ""
+REPORT_PATH = os.environ.get("JARVIS_REPORT", "jarvis_report")  # End-of-game report image, without extension
 
 class Player:
-    def __init__(self, name):
+    __slots__ = ("name", "score", "move_history", "source", "move_count", "predictor", "ensemble", "ml_model",
+                 "ml_model_trained_at", "ml_policy")
+
+    def __init__(self, name, history_window=None, source=None):
         # Initialize a Player object with a name, score, and empty move history
         # name: The player's name (e.g., "Parth" or "JARVIS")
         # score: Tracks wins (starts at 0)
-        # move_history: List to store past moves as numbers (0=rock, 1=paper, 2=scissors) for ML training
+        # move_history: Ring buffer of past moves as numbers (0=rock, 1=paper, 2=scissors) for ML training
+        # history_window: How many moves move_history keeps; defaults to HISTORY_WINDOW
+        # source: MoveSource the player's moves come from (see move_sources.py); defaults to the terminal
         self.name = name
         self.score = 0
-        self.move_history = []  # Store up to 5 moves to train the ML model
+        self.source = source or TerminalSource(MOVE_NAMES)
+        self.move_history = MoveHistory(history_window or HISTORY_WINDOW)  # Recent moves to train the ML model
+        self.move_count = 0  # Total moves made, used to schedule model retraining
+        self.predictor = TransitionPredictor(num_moves=GAME.num_moves)  # Online predictor, updated on every move
+        self.ensemble = None  # EnsemblePredictor, created the first time the "ensemble" model is asked
+        self.ml_model = None  # Cached Scikit-learn model (only used when MODEL_TYPE is not "online")
+        self.ml_model_trained_at = 0  # move_count when ml_model was last trained
+        self.ml_policy = None  # ml_model compiled into a lookup table over the last 2 moves
     
     def update_score(self, points):
         # Update the player's score by adding points (e.g., +1 for a win)
@@ -27,73 +81,150 @@ class Player:
         # Used to display scores during the game
         return self.score
     
+    def record_move(self, numeric_move):
+        # Store a numeric move (0=rock, 1=paper, 2=scissors) in move_history without prompting
+        # Used by choose() and by headless drivers (e.g., tournament.py) that already know the move
+        self.move_history.append(numeric_move)  # O(1): the ring buffer overwrites the oldest move when full
+        self.move_count += 1
+        self.predictor.update(numeric_move)  # Keep the online predictor in sync with every move
+        if self.ensemble is not None:
+            self.ensemble.update(numeric_move)  # Scores last round's candidates and learns the move
+    
     def choose(self):
         # Handle player or JARVIS move selection, store it in move_history, and return the text choice
-        options = ["rock", "paper", "scissors"]  # Valid move options for the game
-        move_map = {"rock": 0, "paper": 1, "scissors": 2}  # Map text moves to numbers for ML
+        # Returns None once the player's move source has run out of moves
+        options = MOVE_NAMES  # Valid move options for the game
         if self.name == "JARVIS":
             # If the player is JARVIS, randomly select a move
             # This mimics JARVIS's initial random behavior before ML predictions
-            choice = random.choice(options)
+            numeric_move = rng_service.stream.action(GAME.num_moves)
         else:
-            # If the player is human (e.g., "Parth"), prompt for input until a valid move is entered
-            while True:
-                choice = input(f"{self.name}, enter your choice (rock, paper, scissors): ").lower()
-                if choice in options:
-                    # If the input is valid ("rock", "paper", or "scissors"), break the loop
-                    break
-                print(f"{Fore.BLUE}Invalid choice, sir! Please enter rock, paper, or scissors.{Style.RESET_ALL}")
-        # Convert the text choice to a number for ML and store it in move_history
-        numeric_move = move_map[choice]
-        self.move_history.append(numeric_move)  # Add the numerical move to history
-        if len(self.move_history) > 5:  # Limit history to last 5 moves for ML efficiency
-            # Remove the oldest move (index 0) to keep only the most recent 5 moves
-            self.move_history.pop(0)
-        print(f"{Fore.YELLOW}{self.name}’s move added to history: {numeric_move} (History: {self.move_history}){Style.RESET_ALL}")  # Debug: Show history for verification
-        return choice  # Return the text choice for the game logic
+            # Otherwise ask the move source: the terminal prompt for a human (e.g., "Parth"), or scripted moves
+            numeric_move = self.source.next_move(self.name)
+            if numeric_move is None:
+                return None
+        # Store the numeric move in move_history for ML
+        self.record_move(numeric_move)
+        game_output.output.move_recorded(self.name, numeric_move, self.move_history)  # Debug: Show history for verification
+        return options[numeric_move]  # Return the text choice for the game logic
 
-def train_ml_model(player):
-    # Train a Machine Learning model to predict the next move based on player's move history
-    # player: The Player object (e.g., "Parth") whose moves we’ll use
-    # Returns None if not enough data, otherwise returns a trained DecisionTreeClassifier
-    if len(player.move_history) < 3:  # Need at least 3 moves for training (2 for input, 1 for output)
-        return None  # Not enough data to train, so return None
-    
-    X = []  # List of input features (past moves) for ML training
-    Y = []  # List of target labels (next moves) for ML training
+def fit_history_model(history, random_state=None):
+    # Train a RandomForestClassifier on a window of moves (uint8 array, oldest first)
+    # Returns None if there are fewer than 3 moves (2 for input, 1 for output)
+    # random_state: Fix it to make the fitted model (and so the prediction) reproducible
+    if len(history) < 3:
+        return None
     
     # Create training data: Use last 2 moves to predict the next move
     # Example: If history is [0, 1, 2, 0, 1], use [0, 1] → 2, [1, 2] → 0, [2, 0] → 1
-    for i in range(len(player.move_history) - 2):
-        X.append([player.move_history[i], player.move_history[i + 1]])  # Last two moves as features
-        Y.append(player.move_history[i + 2])  # Next move as the label
-    if not X:  # If no data was added (e.g., history too short), return None
-        return None
+    X = np.stack([history[:-2], history[1:-1]], axis=1)  # Last two moves as features, one row per sample
+    Y = history[2:]  # Next move as the label
     
     # Create and train a Random Forest Classifier for better generalization and accuracy
     # RandomForestClassifier combines multiple decision trees, reducing overfitting
-    clf = RandomForestClassifier()
+    from sklearn.ensemble import RandomForestClassifier  # Imported lazily: Scikit-learn is slow to load
+    clf = RandomForestClassifier(random_state=random_state)
     clf.fit(X, Y)  # Train the model on the features (X) and labels (Y)
     return clf  # Return the trained model for predictions
 
-def predict_move(player):
-    # Predict the player's next move using the ML model and return JARVIS’s counter move
+def train_ml_model(player):
+    # Train a Machine Learning model to predict the next move based on player's move history
+    # player: The Player object (e.g., "Parth") whose moves we’ll use
+    # Returns None if not enough data, otherwise returns a trained RandomForestClassifier
+    return fit_history_model(player.move_history.last(), MODEL_RANDOM_STATE)  # Zero-copy view of the stored moves
+
+def get_ml_model(player):
+    # Return the player's cached Scikit-learn model, refitting it at most once every RETRAIN_EVERY moves
+    # player: The Player object (e.g., "Parth") whose moves we’ll use
+    if player.ml_model is None or player.move_count - player.ml_model_trained_at >= RETRAIN_EVERY:
+        clf = train_ml_model(player)  # Refit on the current move history
+        if clf is not None:
+            player.ml_model = clf
+            player.ml_model_trained_at = player.move_count
+            # One batched predict() now, array lookups until the next refit
+            player.ml_policy = compile_classifier(clf, num_moves=GAME.num_moves)
+            metrics.count("model_refits")
+    return player.ml_model
+
+def predict_history(history):
+    # What the per-round pipeline predicts for a window: fit on the window, then predict from its last 2 moves
+    clf = fit_history_model(history, MODEL_RANDOM_STATE)
+    if clf is None:
+        return None
+    return clf.predict([history[-2:]])[0]
+
+def get_compiled_policy():
+    # Return the shared compiled policy over HISTORY_WINDOW-move windows: loaded from COMPILED_POLICY_PATH, or
+    # compiled in one pass (all CPUs) and saved there the first time; windows too long to enumerate are
+    # filled in on first use instead
+    global compiled_policy
+    if compiled_policy is None:
+        policy = HistoryPolicy(predict_history, HISTORY_WINDOW, num_moves=GAME.num_moves)
+        key = sklearn_key("forest", GAME.name, f"random_state={MODEL_RANDOM_STATE}")
+        eager = policy.table is not None and len(policy.table) <= EAGER_COMPILE_LIMIT
+        if eager and not (COMPILED_POLICY_PATH and policy.load(COMPILED_POLICY_PATH, key)):
+            policy.compile_all(os.cpu_count() or 1)
+            if COMPILED_POLICY_PATH:
+                policy.save(COMPILED_POLICY_PATH, key)
+        compiled_policy = policy
+    return compiled_policy
+
+def load_pretrained_policy():
+    # Load the offline-trained forest once and compile it into a lookup table over its lag window
+    global pretrained_policy
+    if pretrained_policy is None:
+        from train_forest import load_model
+        clf, lags, samples = load_model(PRETRAINED_MODEL_PATH)
+        if int(clf.classes_.max()) >= GAME.num_moves:
+            raise ValueError(f"{PRETRAINED_MODEL_PATH} predicts moves up to {int(clf.classes_.max())}, "
+                             f"{GAME.name} only has {GAME.num_moves} moves")
+        pretrained_policy = (compile_classifier(clf, lags, GAME.num_moves), lags)
+    return pretrained_policy
+
+def get_ensemble(player):
+    # Return the player's EnsemblePredictor, creating it on first use from the moves kept so far
+    if player.ensemble is None:
+        player.ensemble = EnsemblePredictor(game=GAME)
+        for move in player.move_history.last().tolist():
+            player.ensemble.update(move)
+    return player.ensemble
+
+def predict_move(player, model_type=None):
+    # Predict the player's next move and return JARVIS’s counter move
     # player: The Player object (e.g., "Parth") whose history we’ll predict from
-    clf = train_ml_model(player)  # Get or train the ML model
-    if clf is None or len(player.move_history) < 2:
-        # If no model or insufficient data (< 2 moves for prediction), guess randomly
-        print(f"{Fore.BLUE}JARVIS: Not enough data, sir—I’ll guess randomly.{Style.RESET_ALL}")
-        return random.choice(["rock", "paper", "scissors"])
+    # model_type: "online", "ensemble", "forest", "compiled" or "pretrained"; defaults to MODEL_TYPE
+    model_type = model_type or MODEL_TYPE
+    prediction = None
+    if model_type == "online":
+        prediction = player.predictor.predict()  # Most frequent move after your last 2 moves
+    elif model_type == "ensemble":
+        prediction = get_ensemble(player).predict()  # Whichever of dozens of predictors is scoring best
+    elif model_type == "pretrained":
+        table, lags = load_pretrained_policy()
+        if len(player.move_history) >= lags:
+            prediction = int(table[encode_window(player.move_history[-lags:], GAME.num_moves)])  # One table lookup
+    elif model_type == "compiled":
+        prediction = get_compiled_policy().predict(player.move_history.last())  # One table lookup
+    elif len(player.move_history) >= 2:
+        clf = get_ml_model(player)  # Get the cached model or retrain it if it’s due
+        if clf is not None:
+            # Use the last 2 moves to predict the next move, via the model compiled into a 9-entry table
+            last_moves = player.move_history[-2:]  # Get the last 2 moves from history (e.g., [1, 2])
+            prediction = int(player.ml_policy[encode_window(last_moves, GAME.num_moves)])  # Predict the next move (0, 1, or 2)
+    if prediction is None:
+        # If no model or insufficient data, guess randomly
+        game_output.output.random_guess()
+        metrics.count("random_guesses")
+        move = rng_service.stream.action(GAME.num_moves)
+        if model_type == "ensemble":
+            player.ensemble.played(move)  # So the ensemble learns the move JARVIS really played
+        return MOVE_NAMES[move]
     
-    # Use the last 2 moves to predict the next move
-    last_moves = player.move_history[-2:]  # Get the last 2 moves from history (e.g., [1, 2])
-    prediction = clf.predict([last_moves])[0]  # Predict the next move (0, 1, or 2)
-    move_map = {0: "rock", 1: "paper", 2: "scissors"}  # Map numerical predictions back to text
-    predicted_move = move_map[prediction]  # Convert prediction to text (e.g., "scissors")
-    print(f"{Fore.BLUE}JARVIS: Based on your past moves, I predict you’ll pick {predicted_move}, sir!{Style.RESET_ALL}")  # Conversational output, like JARVIS chatting with Tony
+    predicted_move = MOVE_NAMES[prediction]  # Convert prediction to text (e.g., "scissors")
+    game_output.output.prediction(predicted_move)  # Conversational output, like JARVIS chatting with Tony
     # JARVIS picks a move to counter the predicted move, maximizing his chance of winning
     # e.g., if you’re predicted to pick "rock," JARVIS picks "paper" to win
-    counter_move = {"rock": "paper", "paper": "scissors", "scissors": "rock"}[predicted_move]
+    counter_move = MOVE_NAMES[COUNTER_MOVES[prediction]]
     return counter_move  # Return JARVIS’s strategic move to beat or tie your predicted move
 
 def check_win(player, computer, player_choice, computer_choice):
@@ -101,81 +232,36 @@ def check_win(player, computer, player_choice, computer_choice):
     # player: The human player (e.g., "Parth")
     # computer: The AI player (e.g., "JARVIS")
     # player_choice, computer_choice: The moves as text ("rock," "paper," "scissors")
-    print(f"{Fore.BLUE}\n{player.name} Chose {player_choice},\n {computer.name} Chose {computer_choice}{Style.RESET_ALL}")
-    
-    if player_choice == computer_choice:
-        # If both players pick the same move, it’s a tie
-        print(f"{Fore.BLUE}It’s a tie! We’re evenly matched, sir!{Style.RESET_ALL}")
-    elif player_choice == "rock":
-        if computer_choice == "scissors":
-            # Rock beats scissors, so player wins
-            print(f"{Fore.BLUE}Rock smashes scissors! You’ve outsmarted me, sir—well done!{Style.RESET_ALL}")
-            player.update_score(1)  # Add 1 to player’s score
-        else:
-            # Paper beats rock, so JARVIS wins
-            print(f"{Fore.BLUE}Paper covers the rock! I win this round, sir—impressive strategy!{Style.RESET_ALL}")
-            computer.update_score(1)  # Add 1 to JARVIS’s score
-    elif player_choice == "paper":
-        if computer_choice == "rock":
-            # Paper beats rock, so player wins
-            print(f"{Fore.BLUE}Paper covers the rock! Victory is yours, sir!{Style.RESET_ALL}")
-            player.update_score(1)
-        else:
-            # Scissors beat paper, so JARVIS wins
-            print(f"{Fore.BLUE}Scissors cut the paper! I’ve bested you this time, sir!{Style.RESET_ALL}")
-            computer.update_score(1)
-    elif player_choice == "scissors":
-        if computer_choice == "paper":
-            # Scissors beat paper, so player wins
-            print(f"{Fore.BLUE}Scissors cut the paper! You’ve triumphed, sir!{Style.RESET_ALL}")
-            player.update_score(1)
-        else:
-            # Rock beats scissors, so JARVIS wins
-            print(f"{Fore.BLUE}Rock smashes scissors! I claim this victory, sir!{Style.RESET_ALL}")
-            computer.update_score(1)
+    # Returns the outcome for the player: +1 win, 0 tie, -1 loss
+    player_move = GAME.move_index[player_choice]
+    computer_move = GAME.move_index[computer_choice]
+    result = GAME.outcome(player_move, computer_move)  # Look up the payoff table instead of comparing strings
+    game_output.output.round_result(player.name, player_choice, computer.name, computer_choice, result)
+    if result == 1:
+        player.update_score(1)  # Add 1 to player’s score
+    elif result == -1:
+        computer.update_score(1)  # Add 1 to JARVIS’s score
+    return result
 
 def show_score(player, computer):
     # Display the current scores for both players
     # player, computer: Player objects with scores to display
-    print(f"{Fore.BLUE}\nScoreboard, sir: {player.name} - {player.get_score()}, {computer.name} - {computer.get_score()}{Style.RESET_ALL}")
-
-def plot_move_history(player, computer):
-    # Plot the move history for both players to visualize patterns
-    # player, computer: Player objects with move_history
-    moves = {0: "Rock", 1: "Paper", 2: "Scissors"}  # Map numbers to readable names for plotting
-    player_moves = [moves[move] for move in player.move_history]
-    computer_moves = [moves[move] for move in computer.move_history]
-    
-    plt.figure(figsize=(10, 5))
-    plt.plot(player_moves, label="Parth’s Moves", color="blue", marker="o")
-    plt.plot(computer_moves, label="JARVIS’s Moves", color="red", marker="x")
-    plt.title("Rock, Paper, Scissors Move History")
-    plt.xlabel("Move Number")
-    plt.ylabel("Move")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-def play_game():
-    # Main game loop to run the Rock, Paper, Scissors game
-    # Initializes players, handles rounds, and ends when the player stops
-    print(f"{Fore.BLUE}Greetings, sir! I’m JARVIS, ready for a thrilling game of Rock, Paper, Scissors. Shall we begin?{Style.RESET_ALL}")
-    player = Player("Parth")  # Create human player
-    computer = Player("JARVIS")  # Create AI player (JARVIS)
-    
-    while True:
-        # Run one round of the game
-        player_choice = player.choose()  # Get player’s move
-        computer_choice = predict_move(player)  # Get JARVIS’s move using ML prediction
-        check_win(player, computer, player_choice, computer_choice)  # Determine winner and update scores
-        show_score(player, computer)  # Show current scores
-        print(f"{Fore.YELLOW}\n{player.name}’s move history: {player.move_history}{Style.RESET_ALL}")
-        play_again = input(f"{Fore.BLUE}\nWould you like another round, sir? (yes/no): {Style.RESET_ALL}").lower()  # Ask to continue
-        if play_again != "yes":
-            # End the game if the player says no
-            print(f"{Fore.BLUE}\nFarewell, sir! Final score: {player.name} - {player.get_score()}, {computer.name} - {computer.get_score()}{Style.RESET_ALL}")
-            plot_move_history(player, computer)  # Plot move history after the game ends
-            break
+    game_output.output.score(player.name, player.get_score(), computer.name, computer.get_score())
+
+def plot_move_history(player, computer, log_path=None, first_round=0):
+    # Render the session report (move history, rolling win rate, transition matrices) to REPORT_PATH.png
+    # in a background process, so the game ends without waiting on Matplotlib (see move_report.py)
+    # log_path, first_round: Read this session’s rounds from the game log; otherwise use the players’ move_history
+    if log_path:
+        return render_in_background(REPORT_PATH, log_path, first_round, names=(player.name, computer.name), game=GAME)
+    return render_in_background(REPORT_PATH, player_moves=player.move_history.tolist(),
+                                jarvis_moves=computer.move_history.tolist(), names=(player.name, computer.name),
+                                game=GAME)
+
+def play_game(rounds=None, source=None, name=None):
+    # Play one session of this game (see game_session.py for the loop and its options)
+    return game_session.play_game(sys.modules[__name__], rounds, source, name)
 
 # Start the game
-play_game()
\ No newline at end of file
+if __name__ == "__main__":
+    game_session.main(sys.modules[__name__])
@@ -1,40 +1,92 @@
-import random  # Import random module for JARVIS's random move selection
+import os
+import sys
+import rng_service  # Seeded, block-buffered randomness for JARVIS's random moves
 import numpy as np
-from gymnasium.spaces import Discrete
-import colorama  # Import colorama for colored terminal output
-from colorama import Fore, Style  # Import Fore for colors, Style for reset
-import matplotlib.pyplot as plt  # Import matplotlib for visualization
+import game_output  # Interactive, quiet or JSON-lines output for JARVIS’s chatter
+import metrics  # Optional latency timers and counters (off unless enabled)
+from outcome_engine import get_game  # Table-driven round scoring
+from rl_checkpoint import CheckpointAutosaver, load_checkpoint  # Persist what JARVIS learns
+from move_history import MoveHistory  # Ring buffer of recent moves
+from move_sources import TerminalSource  # Where the player's moves come from
+import game_session  # The session loop and command line shared by the game scripts
+from move_report import render_in_background  # Off-screen end-of-game report
+from policy_server import PolicyClient  # Shared Q-table for many game processes
+from replay_buffer import ReplayBuffer, batch_q_update  # Experience replay of past rounds
+from rl_state import StateEncoder, make_q_table, memory_report  # State encodings and Q-table storage
 
-# Initialize colorama for cross-platform support
-colorama.init()
+# Which game is played: "rps" (Rock, Paper, Scissors) or a larger one from outcome_engine.GAMES ("rpsls",
+# "rps7", "rps15"); JARVIS has one action per move of the game
+GAME = get_game(os.environ.get("JARVIS_GAME", "rps"))
+MOVE_NAMES = GAME.moves  # Move names by number (0=rock, 1=paper, 2=scissors)
+MODEL_TYPE = "rl"  # How this script's rounds are labelled in the game log and on the scoreboard
+# Where JARVIS’s Q-table is saved between games (a directory, see rl_checkpoint.py); each game has its own
+CHECKPOINT_PATH = os.environ.get("JARVIS_RL_CHECKPOINT", "jarvis_rl_checkpoint" if GAME.name == "rps"
+                                 else f"jarvis_rl_checkpoint_{GAME.name}")
+HISTORY_WINDOW = 5  # How many recent moves each Player keeps
+# Where every round is logged (see game_log.py); set JARVIS_GAME_LOG="" to turn logging off
+GAME_LOG_PATH = os.environ.get("JARVIS_GAME_LOG",
+                               "jarvis_games.rpslog" if GAME.name == "rps" else f"jarvis_games_{GAME.name}.rpslog")
+# SQLite scoreboard and player profiles (see scoreboard.py); set JARVIS_SCOREBOARD="" to turn it off
+# Profiles count rock, paper and scissors, so the scoreboard is only kept for that game
+SCOREBOARD_PATH = os.environ.get("JARVIS_SCOREBOARD", "jarvis_scoreboard.db") if GAME.name == "rps" else ""
+# Address of a shared policy server (see policy_server.py); when set, JARVIS plays from and learns into the
+# server's Q-table instead of a private one (JARVIS_POLICY_KEY must hold the key the server printed)
+POLICY_SERVER = os.environ.get("JARVIS_POLICY_SERVER", "")
+REPORT_PATH = os.environ.get("JARVIS_REPORT", "jarvis_report")  # End-of-game report image, without extension
+AUTOSAVE_INTERVAL = 30.0  # Seconds between background saves while a game is running
+# What JARVIS’s RL state remembers (a saved checkpoint keeps the encoding it was trained with)
+STATE_OPPONENT_MOVES = 1  # Your last moves
+STATE_OWN_MOVES = 0  # JARVIS’s own last moves
+STATE_OUTCOMES = 0  # Last round outcomes
+rl_agent = None  # Shared RLAgent, created or loaded on first use by get_rl_agent()
+autosaver = None  # Background checkpoint writer, started by start_session()
+REPLAY_CAPACITY = 10000  # Past rounds JARVIS remembers for experience replay
+REPLAY_EVERY = 10  # Rounds between replays
+REPLAY_BATCH = 256  # Past rounds relearned in each replay (one vectorized update)
+replay_buffer = None  # ReplayBuffer created on first use by get_replay_buffer()
 
 class RLAgent:
-  def __init__(self):
-      # Initialize Q-table for Q-learning (3 states: your moves, 3 actions: JARVIS’s moves)
-      # 3x3 table (0=rock, 1=paper, 2=scissors for states and actions), starting with zeros
-      self.q_table = np.zeros((3, 3))
+  def __init__(self, encoder=None, rng=None, game=None):
+      # encoder: StateEncoder deciding what a state remembers; the default is your last move only
+      # rng: RandomStream for exploration and tie-breaking (default: the shared rng_service.stream)
+      # game: GameDefinition being played (default: GAME); sets the number of actions
+      # Initialize Q-table for Q-learning (one row per state, one action per move: JARVIS’s moves)
+      # With the default encoder this is the 3x3 table (0=rock, 1=paper, 2=scissors), starting with zeros
+      # Large state spaces get a sparse table that only stores states actually seen (see rl_state.py)
+      self.game = game or GAME
+      self.num_actions = self.game.num_moves
+      self.encoder = encoder or StateEncoder(num_moves=self.num_actions)
+      if self.encoder.num_moves != self.num_actions:
+          raise ValueError(f"The state encoder is for {self.encoder.num_moves} moves, {self.game.name} has {self.num_actions}")
+      self.q_table = make_q_table(self.encoder.num_states, self.num_actions)
       self.learning_rate = 0.1  # How much new info affects Q-values (low for gradual learning)
       self.discount_factor = 0.9  # How much future rewards matter (high for long-term focus)
       self.epsilon = 0.1  # Chance of exploring (random move) vs. exploiting (best move)
+      self.rng = rng or rng_service.stream
 
 
   def choose_action(self, state):
     # Choose an action using epsilon-greedy policy
     # state: Your last move (0=rock, 1=paper, 2=scissors)
-    # random.uniform(0, 1) generate a random float between 0 and 1 and if it is less than epsilon(0.1), then it will explore (10% chance to be true)
-    if random.uniform(0, 1) < self.epsilon:
-        print(f"{Fore.BLUE}JARVIS: Not enough data, sir—I’ll guess randomly.{Style.RESET_ALL}")
-        return random.choice([0, 1, 2])  # Explore: pick a random move (10% chance)
+    # rng.uniform() is a pre-generated random float between 0 and 1; if it is less than epsilon(0.1), then it will explore (10% chance to be true)
+    if self.rng.uniform() < self.epsilon:
+        game_output.output.random_guess()
+        metrics.count("exploration_moves")
+        return self.rng.action(self.num_actions)  # Explore: pick a random move (10% chance)
     # We first get the state row from the Q-table and then we get the index of the maximum value in that row  
     # Get the Q-values for the current state
-    q_values = self.q_table[state]
+    q_values = self.q_values(state)
     # Find the maximum Q-value
     max_q = np.max(q_values)
     # Find all actions (indices) with the maximum Q-value
     best_actions = np.argwhere(q_values == max_q).flatten()
     # Randomly pick one action from the best actions (handles ties randomly)
-    return random.choice(best_actions)  # Exploit: pick a random move among those with highest Q-value (90% chance)
+    return int(best_actions[self.rng.index(len(best_actions))])  # Exploit: pick a random move among those with highest Q-value (90% chance)
   
+  def q_values(self, state):
+    # The Q-values of one state (one row of the Q-table)
+    return self.q_table[state]
+
   def update_q_table(self, state, action, reward, next_state):
     # Update Q-table using Q-learning formula: Q(s,a) = Q(s,a) + α[R + γ*max(Q(s’,a’)) - Q(s,a)]
     # state: Current state (your last move, e.g., 0 for rock)
@@ -46,18 +98,73 @@ class RLAgent:
     new_q = current_q + self.learning_rate * (reward + self.discount_factor * next_max_q - current_q)
     # Update Q-table: Add learning_rate times the difference between current Q and new expected value
     self.q_table[state, action] = new_q
+
+  def update_q_table_batch(self, states, actions, rewards, next_states):
+    # Same Q-learning formula as update_q_table, applied to whole arrays of transitions at once
+    # Returns the TD error of each transition (used for prioritized replay)
+    return batch_q_update(self.q_table, states, actions, rewards, next_states,
+                          self.learning_rate, self.discount_factor)
+
+  def replay(self, buffer, batch_size=256, strategy="uniform"):
+    # Learn again from past transitions: sample a batch from a ReplayBuffer and apply it in one update
+    index = buffer.sample(batch_size, strategy)
+    if len(index):
+        buffer.update_priorities(index, self.update_q_table_batch(*buffer.batch(index)))
+
+  def memory_report(self):
+    # How the Q-table is stored (dense or sparse) and how many bytes it uses
+    return memory_report(self.q_table)
+
+  @property
+  def can_learn(self):
+    # False for a memory-mapped, read-only policy, which is served as-is
+    return not isinstance(self.q_table, np.ndarray) or self.q_table.flags.writeable
     
 
 
+class SharedPolicyAgent(RLAgent):
+  # RLAgent playing from a policy server's Q-table (see policy_server.py)
+  # Reads the shared table in place and sends every round to the server's learner instead of updating a copy;
+  # the learner also does the experience replay, for all games at once
+  def __init__(self, client, rng=None):
+      super().__init__(StateEncoder(**client.encoding), rng)  # Fails if the server plays a different game
+      for name, value in client.hyperparameters.items():
+          setattr(self, name, value)
+      self.client = client
+      self.q_table = client.table.values  # Read-only view of the shared memory
+
+  def q_values(self, state):
+    return self.client.table.read_row(state)  # Consistent even while the learner is writing
+
+  def update_q_table(self, state, action, reward, next_state):
+    self.client.send(state, action, reward, next_state)
+
+  def update_q_table_batch(self, states, actions, rewards, next_states):
+    self.client.send_batch(states, actions, rewards, next_states)
+
+  def replay(self, buffer, batch_size=256, strategy="uniform"):
+    pass
+
+  @property
+  def can_learn(self):
+    return True
+
+
 class Player:
-    def __init__(self, name):
+    __slots__ = ("name", "score", "move_history", "source", "rl_state")
+
+    def __init__(self, name, history_window=None, source=None):
         # Initialize a Player object with a name, score, and empty move history
         # name: The player's name (e.g., "Parth" or "JARVIS")
         # score: Tracks wins (starts at 0)
-        # move_history: List to store past moves as numbers (0=rock, 1=paper, 2=scissors) for ML training
+        # move_history: Ring buffer of past moves as numbers (0=rock, 1=paper, 2=scissors)
+        # history_window: How many moves move_history keeps; defaults to HISTORY_WINDOW
+        # source: MoveSource the player's moves come from (see move_sources.py); defaults to the terminal
         self.name = name
         self.score = 0
-        self.move_history = []  # Store up to 5 moves to train the ML model
+        self.source = source or TerminalSource(MOVE_NAMES)
+        self.move_history = MoveHistory(history_window or HISTORY_WINDOW)  # Recent moves
+        self.rl_state = 0  # Encoded RL state JARVIS sees for this player, updated by check_win()
     
     def update_score(self, points):
         # Update the player's score by adding points (e.g., +1 for a win)
@@ -69,44 +176,60 @@ class Player:
         # Used to display scores during the game
         return self.score
     
+    def record_move(self, numeric_move):
+        # Store a numeric move (0=rock, 1=paper, 2=scissors) in move_history without prompting
+        # Used by choose() and by headless drivers (e.g., tournament.py) that already know the move
+        self.move_history.append(numeric_move)  # O(1): the ring buffer overwrites the oldest move when full
+    
     def choose(self):
         # Handle player or JARVIS move selection, store it in move_history, and return the text choice
-        options = ["rock", "paper", "scissors"]  # Valid move options for the game
-        move_map = {"rock": 0, "paper": 1, "scissors": 2}  # Map text moves to numbers for ML
+        # Returns None once the player's move source has run out of moves
+        options = MOVE_NAMES  # Valid move options for the game
         if self.name == "JARVIS":
             # If the player is JARVIS, randomly select a move
             # This mimics JARVIS's initial random behavior before ML predictions
-            choice = random.choice(options)
+            numeric_move = rng_service.stream.action(GAME.num_moves)
         else:
-            # If the player is human (e.g., "Parth"), prompt for input until a valid move is entered
-            while True:
-                choice = input(f"{self.name}, enter your choice (rock, paper, scissors): ").lower()
-                if choice in options:
-                    # If the input is valid ("rock", "paper", or "scissors"), break the loop
-                    break
-                print(f"{Fore.BLUE}Invalid choice, sir! Please enter rock, paper, or scissors.{Style.RESET_ALL}")
-        # Convert the text choice to a number for ML and store it in move_history
-        numeric_move = move_map[choice]
-        self.move_history.append(numeric_move)  # Add the numerical move to history
-        if len(self.move_history) > 5:  # Limit history to last 5 moves for ML efficiency
-            # Remove the oldest move (index 0) to keep only the most recent 5 moves
-            self.move_history.pop(0)
-        print(f"{Fore.YELLOW}{self.name}’s move added to history: {numeric_move} (History: {self.move_history}){Style.RESET_ALL}")  # Debug: Show history for verification
-        return choice  # Return the text choice for the game logic
+            # Otherwise ask the move source: the terminal prompt for a human (e.g., "Parth"), or scripted moves
+            numeric_move = self.source.next_move(self.name)
+            if numeric_move is None:
+                return None
+        # Store the numeric move in move_history for ML
+        self.record_move(numeric_move)
+        game_output.output.move_recorded(self.name, numeric_move, self.move_history)  # Debug: Show history for verification
+        return options[numeric_move]  # Return the text choice for the game logic
+
+def get_rl_agent():
+  # Return the shared RL agent, restoring it from CHECKPOINT_PATH the first time if a checkpoint exists
+  global rl_agent  # Use global to persist the RL agent across rounds
+  if rl_agent is None:
+    if POLICY_SERVER:
+      rl_agent = SharedPolicyAgent(PolicyClient(POLICY_SERVER))  # The server holds (and saves) the Q-table
+    elif os.path.exists(os.path.join(CHECKPOINT_PATH, "meta.json")):
+      rl_agent = load_checkpoint(CHECKPOINT_PATH, RLAgent)  # Pick up where the last game left off
+    else:
+      # Create the RL agent if it doesn’t exist yet
+      rl_agent = RLAgent(StateEncoder(STATE_OPPONENT_MOVES, STATE_OWN_MOVES, STATE_OUTCOMES, GAME.num_moves))
+  return rl_agent
+
+def get_replay_buffer():
+  # Return the shared replay buffer; created on first use, not at import, so its sampling stream is spawned
+  # from rng_service after any rng_service.seed() (e.g., tournament.py --seed) and seeded runs repeat
+  global replay_buffer
+  if replay_buffer is None:
+    replay_buffer = ReplayBuffer(REPLAY_CAPACITY)
+  return replay_buffer
 
 def predict_move(player):
   # Predict the player's next move using RL (Q-learning) and return JARVIS’s move
   # player: The Player object (e.g., "Parth") whose history we’ll use as the state
-  global rl_agent  # Use global to persist the RL agent across rounds
-  if 'rl_agent' not in globals():
-    rl_agent = RLAgent()  # Create the RL agent if it doesn’t exist yet
-  # Use your last move as the state (0=rock, 1=paper, 2=scissors)
-  state = player.move_history[-1] if player.move_history else 0  # Default to 0 (rock) if no history
-  print(f"{Fore.YELLOW}Getting your current move: {state}{Style.RESET_ALL}")
+  rl_agent = get_rl_agent()  # Shared agent that persists across rounds
+  # By default the state is your last move (0=rock, 1=paper, 2=scissors), or 0 (rock) before you’ve moved
+  state = player.rl_state
+  game_output.output.rl_state(state)
   # JARVIS chooses a move using RL (Q-learning)
   jarvis_move = rl_agent.choose_action(state)
-  move_map = {0: "rock", 1: "paper", 2: "scissors"}
-  jarvis_text_move = move_map[jarvis_move]
+  jarvis_text_move = MOVE_NAMES[jarvis_move]
   return jarvis_text_move
 
 def check_win(player, computer, player_choice, computer_choice):
@@ -114,95 +237,62 @@ def check_win(player, computer, player_choice, computer_choice):
     # player: The human player (e.g., "Parth")
     # computer: The AI player (e.g., "JARVIS")
     # player_choice, computer_choice: The moves as text ("rock," "paper," "scissors")
-    print(f"{Fore.BLUE}\n{player.name} Chose {player_choice},\n {computer.name} Chose {computer_choice}{Style.RESET_ALL}")
-    reward_increment = 1
-    reward_decrement = -1
-    reward = 0  # Default to tie
-    if player_choice == computer_choice:
-        # If both players pick the same move, it’s a tie
-        print(f"{Fore.BLUE}It’s a tie! We’re evenly matched, sir!{Style.RESET_ALL}")
-    elif player_choice == "rock":
-        if computer_choice == "scissors":
-            # Rock beats scissors, so player wins
-            print(f"{Fore.BLUE}Rock smashes scissors! You’ve outsmarted me, sir—well done!{Style.RESET_ALL}")
-            player.update_score(1)  # Add 1 to player’s score
-            reward = reward_decrement
-        else:
-            # Paper beats rock, so JARVIS wins
-            print(f"{Fore.BLUE}Paper covers the rock! I win this round, sir—impressive strategy!{Style.RESET_ALL}")
-            computer.update_score(1)  # Add 1 to JARVIS’s score
-            reward = reward_increment
-    elif player_choice == "paper":
-        if computer_choice == "rock":
-            # Paper beats rock, so player wins
-            print(f"{Fore.BLUE}Paper covers the rock! Victory is yours, sir!{Style.RESET_ALL}")
-            player.update_score(1)
-            reward = reward_decrement
-        else:
-            # Scissors beat paper, so JARVIS wins
-            print(f"{Fore.BLUE}Scissors cut the paper! I’ve bested you this time, sir!{Style.RESET_ALL}")
-            computer.update_score(1)
-            reward = reward_increment
-    elif player_choice == "scissors":
-        if computer_choice == "paper":
-            # Scissors beat paper, so player wins
-            print(f"{Fore.BLUE}Scissors cut the paper! You’ve triumphed, sir!{Style.RESET_ALL}")
-            player.update_score(1)
-            reward = reward_decrement
-        else:
-            # Rock beats scissors, so JARVIS wins
-            print(f"{Fore.BLUE}Rock smashes scissors! I claim this victory, sir!{Style.RESET_ALL}")
-            computer.update_score(1)
-            reward = reward_increment
+    # Returns the outcome for the player: +1 win, 0 tie, -1 loss
+    player_move = GAME.move_index[player_choice]
+    computer_move = GAME.move_index[computer_choice]
+    result = GAME.outcome(player_move, computer_move)  # Look up the payoff table instead of comparing strings
+    game_output.output.round_result(player.name, player_choice, computer.name, computer_choice, result)
+    if result == 1:
+        player.update_score(1)  # Add 1 to player’s score
+    elif result == -1:
+        computer.update_score(1)  # Add 1 to JARVIS’s score
     
-    move_map = {"rock": 0, "paper": 1, "scissors": 2}
-    player_choice_num = move_map[player_choice]
-    computer_choice_num = move_map[computer_choice]
-    next_state = player_choice_num
-    rl_agent.update_q_table(player_choice_num, computer_choice_num, reward, next_state)  # Update Q-table after the round
+    reward = -result  # JARVIS’s reward is the opposite of the player’s outcome
+    rl_agent = get_rl_agent()
+    state = player.rl_state  # The state JARVIS chose its move in
+    next_state = player.rl_state = rl_agent.encoder.next_state(state, player_move, computer_move, reward)
+    if rl_agent.can_learn:
+        rl_agent.update_q_table(state, computer_move, reward, next_state)  # Update Q-table after the round
+        replay = get_replay_buffer()
+        replay.add(state, computer_move, reward, next_state)
+        if replay.total % REPLAY_EVERY == 0:
+            rl_agent.replay(replay, REPLAY_BATCH)  # Squeeze more learning out of the rounds already played
+        if autosaver is not None:
+            autosaver.mark_dirty()  # The background thread saves it; the round doesn’t wait on disk
+    return result
 
 def show_score(player, computer):
     # Display the current scores for both players
     # player, computer: Player objects with scores to display
-    print(f"{Fore.BLUE}\nScoreboard, sir: {player.name} - {player.get_score()}, {computer.name} - {computer.get_score()}{Style.RESET_ALL}")
-
-def plot_move_history(player, computer):
-    # Plot the move history for both players to visualize patterns
-    # player, computer: Player objects with move_history
-    moves = {0: "Rock", 1: "Paper", 2: "Scissors"}  # Map numbers to readable names for plotting
-    player_moves = [moves[move] for move in player.move_history]
-    computer_moves = [moves[move] for move in computer.move_history]
-    
-    plt.figure(figsize=(10, 5))
-    plt.plot(player_moves, label="Parth’s Moves", color="blue", marker="o")
-    plt.plot(computer_moves, label="JARVIS’s Moves", color="red", marker="x")
-    plt.title("Rock, Paper, Scissors Move History")
-    plt.xlabel("Move Number")
-    plt.ylabel("Move")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-def play_game():
-    # Main game loop to run the Rock, Paper, Scissors game
-    # Initializes players, handles rounds, and ends when the player stops
-    print(f"{Fore.BLUE}Greetings, sir! I’m JARVIS, ready for a thrilling game of Rock, Paper, Scissors. Shall we begin?{Style.RESET_ALL}")
-    player = Player("Parth")  # Create human player
-    computer = Player("JARVIS")  # Create AI player (JARVIS)
-    
-    while True:
-        # Run one round of the game
-        computer_choice = predict_move(player)  # Get JARVIS’s move using ML prediction
-        player_choice = player.choose()  # Get player’s move
-        check_win(player, computer, player_choice, computer_choice)  # Determine winner and update scores
-        show_score(player, computer)  # Show current scores
-        print(f"{Fore.YELLOW}\n{player.name}’s move history: {player.move_history}{Style.RESET_ALL}")
-        play_again = input(f"{Fore.BLUE}\nWould you like another round, sir? (yes/no): {Style.RESET_ALL}").lower()  # Ask to continue
-        if play_again != "yes":
-            # End the game if the player says no
-            print(f"{Fore.BLUE}\nFarewell, sir! Final score: {player.name} - {player.get_score()}, {computer.name} - {computer.get_score()}{Style.RESET_ALL}")
-            plot_move_history(player, computer)  # Plot move history after the game ends
-            break
+    game_output.output.score(player.name, player.get_score(), computer.name, computer.get_score())
+
+def plot_move_history(player, computer, log_path=None, first_round=0):
+    # Render the session report (move history, rolling win rate, transition matrices) to REPORT_PATH.png
+    # in a background process, so the game ends without waiting on Matplotlib (see move_report.py)
+    # log_path, first_round: Read this session’s rounds from the game log; otherwise use the players’ move_history
+    if log_path:
+        return render_in_background(REPORT_PATH, log_path, first_round, names=(player.name, computer.name), game=GAME)
+    return render_in_background(REPORT_PATH, player_moves=player.move_history.tolist(),
+                                jarvis_moves=computer.move_history.tolist(), names=(player.name, computer.name),
+                                game=GAME)
+
+def start_session():
+    # Session hook (see game_session.py): save the Q-table in the background while the game runs
+    global autosaver
+    if not POLICY_SERVER:
+        autosaver = CheckpointAutosaver(get_rl_agent(), CHECKPOINT_PATH, AUTOSAVE_INTERVAL).start()
+
+def end_session():
+    # Session hook, run in the cleanup (also on Ctrl-C)
+    if autosaver is not None:
+        autosaver.stop()  # Save the final Q-table so the next game starts trained
+    if isinstance(rl_agent, SharedPolicyAgent):
+        rl_agent.client.close()  # Send any rounds still pending to the policy server
+
+def play_game(rounds=None, source=None, name=None):
+    # Play one session of this game (see game_session.py for the loop and its options)
+    return game_session.play_game(sys.modules[__name__], rounds, source, name)
 
 # Start the game
-play_game()
\ No newline at end of file
+if __name__ == "__main__":
+    game_session.main(sys.modules[__name__])
@@ -0,0 +1,297 @@
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+# Persistent scoreboard and player profiles in SQLite
+# Stores every player, one row per session, all-time totals, and a move profile per player: how often each
+# move followed each window of their last PROFILE_ORDER moves, plus their last few moves
+# Rounds are buffered in memory and written every FLUSH_EVERY rounds in one transaction; the database runs
+# in WAL mode, so several game processes can write while others read the leaderboard
+# Loading a profile at session start lets the predictors pick up where the player's last session ended
+# Run with: python scoreboard.py top -n 10   or   python scoreboard.py history Parth
+
+SCOREBOARD_PATH_ENV = "JARVIS_SCOREBOARD"
+PLAYER_ENV = "JARVIS_PLAYER"  # Player name to use instead of asking
+DEFAULT_PLAYER = "Parth"
+FLUSH_EVERY = 20  # Rounds buffered before a write transaction
+PROFILE_ORDER = 2  # Moves per context window (matches TransitionPredictor's default order)
+PROFILE_RECENT = 32  # Last moves kept per player, to refill the move history
+BUSY_TIMEOUT_MS = 5000  # How long a writer waits for another process's transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL,
+    last_played REAL,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    ties INTEGER NOT NULL DEFAULT 0,
+    rock INTEGER NOT NULL DEFAULT 0,
+    paper INTEGER NOT NULL DEFAULT 0,
+    scissors INTEGER NOT NULL DEFAULT 0,
+    recent_moves BLOB NOT NULL DEFAULT x''
+);
+CREATE INDEX IF NOT EXISTS players_by_wins ON players (wins DESC, rounds);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES players (id),
+    predictor TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    ties INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_by_player ON sessions (player_id, started DESC);
+CREATE TABLE IF NOT EXISTS transitions (
+    player_id INTEGER NOT NULL REFERENCES players (id),
+    context INTEGER NOT NULL,
+    move INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (player_id, context, move)
+) WITHOUT ROWID;
+"""
+
+
+class ScoreSession:
+    # One game session of one player; wins/losses/ties are from the player's side
+    def __init__(self, scoreboard, session_id, player_id, recent_moves, flush_every=FLUSH_EVERY):
+        self.scoreboard = scoreboard
+        self.session_id = session_id
+        self.player_id = player_id
+        self.flush_every = flush_every
+        self.recent_moves = list(recent_moves)[-PROFILE_RECENT:]
+        self.context_size = 3 ** PROFILE_ORDER
+        self.context = 0  # The player's last PROFILE_ORDER moves, continued from the stored profile
+        for move in self.recent_moves[-PROFILE_ORDER:]:
+            self.context = (self.context * 3 + move) % self.context_size
+        self.seen = len(self.recent_moves)
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self.pending = 0
+        self.results = [0, 0, 0]  # wins, losses, ties
+        self.moves = [0, 0, 0]
+        self.transitions = np.zeros((self.context_size, 3), dtype=np.int64)
+
+    def record_round(self, player_move, jarvis_move, result):
+        # Count one round (result: +1 player win, 0 tie, -1 player loss); writes every flush_every rounds
+        self.results[0 if result == 1 else 1 if result == -1 else 2] += 1
+        self.moves[player_move] += 1
+        if self.seen >= PROFILE_ORDER:
+            self.transitions[self.context, player_move] += 1
+        self.context = (self.context * 3 + player_move) % self.context_size
+        self.seen += 1
+        self.recent_moves.append(player_move)
+        if len(self.recent_moves) > 2 * PROFILE_RECENT:
+            del self.recent_moves[:-PROFILE_RECENT]
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self, ended=None):
+        # Write the buffered rounds in one transaction
+        if not self.pending and ended is None:
+            return
+        now = time.time()
+        wins, losses, ties = self.results
+        contexts, moves = np.nonzero(self.transitions)
+        rows = [(self.player_id, context, move, count) for context, move, count in
+                zip(contexts.tolist(), moves.tolist(), self.transitions[contexts, moves].tolist())]
+        recent = np.asarray(self.recent_moves[-PROFILE_RECENT:], dtype=np.uint8).tobytes()
+        with self.scoreboard.transaction() as db:
+            db.execute("UPDATE sessions SET rounds = rounds + ?, wins = wins + ?, losses = losses + ?, "
+                       "ties = ties + ?, ended = COALESCE(?, ended) WHERE id = ?",
+                       (self.pending, wins, losses, ties, ended, self.session_id))
+            db.execute("UPDATE players SET rounds = rounds + ?, wins = wins + ?, losses = losses + ?, "
+                       "ties = ties + ?, rock = rock + ?, paper = paper + ?, scissors = scissors + ?, "
+                       "recent_moves = ?, last_played = ? WHERE id = ?",
+                       (self.pending, wins, losses, ties, *self.moves, recent, now, self.player_id))
+            db.executemany("INSERT INTO transitions (player_id, context, move, count) VALUES (?, ?, ?, ?) "
+                           "ON CONFLICT (player_id, context, move) DO UPDATE SET count = count + excluded.count",
+                           rows)
+        self._reset_pending()
+
+    def close(self):
+        # Write what is left and mark the session as ended
+        if self.session_id is not None:
+            self.flush(ended=time.time())
+            self.session_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Scoreboard:
+    def __init__(self, path, flush_every=FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        # Autocommit mode: transactions are opened explicitly by transaction()
+        self.connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = WAL")  # Readers never block the writer, or vice versa
+        self.connection.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL; fsync only at checkpoints
+        self.connection.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        self.connection.executescript(SCHEMA)
+
+    def transaction(self):
+        # Context manager for one write transaction, taking the write lock up front (BEGIN IMMEDIATE)
+        # so two processes never both read and then deadlock trying to upgrade to a write
+        return _Transaction(self.connection)
+
+    def player_id(self, name):
+        # Row id of player `name`, adding the player the first time
+        with self.transaction() as db:
+            db.execute("INSERT OR IGNORE INTO players (name, created) VALUES (?, ?)", (name, time.time()))
+            return db.execute("SELECT id FROM players WHERE name = ?", (name,)).fetchone()[0]
+
+    def start_session(self, name, predictor):
+        # Start recording a session for player `name`, whom JARVIS plays with `predictor`
+        player_id = self.player_id(name)
+        with self.transaction() as db:
+            session_id = db.execute("INSERT INTO sessions (player_id, predictor, started) VALUES (?, ?, ?)",
+                                    (player_id, predictor, time.time())).lastrowid
+        row = self.connection.execute("SELECT recent_moves FROM players WHERE id = ?", (player_id,)).fetchone()
+        return ScoreSession(self, session_id, player_id, np.frombuffer(row[0], dtype=np.uint8).tolist(),
+                            self.flush_every)
+
+    def load_profile(self, name):
+        # The stored profile of player `name`, or None for a new player:
+        # transitions[context, move] counts (context: last PROFILE_ORDER moves in base 3), move frequencies,
+        # their last moves (oldest first) and all-time results
+        row = self.connection.execute(
+            "SELECT id, rounds, wins, losses, ties, rock, paper, scissors, recent_moves FROM players WHERE name = ?",
+            (name,)).fetchone()
+        if row is None:
+            return None
+        player_id, rounds, wins, losses, ties, rock, paper, scissors, recent = row
+        transitions = np.zeros((3 ** PROFILE_ORDER, 3), dtype=np.int64)
+        for context, move, count in self.connection.execute(
+                "SELECT context, move, count FROM transitions WHERE player_id = ?", (player_id,)):
+            transitions[context, move] = count
+        return {"name": name, "rounds": rounds, "wins": wins, "losses": losses, "ties": ties,
+                "frequencies": np.array([rock, paper, scissors], dtype=np.int64), "transitions": transitions,
+                "recent_moves": np.frombuffer(recent, dtype=np.uint8).copy()}
+
+    def leaderboard(self, limit=10):
+        # Top `limit` players by all-time wins (read straight off the players_by_wins index)
+        return [dict(zip(("name", "wins", "losses", "ties", "rounds"), row)) for row in self.connection.execute(
+            "SELECT name, wins, losses, ties, rounds FROM players ORDER BY wins DESC, rounds LIMIT ?", (limit,))]
+
+    def player_history(self, name, limit=20):
+        # The player's last `limit` sessions, newest first
+        columns = ("predictor", "started", "ended", "rounds", "wins", "losses", "ties")
+        return [dict(zip(columns, row)) for row in self.connection.execute(
+            "SELECT s.predictor, s.started, s.ended, s.rounds, s.wins, s.losses, s.ties "
+            "FROM sessions s JOIN players p ON p.id = s.player_id WHERE p.name = ? "
+            "ORDER BY s.started DESC LIMIT ?", (name, limit))]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Transaction:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, *exc):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class NullScoreSession:
+    # Stand-in used when the scoreboard is turned off
+    def record_round(self, *args, **kwargs):
+        pass
+
+    def flush(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class NullScoreboard:
+    def start_session(self, name, predictor):
+        return NullScoreSession()
+
+    def load_profile(self, name):
+        return None
+
+    def leaderboard(self, limit=10):
+        return []
+
+    def player_history(self, name, limit=20):
+        return []
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def open_scoreboard(path, flush_every=FLUSH_EVERY):
+    # Return a Scoreboard for `path`, or a NullScoreboard if path is empty/None
+    return Scoreboard(path, flush_every) if path else NullScoreboard()
+
+
+def player_name(ask=True):
+    # The human player's name: JARVIS_PLAYER if set, else asked for (Enter keeps the default)
+    # ask: False for unattended games, which use the default instead of waiting at a prompt
+    name = os.environ.get(PLAYER_ENV, "").strip()
+    if not name and ask:
+        name = input(f"What should I call you, sir? [{DEFAULT_PLAYER}]: ").strip()
+    return name or DEFAULT_PLAYER
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the JARVIS scoreboard.")
+    parser.add_argument("--db", default=os.environ.get(SCOREBOARD_PATH_ENV, "jarvis_scoreboard.db"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    top = commands.add_parser("top", help="Players with the most wins")
+    top.add_argument("-n", type=int, default=10)
+    history = commands.add_parser("history", help="A player's recent sessions")
+    history.add_argument("name")
+    history.add_argument("-n", type=int, default=20)
+    args = parser.parse_args(argv)
+    with Scoreboard(args.db) as scoreboard:
+        if args.command == "top":
+            for rank, row in enumerate(scoreboard.leaderboard(args.n), 1):
+                print(f"{rank:>3}. {row['name']:<20} {row['wins']:>7} wins {row['losses']:>7} losses "
+                      f"{row['ties']:>7} ties ({row['rounds']} rounds)")
+        else:
+            for row in scoreboard.player_history(args.name, args.n):
+                started = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["started"]))
+                print(f"{started}  {row['predictor']:<10} {row['wins']:>5}-{row['losses']}-{row['ties']} "
+                      f"({row['rounds']} rounds)")
+
+
+if __name__ == "__main__":
+    main()
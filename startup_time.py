@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Measure how long each entry point takes to import in a fresh Python process
+# Run with: python startup_time.py [--repeat 5] [--json startup.json]
+
+ENTRY_POINTS = [
+    "rock_paper_game",
+    "rock_paper_game_RandomForestClassifier",
+    "rock_paper_game_rl",
+    "rl_standalone",
+    "tournament",
+]
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def time_import(module, repeat):
+    # Median wall-clock time (seconds) of `python -c "import module"` over `repeat` fresh interpreters
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"] if module else [sys.executable, "-c", "pass"],
+                       cwd=REPO_DIR, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def measure_startup(modules=ENTRY_POINTS, repeat=5):
+    # Return {"interpreter": seconds, module: seconds, ...}; module times include interpreter startup
+    results = {"interpreter": time_import(None, repeat)}
+    for module in modules:
+        results[module] = time_import(module, repeat)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import/startup time for each game entry point.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per entry point (median is reported)")
+    parser.add_argument("--json", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = measure_startup(repeat=args.repeat)
+    base = results["interpreter"]
+    print(f"{'interpreter':<42} {base * 1000:8.1f} ms")
+    for module in ENTRY_POINTS:
+        total = results[module]
+        print(f"{module:<42} {total * 1000:8.1f} ms  (+{(total - base) * 1000:.1f} ms imports)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
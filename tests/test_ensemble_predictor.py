@@ -0,0 +1,45 @@
+import time
+
+from ensemble_predictor import ContextModel, EnsemblePredictor
+
+
+def _update_time(model, start, count=1000, repeats=3):
+    # Best of a few runs of `count` updates with runs never seen before, in seconds per update
+    best = float("inf")
+    for repeat in range(repeats):
+        began = time.perf_counter()
+        for symbol in range(start + repeat * count, start + (repeat + 1) * count):
+            model.update(symbol, 0)
+        best = min(best, (time.perf_counter() - began) / count)
+    return best
+
+
+def test_followers_forget_the_oldest_runs_first():
+    model = ContextModel(100, (), 1, max_followers=4)
+    for symbol in range(10):
+        model.update(symbol, symbol % 3)
+    assert list(model.followers[1]) == [5, 6, 7, 8]  # The run before each of the last 4 updates
+
+
+def test_eviction_cost_stays_flat_after_the_cap():
+    # Every update here evicts one run; the cost per update must not grow with the number of evictions
+    cap = 1 << 14
+    model = ContextModel(1 << 30, (), 1, max_followers=cap)
+    for symbol in range(cap + 1):
+        model.update(symbol, 0)
+    first = _update_time(model, cap + 1)
+    for symbol in range(cap + 3001, cap + 53001):
+        model.update(symbol, 0)
+    later = _update_time(model, cap + 53001)
+    assert len(model.followers[1]) == cap
+    assert later < 4 * first, f"{later * 1e6:.1f} us per update after 50k evictions, {first * 1e6:.1f} us before"
+
+
+def test_ensemble_beats_a_cycle():
+    predictor = EnsemblePredictor()
+    wins = 0
+    for move in [0, 1, 2] * 100:
+        predicted = predictor.predict()
+        wins += predicted == move
+        predictor.update(move)
+    assert wins > 250
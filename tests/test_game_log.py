@@ -0,0 +1,67 @@
+import numpy as np
+
+from game_log import HEADER, MAGIC, PREDICTORS, RECORD_DTYPES, GameLogWriter, iter_rounds, open_log, read_records
+from train_forest import stream_lag_chunks
+
+
+def test_writer_round_trip(tmp_path):
+    path = str(tmp_path / "games.rpslog")
+    rng = np.random.default_rng(0)
+    player_moves = rng.integers(0, 3, 1000)
+    jarvis_moves = rng.integers(0, 3, 1000)
+    outcomes = rng.integers(-1, 2, 1000)
+    with GameLogWriter(path, buffer_rounds=64) as log:  # Small buffer: several flushes
+        for i in range(600):
+            log.log_round(player_moves[i], jarvis_moves[i], outcomes[i], "ensemble", timestamp=float(i))
+        log.log_rounds(player_moves[600:], jarvis_moves[600:], outcomes[600:], "pretrained",
+                       np.arange(600, 1000, dtype=np.float64))
+
+    records = np.concatenate(list(read_records(path, chunk_rounds=128)))
+    assert len(records) == 1000
+    assert (records["player_move"] == player_moves).all()
+    assert (records["jarvis_move"] == jarvis_moves).all()
+    assert (records["outcome"] == outcomes).all()
+    assert (records["timestamp"] == np.arange(1000)).all()
+    assert (records["session"] == 0).all()
+    assert (open_log(path) == records).all()
+    names = [name for *_, name in iter_rounds(path)]
+    assert names[:600] == ["ensemble"] * 600 and names[600:] == ["pretrained"] * 400
+
+
+def test_predictor_codes_are_stable():
+    # Existing logs store these codes; new predictors may only be appended
+    assert PREDICTORS[:8] == ["random", "online", "tree", "forest", "compiled", "rl", "ensemble", "pretrained"]
+
+
+def test_sessions_and_torn_records(tmp_path):
+    path = str(tmp_path / "games.rpslog")
+    for session in range(3):
+        with GameLogWriter(path) as log:
+            assert log.session == session and log.rounds == 5 * session
+            log.log_rounds([0, 1, 2, 0, 1], [1, 1, 1, 1, 1], [0, 0, 0, 0, 0], "online")
+    with open(path, "ab") as f:
+        f.write(b"\0" * 5)  # A partially written record, as after a crash
+    assert len(open_log(path)) == 15
+    assert open_log(path)["session"].tolist() == [0] * 5 + [1] * 5 + [2] * 5
+    with GameLogWriter(path) as log:  # Drops the torn record before appending
+        assert log.rounds == 15 and log.session == 3
+        log.log_round(2, 0, 1, "rl")
+    assert len(open_log(path)) == 16
+    # Lag windows never span two sessions: 3 sessions of 5 moves give 3 samples each with 2 lags
+    for chunk_rounds in (1, 4, 5, 7, 100):
+        ys = [y for _, y in stream_lag_chunks([path], 2, chunk_rounds)]
+        assert sum(len(y) for y in ys) == 9
+
+
+def test_reads_and_appends_version_1_logs(tmp_path):
+    path = str(tmp_path / "old.rpslog")
+    old = np.zeros(4, dtype=RECORD_DTYPES[1])
+    old["player_move"] = [0, 1, 2, 0]
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 1, RECORD_DTYPES[1].itemsize) + old.tobytes())
+    with GameLogWriter(path) as log:
+        log.log_round(1, 2, -1, "tree")
+    records = open_log(path)
+    assert records.dtype == RECORD_DTYPES[1]
+    assert records["player_move"].tolist() == [0, 1, 2, 0, 1]
+    assert sum(len(y) for _, y in stream_lag_chunks([path], 2)) == 3
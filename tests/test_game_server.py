@@ -0,0 +1,47 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from outcome_engine import GAMES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+@pytest.mark.parametrize("predictor", ["online", "rl"])
+def test_sessions_play_the_configured_game(tmp_path, predictor):
+    game = GAMES["rpsls"]
+    path = str(tmp_path / "jarvis.sock")
+    env = dict(os.environ, JARVIS_GAME=game.name)
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "game_server.py"), "--unix", path,
+                               "--predictor", predictor], env=env, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(path):
+            assert server.poll() is None and time.monotonic() < deadline, "server did not start"
+            time.sleep(0.05)
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            replies = client.makefile("r")
+            assert replies.readline().split() == ["HELLO", predictor]
+            player_score = jarvis_score = 0
+            for move in ["spock", "lizard", "spock", "rock", "spock"]:
+                client.sendall(move.encode() + b"\n")
+                word, jarvis_move, result, *scores = replies.readline().split()
+                assert word == "MOVE" and jarvis_move in game.moves
+                outcome = game.outcome(game.move_index[move], game.move_index[jarvis_move])
+                assert result == {1: "win", 0: "tie", -1: "loss"}[outcome]
+                player_score += outcome == 1
+                jarvis_score += outcome == -1
+                assert list(map(int, scores)) == [player_score, jarvis_score]
+            client.sendall(b"bad\n")
+            assert replies.readline().startswith("ERR expected rock, paper, scissors, spock, lizard")
+            client.sendall(b"QUIT\n")
+            assert replies.readline().split() == ["BYE", str(player_score), str(jarvis_score)]
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from move_history import MoveHistory
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 7])
+def test_views_match_a_list_across_wraparound(window):
+    history = MoveHistory(window)
+    moves = []
+    for move in np.random.default_rng(window).integers(0, 3, 4 * window + 3).tolist():
+        history.append(move)
+        moves = (moves + [move])[-window:]
+        assert history.tolist() == moves and len(history) == len(moves)
+        for k in range(window + 2):
+            view = history.last(k)
+            assert view.tolist() == moves[len(moves) - min(k, len(moves)):]
+            assert view.base is not None  # A view into the ring buffer, not a copy
+        assert history[-1] == move and history[-2:].tolist() == moves[-2:] and list(history) == moves
+    assert history.total == 4 * window + 3
+
+
+def test_last_is_a_live_view_and_clear_empties():
+    history = MoveHistory(3)
+    for move in (0, 1, 2):
+        history.append(move)
+    view = history.last(3)
+    history.append(1)  # Overwrites the oldest slot behind the view
+    assert view.tolist() != [0, 1, 2] and history.tolist() == [1, 2, 1]
+    history.clear()
+    assert len(history) == 0 and history.tolist() == [] and history.total == 0
+    with pytest.raises(ValueError):
+        MoveHistory(0)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from online_predictor import TransitionPredictor
+
+
+def _recount(moves, order, num_moves):
+    # The same table built from scratch: one count per window of `order` moves and the move after it
+    counts = np.zeros((num_moves ** order, num_moves), dtype=np.int64)
+    for i in range(order, len(moves)):
+        context = 0
+        for move in moves[i - order:i]:
+            context = context * num_moves + move
+        counts[context, moves[i]] += 1
+    return counts
+
+
+@pytest.mark.parametrize("order, num_moves", [(1, 3), (2, 3), (3, 3), (2, 5)])
+def test_incremental_counts_match_a_recount(order, num_moves):
+    moves = np.random.default_rng(order).integers(0, num_moves, 500).tolist()
+    predictor = TransitionPredictor(order, num_moves)
+    for i, move in enumerate(moves):
+        predictor.update(move)
+        if i % 50 == 0 or i < order + 2:
+            assert (predictor.counts == _recount(moves[:i + 1], order, num_moves)).all()
+    counts = _recount(moves, order, num_moves)
+    assert (predictor.counts == counts).all() and predictor.seen == len(moves)
+    # The prediction is the most frequent follower of the last `order` moves
+    context = 0
+    for move in moves[-order:]:
+        context = context * num_moves + move
+    row = counts[context]
+    assert predictor.predict() == (int(row.argmax()) if row.any() else None)
+
+
+def test_prediction_before_the_window_fills_and_after_reset():
+    predictor = TransitionPredictor(order=2)
+    assert predictor.predict() is None
+    for move in (0, 1, 2, 0, 1):
+        predictor.update(move)
+    assert predictor.predict() == 2  # (0, 1) was followed by 2
+    predictor.reset()
+    assert predictor.predict() is None and not predictor.counts.any()
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from game_log import GameLogWriter
+from opponents import ReplayOpponent
+
+
+def test_replay_rejects_moves_outside_the_game(tmp_path):
+    path = str(tmp_path / "rpsls.rpslog")
+    with GameLogWriter(path) as log:
+        log.log_rounds([0, 3, 4, 1], [0, 0, 0, 0], [0, 0, 0, 0], "online")  # Spock and lizard
+    with pytest.raises(ValueError, match="moves up to 4"):
+        ReplayOpponent(path, num_moves=3)
+    with pytest.raises(ValueError):
+        ReplayOpponent(moves=np.array([0, 1, 3]), num_moves=3)
+    opponent = ReplayOpponent(path, start=0, num_moves=5)
+    opponent.reset(1)
+    assert [opponent.move(None) for _ in range(6)] == [0, 3, 4, 1, 0, 3]
@@ -0,0 +1,64 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from outcome_engine import GAMES, PAYOFF, RPS, GameDefinition, cyclic_game, get_game
+
+# What the first move (rock) beats in each published game
+ROCK_BEATS = {
+    "rps": {"scissors"},
+    "rpsls": {"scissors", "lizard"},
+    "rps7": {"fire", "scissors", "sponge"},
+    "rps15": {"fire", "scissors", "snake", "human", "tree", "wolf", "sponge"},
+}
+
+
+@pytest.mark.parametrize("name, num_moves", [("rps", 3), ("rpsls", 5), ("rps7", 7), ("rps15", 15)])
+def test_tables_are_balanced(name, num_moves):
+    game = get_game(name)
+    n = game.num_moves
+    assert n == num_moves and len(game.move_index) == n
+    assert (game.payoff == -game.payoff.T).all() and (np.diag(game.payoff) == 0).all()
+    # Every move beats exactly half of the others and loses to the other half
+    assert ((game.payoff == 1).sum(axis=1) == (n - 1) // 2).all()
+    assert ((game.payoff == -1).sum(axis=1) == (n - 1) // 2).all()
+    # JARVIS's counters beat the move they answer and form a permutation with beaten_moves as its inverse
+    moves = np.arange(n)
+    assert (game.payoff[game.counter_moves, moves] == 1).all()
+    assert sorted(game.counter_moves.tolist()) == moves.tolist()
+    assert (game.beaten_moves[game.counter_moves] == moves).all()
+    assert {game.moves[m] for m in moves if game.outcome(0, m) == 1} == ROCK_BEATS[name]
+
+
+@pytest.mark.parametrize("name", ["rpsls", "rps7", "rps15"])
+def test_scalar_and_batched_scoring_agree(name):
+    game = GAMES[name]
+    pairs = np.array(list(itertools.product(range(game.num_moves), repeat=2)))
+    scalar = [game.outcome(a, b) for a, b in pairs.tolist()]
+    assert game.outcomes(pairs[:, 0], pairs[:, 1]).tolist() == scalar
+    counts = game.score_games(pairs[:, 0], pairs[:, 1])
+    assert counts["ties"] == game.num_moves and counts["wins"] == counts["losses"]
+
+
+def test_rpsls_rules():
+    game = GAMES["rpsls"]
+    rules = [("scissors", "paper"), ("paper", "rock"), ("rock", "lizard"), ("lizard", "spock"),
+             ("spock", "scissors"), ("scissors", "lizard"), ("lizard", "paper"), ("paper", "spock"),
+             ("spock", "rock"), ("rock", "scissors")]
+    for winner, loser in rules:
+        assert game.outcome(game.move_index[winner], game.move_index[loser]) == 1
+        assert game.outcome(game.move_index[loser], game.move_index[winner]) == -1
+
+
+def test_cyclic_game_matches_rps():
+    game = cyclic_game("cyclic3", ["rock", "paper", "scissors"], (1,))
+    assert (game.payoff == PAYOFF).all() and (game.counter_moves == RPS.counter_moves).all()
+    assert RPS.title == "Rock, Paper, Scissors"
+
+
+def test_bad_tables_are_rejected():
+    with pytest.raises(ValueError):
+        GameDefinition("bad", ["a", "b"], [[0, 1], [1, 0]])  # Not antisymmetric
+    with pytest.raises(ValueError):
+        get_game("rps4")
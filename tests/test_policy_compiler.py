@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from policy_compiler import HistoryPolicy, all_windows, compile_classifier, encode_window
+from rock_paper_game import predict_history
+
+
+@pytest.mark.parametrize("num_moves, lags", [(3, 2), (5, 3)])
+def test_compiled_classifier_matches_predict_on_every_window(num_moves, lags):
+    from sklearn.ensemble import RandomForestClassifier
+    rng = np.random.default_rng(num_moves)
+    X = rng.integers(0, num_moves, size=(500, lags))
+    y = (X[:, -1] + rng.integers(0, 2, size=500)) % num_moves  # Learnable but not a single rule
+    clf = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    table = compile_classifier(clf, lags, num_moves)
+    windows = all_windows(lags, num_moves)
+    assert len(table) == len(windows) == num_moves ** lags
+    for window in windows:
+        assert table[encode_window(window, num_moves)] == clf.predict(window[None, :])[0]
+
+
+@pytest.mark.parametrize("num_moves, window", [(3, 5), (5, 3)])
+def test_compiled_history_policy_matches_the_live_model(num_moves, window):
+    # Every history of up to `window` moves: the one-pass table gives what refitting the tree would
+    compiled = HistoryPolicy(predict_history, window, num_moves=num_moves)
+    compiled.compile_all()
+    lazy = HistoryPolicy(predict_history, window, num_moves=num_moves)
+    for length in range(window + 1):
+        for history in all_windows(length, num_moves):
+            expected = predict_history(history)
+            expected = None if expected is None else int(expected)
+            assert compiled.predict(history) == lazy.predict(history) == expected
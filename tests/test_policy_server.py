@@ -0,0 +1,44 @@
+import multiprocessing as mp
+
+import numpy as np
+
+from policy_server import SharedQTable
+
+
+def _write_rows(name, shape, rounds, stop):
+    # Writer process: set every value of a row to the same number, one element at a time, between
+    # begin_write() and end_write(), so a reader that ignores the sequence number would see mixed rows
+    table = SharedQTable.attach(name, shape)
+    table.values.flags.writeable = True  # Attached views are read-only; this process plays the learner
+    try:
+        for value in range(1, rounds + 1):
+            if stop.is_set():
+                break
+            state = value % shape[0]
+            table.begin_write()
+            for action in range(shape[1]):
+                table.values[state, action] = value
+            table.end_write()
+    finally:
+        table.close()
+
+
+def test_read_row_is_consistent_under_a_concurrent_writer():
+    table = SharedQTable.create(np.zeros((4, 3)))
+    stop = mp.Event()
+    writer = mp.Process(target=_write_rows, args=(table.name, table.shape, 200000, stop))
+    writer.start()
+    try:
+        reads = 0
+        while writer.is_alive() or reads == 0:
+            for state in range(table.shape[0]):
+                row = table.read_row(state)
+                assert (row == row[0]).all(), f"torn read of state {state}: {row}"
+                reads += 1
+        snapshot = table.snapshot()
+        assert (snapshot == snapshot[:, :1]).all()
+    finally:
+        stop.set()
+        writer.join()
+        table.close()
+    assert writer.exitcode == 0
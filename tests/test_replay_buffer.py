@@ -0,0 +1,57 @@
+import numpy as np
+
+from replay_buffer import ReplayBuffer, batch_q_update
+from rl_standalone import RLAgent
+
+
+def _agent(num_states, seed=0):
+    agent = RLAgent()
+    agent.q_table = np.random.default_rng(seed).normal(size=(num_states, 3))
+    return agent
+
+
+def test_batch_matches_repeated_scalar_updates():
+    # Distinct (state, action) cells whose next states are never updated in the batch: the batched
+    # update sees the same Q-values as the scalar updates applied one after another
+    rng = np.random.default_rng(1)
+    cells = rng.choice(10 * 3, size=20, replace=False)
+    states, actions = cells // 3, cells % 3
+    rewards = rng.integers(-1, 2, size=20).astype(np.float64)
+    next_states = rng.integers(10, 20, size=20)
+    scalar, batched = _agent(20), _agent(20)
+    for transition in zip(states.tolist(), actions.tolist(), rewards.tolist(), next_states.tolist()):
+        scalar.update_q_table(*transition)
+    batched.update_q_table_batch(states, actions, rewards, next_states)
+    assert np.allclose(batched.q_table, scalar.q_table)
+
+
+def test_single_transition_batches_match_scalar_updates():
+    # Any sequence of transitions, including repeated cells, gives the scalar result one batch at a time
+    rng = np.random.default_rng(2)
+    scalar, batched = _agent(4), _agent(4)
+    for _ in range(200):
+        state, action, reward, next_state = (int(rng.integers(4)), int(rng.integers(3)),
+                                             float(rng.integers(-1, 2)), int(rng.integers(4)))
+        scalar.update_q_table(state, action, reward, next_state)
+        batched.update_q_table_batch(np.array([state]), np.array([action]), np.array([reward]),
+                                     np.array([next_state]))
+    assert np.allclose(batched.q_table, scalar.q_table)
+
+
+def test_repeated_cells_move_one_averaged_step():
+    q_table = np.zeros((2, 3))
+    td_errors = batch_q_update(q_table, np.array([0, 0, 0]), np.array([1, 1, 1]),
+                               np.array([1.0, 1.0, -1.0]), np.array([1, 1, 1]), 0.5, 0.9)
+    assert td_errors.tolist() == [1.0, 1.0, -1.0]
+    assert q_table[0, 1] == 0.5 * (1.0 / 3) and np.count_nonzero(q_table) == 1
+
+
+def test_buffer_wraps_around_and_samples_recent_first():
+    buffer = ReplayBuffer(capacity=5, seed=0)
+    for i in range(3):
+        buffer.add(i, i % 3, 1.0, i + 1)
+    buffer.add_batch(np.arange(3, 9), np.arange(3, 9) % 3, np.ones(6), np.arange(4, 10))
+    assert len(buffer) == 5 and buffer.total == 9
+    states, actions, rewards, next_states = buffer.batch(buffer.sample(5, "recent"))
+    assert states.tolist() == [8, 7, 6, 5, 4] and (next_states == states + 1).all()
+    assert (buffer.sample(100) < 5).all()
@@ -0,0 +1,55 @@
+import numpy as np
+
+from outcome_engine import GAMES
+from rl_checkpoint import CheckpointAutosaver, load_checkpoint, read_meta, save_checkpoint
+from rl_standalone import RLAgent
+from rl_state import SparseQTable, StateEncoder
+
+
+def _trained_agent(encoder, game=None, seed=0):
+    agent = RLAgent(encoder, game=game)
+    agent.learning_rate, agent.discount_factor, agent.epsilon = 0.25, 0.8, 0.05
+    rng = np.random.default_rng(seed)
+    num_moves = encoder.num_moves
+    for _ in range(500):
+        agent.update_q_table(int(rng.integers(encoder.num_states)), int(rng.integers(num_moves)),
+                             int(rng.integers(-1, 2)), int(rng.integers(encoder.num_states)))
+    return agent
+
+
+def _assert_same_agent(loaded, agent):
+    assert type(loaded.q_table) is type(agent.q_table)
+    assert loaded.encoder.config() == agent.encoder.config()
+    assert (loaded.learning_rate, loaded.discount_factor, loaded.epsilon) == (0.25, 0.8, 0.05)
+    states = np.arange(agent.encoder.num_states)
+    assert np.array_equal(np.asarray(loaded.q_table[states]), np.asarray(agent.q_table[states]))
+
+
+def test_dense_round_trip(tmp_path):
+    agent = _trained_agent(StateEncoder(2, 1, 1))
+    assert isinstance(agent.q_table, np.ndarray)
+    save_checkpoint(agent, str(tmp_path))
+    assert read_meta(str(tmp_path))["storage"] == "dense"
+    _assert_same_agent(load_checkpoint(str(tmp_path), RLAgent), agent)
+    mapped = load_checkpoint(str(tmp_path), RLAgent, mmap=True)
+    assert isinstance(mapped.q_table, np.memmap) and not mapped.q_table.flags.writeable
+
+
+def test_sparse_round_trip(tmp_path):
+    game = GAMES["rpsls"]
+    agent = _trained_agent(StateEncoder(5, 3, 2, game.num_moves), game)
+    assert isinstance(agent.q_table, SparseQTable)
+    save_checkpoint(agent, str(tmp_path))
+    assert read_meta(str(tmp_path))["storage"] == "sparse"
+    loaded = load_checkpoint(str(tmp_path), lambda encoder: RLAgent(encoder, game=game))
+    assert len(loaded.q_table) == len(agent.q_table)
+    _assert_same_agent(loaded, agent)
+
+
+def test_autosaver_saves_on_stop(tmp_path):
+    agent = _trained_agent(StateEncoder())
+    saver = CheckpointAutosaver(agent, str(tmp_path), interval=3600).start()
+    agent.q_table[1, 2] = 7.0
+    saver.mark_dirty()
+    saver.stop()  # Long before the first interval: stop() must write the pending changes
+    assert load_checkpoint(str(tmp_path), RLAgent).q_table[1, 2] == 7.0
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from rl_standalone import BatchRockPaperScissorsEnv, RockPaperScissorsEnv
+
+
+def _single_step_rewards():
+    # JARVIS's reward for every (your move, JARVIS's move) pair, as the single-step environment scores it
+    env = RockPaperScissorsEnv()
+    rewards = {}
+    while len(rewards) < 9:
+        env.reset()
+        for action in range(3):
+            next_state, reward, done, info = env.step(action)
+            assert next_state == info["player_move"] and done
+            rewards[info["player_move"], info["jarvis_move"]] = reward
+    return rewards
+
+
+def test_batched_env_matches_single_step_env():
+    rewards = _single_step_rewards()
+    env = BatchRockPaperScissorsEnv(300, seed=1)
+    states = env.reset()
+    assert states.shape == (300,) and ((states >= 0) & (states < 3)).all()
+    for _ in range(5):
+        actions = np.arange(300) % 3
+        next_states, batch_rewards, dones, info = env.step(actions)
+        assert (info["jarvis_moves"] == actions).all()
+        assert (next_states == info["player_moves"]).all() and dones.all()
+        expected = [rewards[player, jarvis] for player, jarvis in zip(info["player_moves"].tolist(), actions.tolist())]
+        assert batch_rewards.tolist() == expected
+    # Every pair shows up, so every entry of the reward table was compared
+    assert len(set(zip(info["player_moves"].tolist(), actions.tolist()))) == 9
+
+
+def test_batched_env_is_reproducible_and_checks_shapes():
+    first, second = BatchRockPaperScissorsEnv(50, seed=7), BatchRockPaperScissorsEnv(50, seed=7)
+    assert (first.reset() == second.reset()).all()
+    actions = np.zeros(50, dtype=np.int64)
+    assert (first.step(actions)[0] == second.step(actions)[0]).all()
+    with pytest.raises(ValueError):
+        first.step(np.zeros(49, dtype=np.int64))
@@ -0,0 +1,16 @@
+from game_log import GameLogWriter
+from train_forest import grow_forest, new_forest, stream_lag_chunks
+
+
+def test_short_sessions_grow_one_batch_of_trees_per_chunk(tmp_path):
+    path = str(tmp_path / "games.rpslog")
+    for session in range(300):
+        with GameLogWriter(path) as log:
+            moves = [(session + i) % 3 for i in range(30)]
+            log.log_rounds(moves, [0] * 30, [0] * 30, "online")
+    # 9000 rounds in 3 chunks of 3000: 3 batches of trees, not one per 30-round session
+    chunks = list(stream_lag_chunks([path], 2, chunk_rounds=3000))
+    assert len(chunks) == 3 and sum(len(y) for _, y in chunks) == 300 * 28
+    clf = new_forest(n_jobs=1, random_state=0)
+    assert grow_forest(clf, chunks, trees_per_chunk=2) == 300 * 28
+    assert clf.n_estimators == 6 and len(clf.estimators_) == 6
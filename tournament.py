@@ -0,0 +1,239 @@
+import argparse
+import importlib
+import itertools
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+import game_output
+import rng_service
+from outcome_engine import GAMES, RPS, get_game
+from rl_state import StateEncoder
+
+# Headless self-play tournament: pits JARVIS's strategies against each other without input()
+# Every strategy plays the same game (rock, paper, scissors unless --game or JARVIS_GAME picks a larger one);
+# the game scripts read JARVIS_GAME when they are imported, so --game sets it before any of them is loaded
+# Run with: python tournament.py --rounds 1000000 --strategies random online rl
+
+
+class Strategy:
+    # Base class: a strategy picks a numeric move and then sees how the round went
+    name = "strategy"
+
+    def choose(self):
+        # Return this strategy's next move (0=rock, 1=paper, 2=scissors, ... up to the game's num_moves - 1)
+        raise NotImplementedError
+
+    def observe(self, own_move, opponent_move):
+        # Learn from a finished round (does nothing by default)
+        pass
+
+
+def _game_module(module_name, game):
+    # Import a game script and check it plays `game`
+    module = importlib.import_module(module_name)
+    if module.GAME.name != game.name:
+        raise ValueError(f"{module_name} plays {module.GAME.name}, not {game.name} (set JARVIS_GAME before importing it)")
+    return module
+
+
+class RandomStrategy(Strategy):
+    # The random chooser from Player.choose (the path JARVIS takes without a model)
+    def __init__(self, name="random", game=RPS):
+        self.name = name
+        self.module = _game_module("rock_paper_game", game)
+        self.player = self.module.Player("JARVIS")
+
+    def choose(self):
+        return self.module.GAME.move_index[self.player.choose()]
+
+
+class PredictorStrategy(Strategy):
+    # Wraps a predict_move function: it tracks the opponent's moves in a Player and counters them
+    def __init__(self, name, module_name, model_type, game=RPS):
+        # module_name: Game script providing Player and predict_move
+        # model_type: Passed through to predict_move ("online", "ensemble", "tree", "forest", "compiled" or "pretrained")
+        self.name = name
+        self.game = _game_module(module_name, game)
+        self.model_type = model_type
+        self.opponent = self.game.Player("Opponent")  # Our view of the opponent's move history
+
+    def choose(self):
+        return self.game.GAME.move_index[self.game.predict_move(self.opponent, self.model_type)]
+
+    def observe(self, own_move, opponent_move):
+        self.opponent.record_move(opponent_move)
+
+
+class RLStrategy(Strategy):
+    # Wraps a Q-learning RLAgent: the state is built by the agent's StateEncoder (default: the opponent's last move)
+    def __init__(self, name, module_name, encoding=None, game=RPS):
+        # encoding: Optional StateEncoder keyword arguments (e.g., {"opponent_moves": 3})
+        self.name = name
+        self.game = game
+        module = importlib.import_module(module_name)
+        encoder = StateEncoder(**encoding, num_moves=game.num_moves) if encoding else None
+        self.agent = module.RLAgent(encoder, game=game)
+        self.state = 0  # Start state (rock) before the opponent has moved
+
+    def choose(self):
+        return int(self.agent.choose_action(self.state))
+
+    def observe(self, own_move, opponent_move):
+        reward = self.game.outcome(own_move, opponent_move)
+        next_state = self.agent.encoder.next_state(self.state, opponent_move, own_move, reward)
+        self.agent.update_q_table(self.state, own_move, reward, next_state)
+        self.state = next_state
+
+
+class ScriptedStrategy(Strategy):
+    # A scripted opponent from opponents.py (cyclic, biased, copycat, ...) as a tournament entrant
+    def __init__(self, name, seed=None, game=RPS):
+        self.name = name
+        self.opponent = importlib.import_module("opponents").make_opponent(name, seed, game=game)
+        self.last_opponent_move = None
+
+    def choose(self):
+        return self.opponent.move(self.last_opponent_move)
+
+    def observe(self, own_move, opponent_move):
+        self.last_opponent_move = opponent_move
+
+
+# Factories for every strategy the tournament knows about, each taking the GameDefinition to play;
+# modules are only imported when used
+STRATEGIES = {
+    "random": lambda game: RandomStrategy(game=game),
+    "online": lambda game: PredictorStrategy("online", "rock_paper_game", "online", game),
+    "ensemble": lambda game: PredictorStrategy("ensemble", "rock_paper_game", "ensemble", game),
+    "tree": lambda game: PredictorStrategy("tree", "rock_paper_game", "tree", game),
+    "forest": lambda game: PredictorStrategy("forest", "rock_paper_game_RandomForestClassifier", "forest", game),
+    "tree_compiled": lambda game: PredictorStrategy("tree_compiled", "rock_paper_game", "compiled", game),
+    "forest_compiled": lambda game: PredictorStrategy("forest_compiled", "rock_paper_game_RandomForestClassifier",
+                                                      "compiled", game),
+    "forest_pretrained": lambda game: PredictorStrategy("forest_pretrained", "rock_paper_game_RandomForestClassifier",
+                                                        "pretrained", game),
+    "rl": lambda game: RLStrategy("rl", "rl_standalone", game=game),
+    "rl_history": lambda game: RLStrategy("rl_history", "rl_standalone",
+                                          {"opponent_moves": 3, "own_moves": 3, "outcomes": 1}, game),
+    "rl_game": lambda game: RLStrategy("rl_game", "rock_paper_game_rl", game=game),
+    "biased": lambda game: ScriptedStrategy("biased", game=game),
+    "cyclic": lambda game: ScriptedStrategy("cyclic", game=game),
+    "markov": lambda game: ScriptedStrategy("markov", game=game),
+    "copycat": lambda game: ScriptedStrategy("copycat", game=game),
+    "beat_last": lambda game: ScriptedStrategy("beat_last", game=game),
+}
+
+
+def wilson_interval(successes, total, z=1.96):
+    # 95% Wilson score confidence interval for a rate (stays sensible near 0 and 1)
+    if total == 0:
+        return 0.0, 0.0
+    p = successes / total
+    denom = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denom
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def latency_stats(samples):
+    # Summarize per-move latencies (seconds) as microseconds
+    return {
+        "mean_us": float(samples.mean() * 1e6),
+        "p50_us": float(np.percentile(samples, 50) * 1e6),
+        "p99_us": float(np.percentile(samples, 99) * 1e6),
+    }
+
+
+def play_match(first, second, rounds, game=RPS):
+    # Play `rounds` rounds of `game` between two strategies and return win/tie/loss and timing stats
+    # Latency covers choose() plus observe() for each strategy, i.e., its full cost per move
+    first_moves = np.empty(rounds, dtype=np.int8)
+    second_moves = np.empty(rounds, dtype=np.int8)
+    first_latency = np.empty(rounds)
+    second_latency = np.empty(rounds)
+    clock = time.perf_counter
+    start = clock()
+    # Quiet output: JARVIS's chatter would otherwise dominate the timing
+    previous_output = game_output.set_output_mode("quiet")
+    try:
+        for i in range(rounds):
+            t0 = clock()
+            first_move = first.choose()
+            t1 = clock()
+            second_move = second.choose()
+            t2 = clock()
+            first.observe(first_move, second_move)
+            t3 = clock()
+            second.observe(second_move, first_move)
+            t4 = clock()
+            first_moves[i] = first_move
+            second_moves[i] = second_move
+            first_latency[i] = (t1 - t0) + (t3 - t2)
+            second_latency[i] = (t2 - t1) + (t4 - t3)
+    finally:
+        game_output.set_output(previous_output)
+    elapsed = clock() - start
+
+    result = {"first": first.name, "second": second.name, "rounds": rounds, "seconds": elapsed,
+              "rounds_per_sec": rounds / elapsed if elapsed > 0 else float("inf")}
+    counts = game.score_games(first_moves, second_moves)  # Score every round in one batched call
+    for label, key in (("win", "wins"), ("tie", "ties"), ("loss", "losses")):
+        count = counts[key]
+        low, high = wilson_interval(count, rounds)
+        result[label] = {"count": count, "rate": count / rounds, "ci95": [low, high]}
+    result["latency"] = {first.name: latency_stats(first_latency), second.name: latency_stats(second_latency)}
+    return result
+
+
+def run_tournament(names, rounds, seed=None, game=RPS):
+    # Round-robin: every pair of strategies plays one match of `game`, each with fresh strategy objects
+    results = []
+    for first_name, second_name in itertools.combinations(names, 2):
+        if seed is not None:
+            np.random.seed(seed)
+            rng_service.seed(seed)  # Reseeds the games' random moves and everything spawned from them
+        first = STRATEGIES[first_name](game)
+        second = STRATEGIES[second_name](game)
+        results.append(play_match(first, second, rounds, game))
+    return results
+
+
+def print_results(results):
+    # Show one line per match plus per-move latency for both strategies
+    for r in results:
+        win, tie, loss = r["win"], r["tie"], r["loss"]
+        print(f"{r['first']} vs {r['second']}: {r['rounds']} rounds, {r['rounds_per_sec']:.0f} rounds/sec")
+        for label, stats in (("win", win), ("tie", tie), ("loss", loss)):
+            low, high = stats["ci95"]
+            print(f"  {label:<4} {stats['rate']:.4f} (95% CI {low:.4f}-{high:.4f})")
+        for name, lat in r["latency"].items():
+            print(f"  {name} latency: mean {lat['mean_us']:.1f}us, p50 {lat['p50_us']:.1f}us, p99 {lat['p99_us']:.1f}us")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless round-robin tournament between JARVIS strategies.")
+    parser.add_argument("--strategies", nargs="+", default=["random", "online", "rl", "rl_game"],
+                        choices=sorted(STRATEGIES), help="Strategies to include (every pair plays once)")
+    parser.add_argument("--rounds", type=int, default=100000, help="Rounds per match")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible matches")
+    parser.add_argument("--json", default=None, help="Also write the results to this JSON file")
+    parser.add_argument("--game", default=os.environ.get("JARVIS_GAME", "rps"), choices=sorted(GAMES),
+                        help="Game to play (default: JARVIS_GAME, or rock, paper, scissors)")
+    args = parser.parse_args(argv)
+    if len(args.strategies) < 2:
+        parser.error("need at least two strategies")
+    os.environ["JARVIS_GAME"] = args.game  # The game scripts pick their game up when first imported
+
+    results = run_tournament(args.strategies, args.rounds, args.seed, get_game(args.game))
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
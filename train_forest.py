@@ -0,0 +1,134 @@
+import argparse
+import os
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from game_log import read_records
+
+# Offline bulk training for the RandomForest predictor
+# Streams player moves from game logs (see game_log.py) in chunks, builds lag-k features with NumPy,
+# and grows one forest on all cores: every chunk adds new trees (warm_start) instead of refitting
+# The exported model is loaded by rock_paper_game_RandomForestClassifier when MODEL_TYPE is "pretrained"
+# Run with: python train_forest.py jarvis_games.rpslog --lags 2 --output jarvis_forest.joblib
+
+MODEL_FORMAT_VERSION = 1
+
+
+def lag_features(moves, lags):
+    # Build (X, y) where each row of X is `lags` consecutive moves and y is the move that followed
+    # moves: 1-D uint8 array, oldest first; returns views into a sliding window (no Python loop)
+    if len(moves) <= lags:
+        return np.empty((0, lags), dtype=np.uint8), np.empty(0, dtype=np.uint8)
+    windows = sliding_window_view(moves, lags + 1)
+    return windows[:, :lags], windows[:, lags]
+
+
+def stream_lag_chunks(paths, lags, chunk_rounds=1000000):
+    # Yield (X, y) chunks from one or more logs, one per chunk_rounds rounds read; the last `lags` moves
+    # carry over between chunks so no training sample is lost at a chunk boundary
+    # Windows never span two logs or two sessions (a session is one game run, so one player);
+    # version 1 logs have no session numbers and are treated as a single session
+    # The windows of all sessions in a chunk are yielded together, so many short sessions still give
+    # grow_forest() one chunk (and one batch of trees) per chunk_rounds rounds, not one per session
+    for path in paths:
+        carry = np.empty(0, dtype=np.uint8)
+        session = None  # Session the carried moves belong to
+        for records in read_records(path, chunk_rounds):
+            if "session" in records.dtype.names:
+                sessions = records["session"]
+                # Start of every run of rounds from the same session
+                starts = np.flatnonzero(np.diff(sessions, prepend=sessions[0] if session is None else session))
+            else:
+                sessions, starts = None, np.empty(0, dtype=np.intp)
+            starts = starts.tolist()
+            bounds = [0, *starts, len(records)] if starts[:1] != [0] else [*starts, len(records)]
+            Xs, ys = [], []
+            for begin, end in zip(bounds[:-1], bounds[1:]):
+                if begin in starts:
+                    carry = carry[:0]  # A new session starts here
+                moves = np.concatenate((carry, records["player_move"][begin:end]))
+                X, y = lag_features(moves, lags)
+                Xs.append(X)
+                ys.append(y)
+                carry = moves[-lags:]
+            y = np.concatenate(ys)
+            if len(y):
+                yield np.concatenate(Xs), y
+            if sessions is not None:
+                session = sessions[-1]
+
+
+def new_forest(max_depth=None, n_jobs=-1, random_state=None):
+    from sklearn.ensemble import RandomForestClassifier  # Imported lazily: Scikit-learn is slow to load
+    # warm_start lets later fit() calls add trees while keeping the ones already grown
+    return RandomForestClassifier(n_estimators=0, warm_start=True, max_depth=max_depth,
+                                  n_jobs=n_jobs, random_state=random_state)
+
+
+def grow_forest(clf, chunks, trees_per_chunk=10, min_samples=10):
+    # Add trees_per_chunk trees trained on each (X, y) chunk; returns the number of samples used
+    samples = 0
+    for X, y in chunks:
+        if len(y) < min_samples:
+            continue
+        if hasattr(clf, "classes_") and not np.array_equal(np.unique(y), clf.classes_):
+            continue  # Trees grown on a different set of moves can't be combined with the existing ones
+        clf.n_estimators += trees_per_chunk
+        clf.fit(X, y)
+        samples += len(y)
+    return samples
+
+
+def save_model(clf, lags, path, samples):
+    import joblib  # Ships with Scikit-learn
+    model = {"version": MODEL_FORMAT_VERSION, "model": clf, "lags": lags, "samples": samples}
+    tmp_path = path + ".tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)  # The live game never sees a half-written model
+
+
+def load_model(path):
+    # Return (classifier, lags, samples) from an exported model file
+    import joblib
+    model = joblib.load(path)
+    if model.get("version") != MODEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model version {model.get('version')}")
+    return model["model"], model["lags"], model["samples"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the RandomForest predictor offline from game logs.")
+    parser.add_argument("logs", nargs="+", help="Game log files written by game_log.py")
+    parser.add_argument("--lags", type=int, default=2, help="How many past moves form each feature row")
+    parser.add_argument("--chunk-rounds", type=int, default=1000000, help="Rounds read from disk per chunk")
+    parser.add_argument("--trees-per-chunk", type=int, default=10, help="Trees added for each chunk")
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--jobs", type=int, default=-1, help="Cores to train on (-1 = all)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="jarvis_forest.joblib", help="Where to export the model")
+    parser.add_argument("--append", action="store_true", help="Grow the existing model at --output with new data")
+    args = parser.parse_args(argv)
+
+    samples = 0
+    if args.append and os.path.exists(args.output):
+        clf, lags, samples = load_model(args.output)
+        if lags != args.lags:
+            parser.error(f"{args.output} was trained with --lags {lags}")
+        clf.set_params(warm_start=True, n_jobs=args.jobs)
+    else:
+        clf = new_forest(args.max_depth, args.jobs, args.seed)
+
+    start = time.perf_counter()
+    chunks = stream_lag_chunks(args.logs, args.lags, args.chunk_rounds)
+    added = grow_forest(clf, chunks, args.trees_per_chunk)
+    if clf.n_estimators == 0:
+        parser.error("not enough rounds in the logs to train on")
+    save_model(clf, args.lags, args.output, samples + added)
+    print(f"Trained on {added} new samples ({samples + added} total) in {time.perf_counter() - start:.1f}s; "
+          f"{clf.n_estimators} trees saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()